@@ -0,0 +1,79 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXPORT_FORMAT_PARAM = 'file_format'
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value instead of buffering it,
+    so csv.writer can produce one line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_export_format(request):
+    """
+    Return the export format from `?file_format=` (default "ndjson").
+
+    `format` is not used because DRF reserves it for renderer selection.
+
+    Raises:
+        ValidationError: for an unsupported format.
+    """
+    export_format = request.query_params.get(EXPORT_FORMAT_PARAM, 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError({EXPORT_FORMAT_PARAM: f"Use one of: {', '.join(EXPORT_FORMATS)}."})
+    return export_format
+
+
+def to_csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def iter_csv(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([to_csv_value(row.get(column)) for column in columns])
+
+
+def stream_export(rows, columns, export_format, filename):
+    """
+    Stream `rows` (an iterable of dicts, ideally backed by
+    `QuerySet.iterator(chunk_size=...)`) as NDJSON or CSV.
+
+    Nothing is buffered: each row is encoded and sent as it is read, so
+    memory use does not grow with the number of rows. CSV cells holding
+    lists or dicts are JSON-encoded; NDJSON rows keep them nested.
+
+    Returns:
+        StreamingHttpResponse with a Content-Disposition attachment header.
+    """
+    if export_format == 'csv':
+        content = iter_csv(rows, columns)
+    else:
+        content = iter_ndjson(rows)
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
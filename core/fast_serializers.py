@@ -0,0 +1,239 @@
+"""
+Opt-in fast read path for list endpoints.
+
+A FastReadSerializer renders `.values()` rows into exactly the dicts its
+`serializer_class` (a DRF ModelSerializer) would produce for the same
+objects, without instantiating models or running DRF's per-field machinery.
+
+The field plan is compiled once per class from the serializer's own bound
+fields, so it follows the serializer when fields are added or renamed:
+
+    - fields whose `to_representation` returns database values unchanged
+      (integers, strings, choices, JSON, primary keys, read-only fields) are
+      copied from the row;
+    - file fields become (absolute) storage URLs;
+    - nested single-object serializers are compiled recursively against
+      `<source>__<field>` columns;
+    - ISO-8601 datetimes are converted to the field's (or the current)
+      timezone once per value, with the timezone looked up once per render
+      instead of once per value;
+    - other datetimes, dates, decimals and floats call the field's own bound
+      `to_representation`, so the formatting stays DRF's;
+    - fields a subclass renders itself are declared in `custom_fields`, with
+      a `render_<name>(row)` method and the columns it needs.
+
+Enabled with the FAST_READ_SERIALIZERS setting (default False); see
+FastReadListMixin for the view side.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+COPY_FIELDS = (
+    drf_fields.IntegerField,
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.BooleanField,
+    drf_fields.JSONField,
+    drf_fields.ReadOnlyField,
+)
+CONVERT_FIELDS = (
+    drf_fields.DateTimeField,
+    drf_fields.DateField,
+    drf_fields.DecimalField,
+    drf_fields.FloatField,
+)
+
+COPY, CONVERT, DATETIME, FILE, NESTED, CUSTOM = range(6)
+
+
+def is_enabled():
+    return getattr(settings, 'FAST_READ_SERIALIZERS', False)
+
+
+def compile_field(name, field, prefix=''):
+    """
+    Return the plan step for one bound serializer field:
+    (output name, kind, row key, payload, columns).
+    """
+    key = prefix + '__'.join(field.source_attrs)
+    if isinstance(field, serializers.Serializer):
+        sub_steps = [
+            compile_field(sub_name, sub_field, prefix=key + '__')
+            for sub_name, sub_field in field.fields.items()
+            if not sub_field.write_only
+        ]
+        columns = [key] + [column for step in sub_steps for column in step[4]]
+        return (name, NESTED, key, sub_steps, columns)
+    if isinstance(field, drf_fields.FileField):
+        storage = field.parent.Meta.model._meta.get_field(field.source).storage
+        return (name, FILE, key, storage, [key])
+    if isinstance(field, COPY_FIELDS) or (
+        isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None
+    ):
+        return (name, COPY, key, None, [key])
+    if isinstance(field, drf_fields.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            return (name, DATETIME, key, field, [key])
+    if isinstance(field, CONVERT_FIELDS):
+        return (name, CONVERT, key, field.to_representation, [key])
+    raise ImproperlyConfigured(
+        f'{type(field.parent).__name__}.{name} ({type(field).__name__}) has no fast read plan; '
+        f'list it in custom_fields.'
+    )
+
+
+class FastReadSerializer:
+    """
+    Render `.values()` rows like `serializer_class` renders instances.
+
+    Class attributes:
+        serializer_class: the ModelSerializer whose output is reproduced.
+        custom_fields (dict): {field name: [columns]} for fields rendered by
+            `render_<name>(row)` on the subclass.
+
+    Usage:
+        fast = OrderFastSerializer(request)
+        data = fast.render(queryset.values(*fast.columns))
+    """
+    serializer_class = None
+    custom_fields = {}
+    _plans = {}
+
+    def __init__(self, request=None, fields=None, extra_columns=()):
+        self.request = request
+        self.steps = self.get_steps(fields)
+        self.columns = ['id']
+        for column in [column for step in self.steps for column in step[4]] + list(extra_columns):
+            if column not in self.columns:
+                self.columns.append(column)
+
+    @classmethod
+    def get_steps(cls, fields=None):
+        """
+        Return the compiled plan (cached per class), restricted to the output
+        names in `fields` (e.g. from ?fields= / ?omit=) when given.
+        """
+        steps = cls._plans.get(cls)
+        if steps is None:
+            steps = cls._plans[cls] = cls.compile()
+        if fields is not None:
+            steps = [step for step in steps if step[0] in fields]
+        return steps
+
+    @classmethod
+    def compile(cls):
+        steps = []
+        for name, field in cls.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in cls.custom_fields:
+                steps.append((name, CUSTOM, None, getattr(cls, f'render_{name}'), list(cls.custom_fields[name])))
+            else:
+                steps.append(compile_field(name, field))
+        return steps
+
+    def prepare(self, rows):
+        """
+        Hook for loading what custom fields need for a whole page at once
+        (e.g. related ids). `rows` is a list.
+        """
+
+    def finalize(self, data):
+        """
+        Hook mirroring a custom `to_representation()` on serializer_class.
+        """
+        return data
+
+    def render(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        self.current_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        return [self.finalize(self.render_steps(self.steps, row)) for row in rows]
+
+    def render_steps(self, steps, row):
+        data = {}
+        for name, kind, key, payload, _ in steps:
+            if kind == CUSTOM:
+                data[name] = payload(self, row)
+                continue
+            value = row[key]
+            if value is None or kind == COPY:
+                data[name] = value
+            elif kind == CONVERT:
+                data[name] = payload(value)
+            elif kind == DATETIME:
+                data[name] = self.format_datetime(value, payload)
+            elif kind == FILE:
+                data[name] = self.file_url(value, payload)
+            else:
+                data[name] = self.render_steps(payload, row)
+        return data
+
+    def format_datetime(self, value, field):
+        """
+        Same as DateTimeField.to_representation() with ISO-8601 output for
+        aware datetimes; anything else goes through the field itself.
+        """
+        field_timezone = field.timezone if hasattr(field, 'timezone') else self.current_timezone
+        if field_timezone is None or value.utcoffset() is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def file_url(self, name, storage):
+        """
+        Same as FileField.to_representation() for a stored file name.
+        """
+        if not name:
+            return None
+        url = storage.url(name)
+        if self.request is not None:
+            return self.request.build_absolute_uri(url)
+        return url
+
+
+class FastReadListMixin:
+    """
+    List views: answer GET from `fast_read_serializer_class` when the
+    FAST_READ_SERIALIZERS setting is on.
+
+    The view's filters and pagination run unchanged on a `.values()`
+    queryset built from `get_fast_read_queryset()`. ?fields= / ?omit= are
+    honoured when the serializer uses SparseFieldsetMixin, and
+    `fast_read_extra_columns` are loaded without being rendered (e.g. keys
+    the paginator needs).
+    """
+    fast_read_serializer_class = None
+    fast_read_extra_columns = ()
+
+    def get_fast_read_queryset(self):
+        return self.get_queryset()
+
+    def get_fast_read_serializer(self):
+        if not is_enabled() or self.fast_read_serializer_class is None:
+            return None
+        serializer_class = self.fast_read_serializer_class.serializer_class
+        get_requested_fields = getattr(serializer_class, 'get_requested_fields', None)
+        fields = get_requested_fields(self.request) if get_requested_fields else None
+        return self.fast_read_serializer_class(
+            self.request, fields=fields, extra_columns=self.fast_read_extra_columns,
+        )
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_fast_read_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_fast_read_queryset().values(*fast.columns))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.render(page))
+        return Response(fast.render(queryset))
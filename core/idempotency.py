@@ -0,0 +1,136 @@
+"""
+Idempotency keys for create endpoints.
+
+A client that retries a POST after a timeout sends the same
+`Idempotency-Key` header. The first request runs normally and its
+response is stored. Every repeat within IDEMPOTENCY_KEY_TTL seconds
+replays the stored response, with an `Idempotent-Replayed: true` header,
+and does not run the view again.
+
+Keys are scoped per user and per endpoint. Requests without the header,
+and anonymous requests, are not affected.
+
+Concurrency:
+    The key row is inserted in the same transaction as the view's own
+    writes and the stored response. A concurrent duplicate blocks on the
+    unique key_hash index (on SQLite, on the database write lock) until the
+    first request commits. Its insert then fails, and it replays the
+    committed response. If the first request fails, its key row is rolled
+    back with everything else, and a retry runs the view again.
+
+Responses:
+    - 2xx and 4xx responses are stored and replayed.
+    - 5xx responses and exceptions are not stored.
+    - A key reused with a different request body returns 422.
+    - A key longer than 255 characters returns 400.
+
+Settings:
+    IDEMPOTENCY_KEY_TTL (int, default 86400): seconds a key is remembered.
+        Expired keys are replaced on reuse and deleted by
+        `prune_idempotency_keys`.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+def get_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400)
+
+
+def get_cutoff():
+    return timezone.now() - timedelta(seconds=get_ttl())
+
+
+def hash_key(user_id, scope, key):
+    return hashlib.sha256(f'{user_id}:{scope}:{key}'.encode()).hexdigest()
+
+
+def fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def idempotent(scope):
+    """
+    Decorator for a view's `post` / `create` method; see the module
+    docstring. `scope` names the endpoint (e.g. "orders.create").
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            return run(request, scope, lambda: method(self, request, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def run(request, scope, handler):
+    """
+    Return the stored response for the request's key, or call `handler()`
+    and store its response.
+    """
+    key = request.headers.get(HEADER)
+    if key is None or not request.user.is_authenticated:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {'detail': f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters.'}, status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    key_hash = hash_key(request.user.pk, scope, key)
+    request_fingerprint = fingerprint(request)
+    stored = IdempotencyKey.objects.filter(key_hash=key_hash).first()
+    if stored is not None and stored.created_at >= get_cutoff():
+        return replay(stored, request_fingerprint)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                if stored is not None:
+                    IdempotencyKey.objects.filter(pk=stored.pk).delete()
+                record = IdempotencyKey.objects.create(key_hash=key_hash, fingerprint=request_fingerprint)
+        except IntegrityError:
+            # A concurrent request with the same key committed first.
+            return replay(IdempotencyKey.objects.get(key_hash=key_hash), request_fingerprint)
+
+        response = handler()
+        if response.status_code >= 500:
+            transaction.set_rollback(True)
+            return response
+        record.status_code = response.status_code
+        record.response = response.data
+        record.save(update_fields=['status_code', 'response'])
+    return response
+
+
+def replay(stored, request_fingerprint):
+    if stored.fingerprint != request_fingerprint:
+        return Response(
+            {'detail': f'{HEADER} was already used for a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(stored.response, status=stored.status_code, headers={REPLAYED_HEADER: 'true'})
+
+
+def prune():
+    """
+    Delete expired keys.
+
+    Returns:
+        int: number of keys deleted.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=get_cutoff()).delete()
+    return deleted
@@ -0,0 +1,111 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from offers_app.api.serializers import OfferFastSerializer, OfferSerializer
+from offers_app.api.views import get_offer_read_queryset
+from offers_app.management.seed import seed_offers
+from offers_app.models import Offer, OfferDetail
+from orders_app.api.serializers import OrderFastSerializer, OrderSerializer
+from orders_app.models import Order
+from reviews_app.api.serializers import ReviewFastSerializer, ReviewSerializer
+from reviews_app.models import Review
+from userprofile_app.api.serializers import ProfileDetailsFastSerializer, ProfileDetailsSerializer
+from userprofile_app.models import UserProfile
+
+
+class Command(BaseCommand):
+    """
+    Compare the DRF list serializers with their `.values()` fast paths.
+
+    Usage:
+        python manage.py benchmark_fast_serializers [--rows 1000] [--repeat 7]
+
+    Behavior:
+        - Seeds `--rows` offers (three details each), orders, reviews and
+          business profiles inside a transaction that is rolled back at the
+          end, so the database is left untouched.
+        - For each serializer, renders all rows both ways (query included),
+          checks that the rendered JSON is byte-identical and prints the
+          median time of each path.
+    """
+    help = 'Benchmark DRF list serializers against the FAST_READ_SERIALIZERS fast path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            self.seed(rows)
+            request = Request(APIRequestFactory().get('/api/offers/', HTTP_HOST='localhost'))
+            profiles = UserProfile.objects.filter(type='business').order_by('id')
+            cases = {
+                'OfferSerializer': (
+                    lambda: OfferSerializer(
+                        get_offer_read_queryset().order_by('id'), many=True, context={'request': request}).data,
+                    lambda: OfferFastSerializer(request).render(
+                        Offer.objects.order_by('id').values(*OfferFastSerializer(request).columns)),
+                ),
+                'OrderSerializer': (
+                    lambda: OrderSerializer(Order.objects.order_by('id'), many=True, context={'request': request}).data,
+                    lambda: OrderFastSerializer(request).render(
+                        Order.objects.order_by('id').values(*OrderFastSerializer(request).columns)),
+                ),
+                'ReviewSerializer': (
+                    lambda: ReviewSerializer(Review.objects.order_by('id'), many=True, context={'request': request}).data,
+                    lambda: ReviewFastSerializer(request).render(
+                        Review.objects.order_by('id').values(*ReviewFastSerializer(request).columns)),
+                ),
+                'ProfileDetailsSerializer': (
+                    lambda: ProfileDetailsSerializer(profiles, many=True, context={'request': request}).data,
+                    lambda: ProfileDetailsFastSerializer(request).render(
+                        profiles.values(*ProfileDetailsFastSerializer(request).columns)),
+                ),
+            }
+
+            self.stdout.write(f'{rows} rows per serializer, median of {options["repeat"]} runs (query included)')
+            for label, (drf, fast) in cases.items():
+                if JSONRenderer().render(drf()) != JSONRenderer().render(fast()):
+                    raise CommandError(f'{label}: fast path output differs from the serializer.')
+                drf_ms = self.measure(drf, options['repeat'])
+                fast_ms = self.measure(fast, options['repeat'])
+                self.stdout.write(
+                    f'{label:<26} DRF {drf_ms:8.2f} ms | fast {fast_ms:8.2f} ms | x{drf_ms / max(fast_ms, 0.001):.1f}'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        users, _ = seed_offers(rows * 3, max(rows // 10, 1))
+        customer = UserProfile.objects.create(username='bench-customer', email='bench-customer@example.com')
+        details = list(OfferDetail.objects.select_related('offer').order_by('id')[:rows])
+        Order.objects.bulk_create([
+            Order(
+                customer_user=customer, business_user_id=detail.offer.user_id, offer_detail=detail,
+                title=detail.title, revisions=detail.revisions, delivery_time_in_days=detail.delivery_time_in_days,
+                price=detail.price, features=['Logo', 'Source files'], offer_type=detail.offer_type,
+            )
+            for detail in details
+        ])
+        Review.objects.bulk_create([
+            Review(business_user=users[i % len(users)], reviewer=customer, rating=i % 5 + 1, description='Great work')
+            for i in range(rows)
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(username=f'bench-profile-{i}', email=f'bench-profile-{i}@example.com', type='business',
+                        location='Berlin' if i % 2 else None)
+            for i in range(rows - len(users))
+        ])
+
+    def measure(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
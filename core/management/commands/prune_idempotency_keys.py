@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from core import idempotency
+
+
+class Command(BaseCommand):
+    """
+    Delete idempotency keys older than IDEMPOTENCY_KEY_TTL.
+
+    Usage:
+        python manage.py prune_idempotency_keys
+
+    Behavior:
+        - One DELETE over the created_at index. Expired keys are already
+          ignored on lookup, so this only reclaims space; run it from cron.
+    """
+    help = 'Delete expired idempotency keys (see core/idempotency.py).'
+
+    def handle(self, *args, **options):
+        count = idempotency.prune()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} expired idempotency keys.'))
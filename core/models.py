@@ -0,0 +1,27 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response of a create request sent with an `Idempotency-Key`
+    header (see core/idempotency.py).
+
+    Fields:
+        key_hash (str): SHA-256 of (user id, endpoint scope, key), so keys of
+            any length take 64 characters and never collide across users.
+        fingerprint (str): SHA-256 of the request body, to reject a key
+            reused for a different request.
+        status_code (int): Status of the stored response.
+        response (JSON): Body of the stored response.
+        created_at (datetime): When the key was first used; keys expire
+            IDEMPOTENCY_KEY_TTL seconds later.
+    """
+    key_hash = models.CharField(max_length=64, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.key_hash[:12]} {self.status_code}'
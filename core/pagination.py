@@ -0,0 +1,204 @@
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor (keyset) pagination on (key, id).
+
+    Subclasses set `ordering_keys` (the first one is the fallback) and list
+    the datetime keys in `datetime_keys`; other keys must be integers.
+
+    Ordering:
+        The key is taken from the first entry of the `ordering` query
+        parameter (a leading "-" means descending), falling back to the
+        view's default ordering. Ascending order puts NULLs first and
+        descending order puts them last, so walking backwards is the exact
+        mirror of walking forwards.
+
+    Query parameters:
+        cursor: opaque token taken from a previous `next` / `previous` link.
+        page_size: number of results per page (up to max_page_size).
+        include_count: set to "true" to add the total `count`. The COUNT
+            query is skipped otherwise.
+
+    Behavior:
+        Each page is a `WHERE (key, id) > (last_key, last_id) ORDER BY key, id
+        LIMIT n + 1` query, so its cost does not depend on how deep the page is
+        and rows inserted concurrently never shift or duplicate results.
+
+    UNION ALL branches:
+        A view whose rows match an OR that no single index can serve may
+        define `get_keyset_branches(queryset)`, returning disjoint querysets
+        (e.g. one per OR term) whose union is `queryset`. Each page is then
+        one UNION ALL of the branches with the keyset filter applied to each
+        and a single outer ORDER BY ... LIMIT; SQLite merges the branches,
+        each read in order from its own index, and stops after n + 1 rows.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 6
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+    ordering_keys = ()
+    datetime_keys = ()
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            self.key, self.descending = self.get_ordering(request, view)
+            self.reverse = False
+        else:
+            self.key = cursor['o']
+            self.descending = cursor['d']
+            self.reverse = cursor['r']
+
+        get_branches = getattr(view, 'get_keyset_branches', None)
+        branches = get_branches(queryset) if get_branches is not None else [queryset]
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = sum(branch.count() for branch in branches)
+
+        walk_descending = self.descending != self.reverse
+        order_by = self.get_order_by(walk_descending)
+        if cursor is not None:
+            position = self.get_position_filter(walk_descending, cursor['v'], cursor['id'])
+            branches = [branch.filter(position) for branch in branches]
+        if len(branches) == 1:
+            queryset = branches[0].order_by(*order_by)
+        else:
+            queryset = branches[0].order_by().union(
+                *[branch.order_by() for branch in branches[1:]], all=True,
+            ).order_by(*order_by)
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        response = {}
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, view):
+        """
+        Return (key, descending) from the `ordering` query parameter or the
+        view's default ordering.
+        """
+        params = request.query_params.get('ordering', '')
+        candidates = [term.strip() for term in params.split(',') if term.strip()]
+        candidates += list(getattr(view, 'ordering', None) or [])
+        for term in candidates:
+            key = term.lstrip('-')
+            if key in self.ordering_keys:
+                return key, term.startswith('-')
+        return self.ordering_keys[0], False
+
+    def get_order_by(self, descending):
+        if descending:
+            return [F(self.key).desc(nulls_last=True), F('id').desc()]
+        return [F(self.key).asc(nulls_first=True), F('id').asc()]
+
+    def get_position_filter(self, descending, value, pk):
+        """
+        Rows strictly after (value, pk) in the walk order, NULL-aware.
+
+        The redundant `key >= value` (or `<=`) bound lets SQLite seek the
+        (key, id) index instead of scanning it from the start.
+        """
+        key = self.key
+        if descending:
+            if value is None:
+                return Q(**{f'{key}__isnull': True, 'id__lt': pk})
+            return (
+                Q(**{f'{key}__lte': value}) & (Q(**{f'{key}__lt': value}) | Q(id__lt=pk))
+            ) | Q(**{f'{key}__isnull': True})
+        if value is None:
+            return Q(**{f'{key}__isnull': True, 'id__gt': pk}) | Q(**{f'{key}__isnull': False})
+        return Q(**{f'{key}__gte': value}) & (Q(**{f'{key}__gt': value}) | Q(id__gt=pk))
+
+    def encode_cursor(self, obj, reverse):
+        # Rows are model instances, or dicts on the fast read path.
+        if isinstance(obj, dict):
+            value, pk = obj[self.key], obj['id']
+        else:
+            value, pk = getattr(obj, self.key), obj.pk
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = {'o': self.key, 'd': self.descending, 'r': reverse, 'v': value, 'id': pk}
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """
+        Return the decoded cursor dict, None if no cursor was given, or raise
+        NotFound for a malformed token.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            if payload['o'] not in self.ordering_keys or not isinstance(payload['id'], int):
+                raise ValueError
+            payload['d'] = bool(payload['d'])
+            payload['r'] = bool(payload['r'])
+            if payload['v'] is None:
+                pass
+            elif payload['o'] in self.datetime_keys:
+                payload['v'] = parse_datetime(payload['v'])
+                if payload['v'] is None:
+                    raise ValueError
+            elif not isinstance(payload['v'], int):
+                raise ValueError
+        except (KeyError, TypeError, ValueError, binascii.Error, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return payload
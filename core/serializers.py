@@ -0,0 +1,107 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients choose the output fields of a serializer with query params.
+
+    Query parameters:
+        fields: comma-separated list of the fields to return
+            (e.g. `?fields=id,title,min_price`).
+        omit: comma-separated list of fields to leave out
+            (e.g. `?omit=user_details,details`).
+
+    Behavior:
+        - Fields are removed in `get_fields()`, so dropped fields are never
+          computed (no SerializerMethodField call, no nested serializer).
+        - Only the top-level serializer of a response is trimmed; nested
+          serializers keep all of their fields.
+        - Serializers bound to input data (`data=...`) are left untouched, so
+          the mixin never hides writable fields from validation.
+        - Unknown field names raise a 400 ValidationError.
+        - Views call `get_requested_fields(request)` to skip the
+          select_related / prefetch_related calls that only dropped fields
+          would need, or `get_requested_columns(request)` to load only the
+          needed columns with `queryset.only()`.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if hasattr(self, 'initial_data') or not self.is_top_level():
+            return fields
+        wanted = self.get_sparse_field_names(self.context.get('request'), fields)
+        if wanted is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in wanted}
+
+    def is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        """
+        Return the set of field names the request asks for, or None if it
+        does not restrict the fields.
+        """
+        return cls.get_sparse_field_names(request, cls().fields)
+
+    @classmethod
+    def get_requested_columns(cls, request):
+        """
+        Return the model fields backing the requested output fields, for
+        `queryset.only()`, or None if every column should be loaded (no
+        sparse params, or a requested field reads more than one column,
+        such as a SerializerMethodField).
+        """
+        fields = cls.get_requested_fields(request)
+        if fields is None:
+            return None
+        opts = cls.Meta.model._meta
+        by_attname = {field.attname: field.name for field in opts.concrete_fields}
+        by_attname.update({field.name: field.name for field in opts.concrete_fields})
+        columns = {opts.pk.name}
+        serializer_fields = cls().fields
+        for name in fields:
+            source = serializer_fields[name].source
+            if source not in by_attname:
+                return None
+            columns.add(by_attname[source])
+        return columns
+
+    @classmethod
+    def get_sparse_field_names(cls, request, available):
+        if request is None:
+            return None
+        params = getattr(request, 'query_params', request.GET)
+        selected = cls.parse_field_list(params, cls.fields_query_param)
+        omitted = cls.parse_field_list(params, cls.omit_query_param)
+        if selected is None and omitted is None:
+            return None
+
+        errors = {}
+        for param, names in ((cls.fields_query_param, selected), (cls.omit_query_param, omitted)):
+            unknown = sorted((names or set()) - set(available))
+            if unknown:
+                errors[param] = f"Unknown field(s): {', '.join(unknown)}."
+        if errors:
+            raise ValidationError(errors)
+
+        wanted = set(available) if selected is None else selected
+        return wanted - (omitted or set())
+
+    @staticmethod
+    def parse_field_list(params, name):
+        if name not in params:
+            return None
+        return {
+            field.strip()
+            for value in params.getlist(name)
+            for field in value.split(',')
+            if field.strip()
+        }
@@ -152,3 +152,26 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend'
     ]
 }
+
+# Versioned response cache for anonymous offer list/detail GETs (seconds).
+OFFERS_RESPONSE_CACHE_TIMEOUT = 60
+
+# In-memory columnar index for the offers list (see offers_app/read_index.py).
+OFFERS_READ_INDEX = False
+OFFERS_READ_INDEX_MAX_AGE = 300
+
+# `.values()`-based list serializers with byte-identical output (see core/fast_serializers.py).
+FAST_READ_SERIALIZERS = False
+
+# In-memory title prefix index behind /api/offers/suggest/ (see offers_app/suggest.py).
+OFFERS_SUGGEST_MAX_AGE = 300
+OFFERS_SUGGEST_MAX_OFFERS = 200000
+
+# Finished orders older than this many days are moved by `archive_orders` (see orders_app/archive.py).
+ORDERS_ARCHIVE_AFTER_DAYS = 90
+
+# Days the order change feed behind /api/orders/changes/ is kept (see orders_app/changes.py).
+ORDERS_CHANGE_LOG_MAX_AGE_DAYS = 7
+
+# Stored responses of create requests sent with an Idempotency-Key header (see core/idempotency.py).
+IDEMPOTENCY_KEY_TTL = 86400
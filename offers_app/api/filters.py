@@ -0,0 +1,126 @@
+import django_filters
+from django import forms
+from django.db.models import Exists, OuterRef
+from rest_framework import filters
+from offers_app import features, search
+from offers_app.models import Offer, OfferDetail
+
+
+class IntegerFilter(django_filters.NumberFilter):
+    """
+    NumberFilter that only accepts whole numbers.
+    """
+    field_class = forms.IntegerField
+
+
+class MultipleValueField(forms.Field):
+    """
+    Form field for a repeatable query parameter (`?feature=a&feature=b`);
+    cleans to a list of the non-blank values.
+    """
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        return [item.strip() for item in value if item and item.strip()]
+
+
+class MultipleValueFilter(django_filters.Filter):
+    field_class = MultipleValueField
+
+
+class OfferFilterSet(django_filters.FilterSet):
+    """
+    Query-parameter filters for the offers list and facets.
+
+    Filters:
+        - user_id: only offers owned by this user
+        - min_price: offers whose cheapest detail costs at least this much
+        - max_price: offers with a detail costing at most this much
+        - max_delivery_time: offers with a detail deliverable within this many days
+        - offer_type: offers having a detail of this type (basic/standard/premium)
+        - feature: offers having a detail that lists this feature; repeatable
+          (`?feature=Logo&feature=Flyer`), case and spacing are ignored
+        - feature_match: "all" (default, AND) or "any" (OR) for several features
+
+    Every filter compiles to a predicate on the offers table itself: the
+    price and delivery filters read the denormalized min columns, and
+    offer_type is a correlated EXISTS over the details. There is no join to
+    the details, so no GROUP BY and no DISTINCT are needed. feature is an
+    `id IN (...)` over the (feature, offer) index of the feature links (see
+    offers_app/features.py); only "all" with several features groups the
+    links of the requested features.
+    """
+    user_id = IntegerFilter(field_name='user_id')
+    min_price = IntegerFilter(
+        field_name='min_price', lookup_expr='gte',
+        error_messages={'invalid': 'min_price must be a valid integer.'},
+    )
+    max_price = IntegerFilter(
+        field_name='min_price', lookup_expr='lte',
+        error_messages={'invalid': 'max_price must be a valid integer.'},
+    )
+    max_delivery_time = IntegerFilter(
+        field_name='min_delivery_time', lookup_expr='lte',
+        error_messages={'invalid': 'must be a valid number'},
+    )
+    offer_type = django_filters.ChoiceFilter(choices=OfferDetail.OFFER_TYPE, method='filter_offer_type')
+    feature = MultipleValueFilter(method='filter_feature')
+    feature_match = django_filters.ChoiceFilter(
+        choices=(('all', 'All'), ('any', 'Any')), method='filter_feature_match',
+    )
+
+    class Meta:
+        model = Offer
+        fields = [
+            'user_id', 'min_price', 'max_price', 'max_delivery_time', 'offer_type', 'feature', 'feature_match',
+        ]
+
+    def filter_offer_type(self, queryset, name, value):
+        has_type = OfferDetail.objects.filter(offer=OuterRef('pk'), offer_type=value)
+        return queryset.filter(Exists(has_type))
+
+    def filter_feature(self, queryset, name, value):
+        match = self.form.cleaned_data.get('feature_match') or 'all'
+        offer_ids = features.offer_ids_with_features(value, match=match)
+        if offer_ids is None:
+            return queryset.none()
+        return queryset.filter(pk__in=offer_ids)
+
+    def filter_feature_match(self, queryset, name, value):
+        # Read by filter_feature.
+        return queryset
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the offers full-text index.
+
+    Behavior:
+        - Every word in the search term is matched as a prefix against
+          title and description ("log des" finds "Logo Design").
+        - Results are annotated with `search_rank` (bm25, lower is better)
+          and ordered by relevance unless the client passes `?ordering=`.
+        - Only narrows the queryset, so the user_id / price / delivery
+          filters of OfferFilterSet still apply.
+        - Falls back to the regular LIKE-based SearchFilter when the
+          database has no FTS index.
+
+    Must come after OrderingFilter in `filter_backends`, otherwise the
+    default ordering would replace the relevance ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '')
+        if not term.strip() or not search.is_available():
+            return super().filter_queryset(request, queryset, view)
+
+        match = search.build_match_query(term)
+        if match is None:
+            return queryset.none()
+
+        queryset = search.filter_queryset(queryset, match)
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            queryset = queryset.order_by('search_rank', '-updated_at', 'id')
+        return queryset
@@ -0,0 +1,55 @@
+from core.pagination import KeysetPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+
+
+class PageNumberSetPagination(PageNumberPagination):
+    """
+    Custom pagination class to set the page size to 5 and limit the maximum page size to 5.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 6
+
+
+class OfferKeysetPagination(KeysetPagination):
+    """
+    Opaque-cursor (keyset) pagination for the offers list.
+
+    Ordering keys:
+        - updated_at: pages are keyed on (updated_at, id)
+        - min_price:  pages are keyed on (min_price, id)
+
+    Query parameters: cursor, page_size (max 6) and include_count; see
+    core.pagination.KeysetPagination for the cursor and NULL handling.
+    """
+    page_size = 6
+    max_page_size = 6
+    ordering_keys = ('updated_at', 'min_price')
+    datetime_keys = ('updated_at',)
+
+
+class OfferListPagination(BasePagination):
+    """
+    Pagination for OfferListView, selectable per request.
+
+    - Default: page-number pagination (`?page=`), unchanged for existing clients.
+    - `?pagination=cursor` or any `?cursor=` token: keyset pagination via
+      OfferKeysetPagination.
+    """
+    mode_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_mode(request):
+            self.paginator = OfferKeysetPagination()
+        else:
+            self.paginator = PageNumberSetPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def is_cursor_mode(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or OfferKeysetPagination.cursor_query_param in request.query_params
+        )
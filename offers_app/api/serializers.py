@@ -1,6 +1,10 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
+from core.fast_serializers import FastReadSerializer
+from core.serializers import SparseFieldsetMixin
 from offers_app.models import Offer, OfferDetail
-from django.db.models import Min
+from django.db import transaction
+from offers_app import cache as offer_cache, features, read_index, search, suggest, thumbnails
 from userprofile_app.models import UserProfile
 from rest_framework.exceptions import ValidationError
 
@@ -82,7 +86,7 @@ class OfferDetailLinkSerializer(serializers.ModelSerializer):
 
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for a single Offer.
 
@@ -92,10 +96,15 @@ class OfferSerializer(serializers.ModelSerializer):
     - image
     - description
     - details
+    - min_price / min_delivery_time (read from the denormalized columns)
+    - thumbnails (card / detail / retina URLs, the original image until rendered)
+
+    Supports `?fields=` / `?omit=` (see SparseFieldsetMixin).
     """
     details = OfferDetailLinkSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
+    min_price = serializers.IntegerField(read_only=True)
+    min_delivery_time = serializers.IntegerField(read_only=True)
     user = serializers.IntegerField(source='user_id', read_only=True)
     user_details = UserDetailSerializer(source='user', read_only=True)
 
@@ -106,6 +115,7 @@ class OfferSerializer(serializers.ModelSerializer):
             'user',
             'title',
             'image',
+            'thumbnails',
             'description',
             'created_at',
             'updated_at',
@@ -115,12 +125,92 @@ class OfferSerializer(serializers.ModelSerializer):
             'user_details',
         ]
 
-    def get_min_price(self, obj):
-        return obj.details.aggregate(min=Min('price'))['min']
+    def get_thumbnails(self, obj):
+        return thumbnails.get_urls(obj, self.context.get('request'))
+
+
+
+class OfferFastSerializer(FastReadSerializer):
+    """
+    Fast read path for OfferSerializer (see core.fast_serializers).
+
+    - details: the detail ids of the whole page are loaded with one
+      `values_list` query, and the links are built from a URL template
+      reversed once per request instead of once per detail.
+    - thumbnails: built from the raw image / thumbnails columns.
+    """
+    serializer_class = OfferSerializer
+    custom_fields = {
+        'details': [],
+        'thumbnails': ['image', 'thumbnails'],
+    }
+    url_placeholder = 987654321
+
+    def prepare(self, rows):
+        if not any(step[0] == 'details' for step in self.steps):
+            return
+        self.detail_ids = {row['id']: [] for row in rows}
+        details = OfferDetail.objects.filter(offer_id__in=list(self.detail_ids)).order_by('id')
+        for offer_id, detail_id in details.values_list('offer_id', 'id'):
+            self.detail_ids[offer_id].append(detail_id)
+        url = reverse('one-offer-details', kwargs={'id': self.url_placeholder}, request=self.request)
+        self.detail_url_prefix, self.detail_url_suffix = url.split(str(self.url_placeholder))
+
+    def render_details(self, row):
+        prefix, suffix = self.detail_url_prefix, self.detail_url_suffix
+        return [{'id': detail_id, 'url': f'{prefix}{detail_id}{suffix}'} for detail_id in self.detail_ids[row['id']]]
+
+    def render_thumbnails(self, row):
+        return thumbnails.get_urls_for_image(row['image'], row['thumbnails'], self.request)
+
+
+class OfferBulkCreateListSerializer(serializers.ListSerializer):
+    """
+    List serializer used by `OfferCreateSerializer(many=True)`.
 
-    def get_min_delivery_time(self, obj):
-        return obj.details.aggregate(min=Min('delivery_time_in_days'))['min']
+    Behavior:
+    - Every item is validated by OfferCreateSerializer before anything is
+      written; `errors` lines up with the input list.
+    - `create()` writes all offers with one `bulk_create` and all of their
+      details with a second one, inside a single transaction.
+    - min_price / min_delivery_time are computed from the submitted details
+      before the insert, so no follow-up UPDATE is needed.
+    - bulk_create sends no signals, so the search index, the feature index,
+      the read index, the suggestion index and the response cache are
+      updated explicitly.
+    """
 
+    def create(self, validated_data):
+        request = self.context.get('request')
+        offers = []
+        details_per_offer = []
+        for item in validated_data:
+            item = dict(item)
+            details_data = item.pop('details')
+            offers.append(Offer(
+                user=request.user,
+                min_price=min(detail['price'] for detail in details_data),
+                min_delivery_time=min(detail['delivery_time_in_days'] for detail in details_data),
+                **item,
+            ))
+            details_per_offer.append(details_data)
+
+        with transaction.atomic():
+            Offer.objects.bulk_create(offers)
+            details = OfferDetail.objects.bulk_create([
+                OfferDetail(offer=offer, **detail_data)
+                for offer, details_data in zip(offers, details_per_offer)
+                for detail_data in details_data
+            ])
+            search.index_offers(offers)
+            features.sync_details(details)
+            offer_cache.invalidate_offers([offer.pk for offer in offers])
+            read_index.refresh_offers([offer.pk for offer in offers])
+            suggest.refresh_offers([offer.pk for offer in offers])
+
+        created = Offer.objects.filter(pk__in=[offer.pk for offer in offers]).prefetch_related('details')
+        by_pk = {offer.pk: offer for offer in created}
+        return [by_pk[offer.pk] for offer in offers]
 
 
 class OfferCreateSerializer(serializers.ModelSerializer):
@@ -134,6 +224,7 @@ class OfferCreateSerializer(serializers.ModelSerializer):
     Behavior:
     - Validates that at least three details are provided.
     - Creates the Offer first and then all OfferDetails that reference it.
+    - Stores the resulting min_price / min_delivery_time on the Offer.
     """
     details = OfferDetailsSerializer(many=True)
     class Meta:
@@ -145,6 +236,7 @@ class OfferCreateSerializer(serializers.ModelSerializer):
             'description',
             'details',
         ]
+        list_serializer_class = OfferBulkCreateListSerializer
 
     def validate(self, attrs):
         """
@@ -167,9 +259,11 @@ class OfferCreateSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         details_data = validated_data.pop('details')
-        offer = Offer.objects.create(user=request.user, **validated_data)
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        with transaction.atomic():
+            offer = Offer.objects.create(user=request.user, **validated_data)
+            for detail_data in details_data:
+                OfferDetail.objects.create(offer=offer, **detail_data)
+            offer.refresh_min_values()
         return offer
     
 
@@ -178,8 +272,15 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
     Serializer for updating an existing Offer.
 
     Behavior:
-    - Updates the Offer fields.
-    - Deletes and recreates all related OfferDetails.
+    - Rejects details whose offer_type does not exist on the offer during
+      validation, before anything is written.
+    - Only fields whose value actually differs are written: the Offer with
+      `save(update_fields=...)` and all changed OfferDetails with one
+      `bulk_update` limited to the changed columns, in a single transaction.
+    - `updated_at` is bumped only if something changed; an unchanged PATCH
+      performs no writes at all.
+    - min_price / min_delivery_time are recomputed from the loaded details
+      when a price or delivery time changed.
     """
     details = OfferDetailsSerializer(many=True)
     image = serializers.ImageField(required=False)
@@ -195,35 +296,63 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
             'details',
         ]
 
+    def validate(self, attrs):
+        """
+        Ensure every submitted detail matches an existing offer_type.
+
+        The loaded details are kept for `update()` so they are read only once.
+        """
+        details = attrs.get('details')
+        if details is not None and self.instance is not None:
+            self.existing_details = {detail.offer_type: detail for detail in self.instance.details.all()}
+            for detail in details:
+                offer_type = detail.get('offer_type')
+                if offer_type not in self.existing_details:
+                    raise serializers.ValidationError(
+                        {'details': f"OfferDetail with type '{offer_type}' does not exist for this offer."}
+                    )
+        return attrs
+
     def update(self, instance, validated_data):
         details_data = validated_data.pop('details', None)
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        changed_fields = [attr for attr, value in validated_data.items() if getattr(instance, attr) != value]
+        for attr in changed_fields:
+            setattr(instance, attr, validated_data[attr])
 
+        changed_details = {}
+        changed_detail_fields = set()
         if details_data is not None:
-    
-            existing_details = {}
-            for detail in instance.details.all():
-                existing_details[detail.offer_type] = detail
-                
+            existing_details = self.existing_details
             for detail in details_data:
-                offer_type = detail.get('offer_type')
-                if offer_type in existing_details:
-                    detail_instance = existing_details[offer_type]
-                    for attr, value in detail.items():
+                detail_instance = existing_details[detail['offer_type']]
+                for attr, value in detail.items():
+                    if getattr(detail_instance, attr) != value:
                         setattr(detail_instance, attr, value)
-                    detail_instance.save()
-                else:
-                    raise serializers.ValidationError(
-                        f"OfferDetail with type '{offer_type}' does not exist for this offer."
-                    )
+                        changed_detail_fields.add(attr)
+                        changed_details[detail_instance.pk] = detail_instance
+
+            if changed_detail_fields & {'price', 'delivery_time_in_days'}:
+                instance.min_price = min(detail.price for detail in existing_details.values())
+                instance.min_delivery_time = min(
+                    detail.delivery_time_in_days for detail in existing_details.values()
+                )
+                changed_fields += ['min_price', 'min_delivery_time']
+
+        if not changed_fields and not changed_details:
+            return instance
+
+        with transaction.atomic():
+            if changed_details:
+                OfferDetail.objects.bulk_update(changed_details.values(), sorted(changed_detail_fields))
+                if 'features' in changed_detail_fields:
+                    # bulk_update sends no post_save.
+                    features.sync_details(changed_details.values())
+            # Also fires post_save, which re-indexes and invalidates the cache.
+            instance.save(update_fields=changed_fields + ['updated_at'])
 
         return instance
 
-        
-
     def to_representation(self, instance):
         """
         Normalize None values to empty strings for selected optional fields.
@@ -236,7 +365,7 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
                 data[space] = ""
         return data
     
-class OneOfferDetailSerializer(serializers.ModelSerializer):
+class OneOfferDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for a single OfferDetail.
 
@@ -247,6 +376,8 @@ class OneOfferDetailSerializer(serializers.ModelSerializer):
     - price
     - features (as a list)
     - variant type (basic, standard, premium)
+
+    Supports `?fields=` / `?omit=` (see SparseFieldsetMixin).
     """
     class Meta:
         model = OfferDetail
@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import OfferListView, OfferDetailsView, OneOfferDetailsView
+from .views import (
+    OfferListView, OfferDetailsView, OneOfferDetailsView, OfferCacheStatsView, OfferBulkCreateView, OfferFacetsView,
+    OfferFeaturesView, OfferExportView, OfferSuggestView, OfferSuggestStatsView,
+)
 
 urlpatterns = [
     path('offers/', OfferListView.as_view(), name='offers'),
+    path('offers/bulk/', OfferBulkCreateView.as_view(), name='offers-bulk'),
+    path('offers/facets/', OfferFacetsView.as_view(), name='offers-facets'),
+    path('offers/features/', OfferFeaturesView.as_view(), name='offers-features'),
+    path('offers/suggest/', OfferSuggestView.as_view(), name='offers-suggest'),
+    path('offers/suggest/stats/', OfferSuggestStatsView.as_view(), name='offers-suggest-stats'),
+    path('offers/export/', OfferExportView.as_view(), name='offers-export'),
+    path('offers/cache-stats/', OfferCacheStatsView.as_view(), name='offers-cache-stats'),
     path('offers/<int:id>/', OfferDetailsView.as_view(), name='offer-detail'),
     path('offerdetails/<int:id>/', OneOfferDetailsView.as_view(), name='one-offer-details'),
 ]
@@ -1,27 +1,92 @@
+from functools import partial
+from core.exports import EXPORT_CHUNK_SIZE, get_export_format, stream_export
+from core.fast_serializers import FastReadListMixin
+from core.idempotency import idempotent
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.views import APIView
+from offers_app import cache as offer_cache, features, read_index, suggest
 from offers_app.models import Offer, OfferDetail
-from .serializers import OfferSerializer, OfferUpdateSerializer, OfferCreateSerializer, OneOfferDetailSerializer
-from rest_framework.pagination import PageNumberPagination
+from .serializers import (
+    OfferFastSerializer, OfferSerializer, OfferUpdateSerializer, OfferCreateSerializer, OneOfferDetailSerializer,
+)
+from .pagination import OfferListPagination
+from .filters import OfferFilterSet, OfferSearchFilter
 from rest_framework import generics
 from rest_framework import filters
-from django.db.models import Min
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import ValidationError
 
 
+def get_offer_read_queryset(fields=None):
+    """
+    Base queryset for reading offers through OfferSerializer.
+
+    Loads the owner with the offer (select_related) and the detail links
+    (id only) with one extra query per page (Prefetch), so listing costs a
+    constant number of queries whatever the page size. min_price and
+    min_delivery_time are plain columns on Offer and need no query.
 
-class PageNumberSetPagination(PageNumberPagination):
+    Args:
+        fields (set | None): output fields requested with ?fields= / ?omit=.
+            The owner join and the details prefetch are skipped when
+            `user_details` or `details` is not among them.
     """
-    Custom pagination class to set the page size to 5 and limit the maximum page size to 5.
+    queryset = Offer.objects.all()
+    if fields is None or 'user_details' in fields:
+        queryset = queryset.select_related('user')
+    if fields is None or 'details' in fields:
+        queryset = queryset.prefetch_related(
+            Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id').order_by('id'))
+        )
+    return queryset
+
+
+class OfferResponseCacheMixin:
     """
-    page_size = 6
-    page_size_query_param = 'page_size'
-    max_page_size = 6
+    Serve anonymous GET responses from the versioned offer cache.
 
-class OfferListView(generics.ListCreateAPIView):
+    Subclasses set `cache_kind` ('list' or 'detail'), the query params that
+    may appear in a cacheable request (`cache_query_params`) and override
+    `get_cache_key()`. Requests with other params, authenticated requests
+    and non-200 responses bypass the cache. Every response carries an
+    `X-Cache: HIT|MISS` header and feeds the counters in offers_app.cache.
+    """
+    cache_kind = None
+    cache_query_params = ()
+
+    def get_cache_key(self, request, **kwargs):
+        """
+        Cache key of the request, or None to render it without the cache
+        (the default).
+        """
+        return None
+
+    def cached_response(self, request, render, **kwargs):
+        if request.user.is_authenticated:
+            return render()
+        key = self.get_cache_key(request, **kwargs)
+        if key is None:
+            return render()
+
+        data = cache.get(key)
+        if data is not None:
+            offer_cache.record(self.cache_kind, hit=True)
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        offer_cache.record(self.cache_kind, hit=False)
+        response = render()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, offer_cache.get_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class OfferListView(OfferResponseCacheMixin, FastReadListMixin, generics.ListCreateAPIView):
     """
     View for listing and creating offers.
 
@@ -30,20 +95,41 @@ class OfferListView(generics.ListCreateAPIView):
     Attributes:
         queryset (QuerySet): The queryset of offers to retrieve.
         serializer_class (Serializer): The serializer class used for serialization.
-        pagination_class (Pagination): The pagination class used for pagination.
+        pagination_class (Pagination): Page-number pagination by default, keyset
+            pagination with `?pagination=cursor` (see OfferListPagination).
         filter_backends (list): The list of filter backends used for filtering.
-        search_fields (list): The list of fields to search for in offers.
+        filterset_class (FilterSet): Query-parameter filters (see OfferFilterSet).
+        search_fields (list): The list of fields to search for in offers
+            (LIKE fallback when the full-text index is unavailable).
         ordering_fields (list): The list of fields to order offers by.
+        read_index_query_params (set): Query params the in-memory read index
+            can answer; other requests are filtered in SQL.
+        fast_read_serializer_class: `.values()`-based renderer used for GET
+            when FAST_READ_SERIALIZERS is on (byte-identical output).
     
     """
     permission_classes = [AllowAny]
     queryset = Offer.objects.all()
     serializer_class = OfferSerializer
-    pagination_class = PageNumberSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = OfferListPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, OfferSearchFilter]
+    filterset_class = OfferFilterSet
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
     ordering = ['updated_at', 'min_price']
+    cache_kind = 'list'
+    cache_query_params = (
+        'search', 'ordering', 'page', 'page_size', 'pagination', 'cursor', 'include_count',
+        'min_price', 'max_price', 'max_delivery_time', 'user_id', 'offer_type', 'feature', 'feature_match',
+        'fields', 'omit',
+    )
+    read_index_query_params = {
+        'ordering', 'page', 'page_size', 'min_price', 'max_price', 'max_delivery_time', 'user_id',
+        'fields', 'omit',
+    }
+    fast_read_serializer_class = OfferFastSerializer
+    # Cursor pagination reads its keys from the rows.
+    fast_read_extra_columns = ('updated_at', 'min_price')
 
     def get_serializer_class(self):
         """
@@ -52,34 +138,62 @@ class OfferListView(generics.ListCreateAPIView):
         return OfferCreateSerializer if self.request.method == 'POST' else OfferSerializer
 
     def get_queryset(self):
-        queryset = Offer.objects.all()
-        queryset = queryset.annotate(min_price=Min('details__price'))
-
-        user_id = self.request.query_params.get('user_id', None)
-        if user_id:
-            queryset = queryset.filter(user_id=user_id)
-
-        min_price_param = self.request.query_params.get('min_price', None)
-        if min_price_param is not None:
-            try:
-                min_price_val = int(min_price_param)
-            except (ValueError, TypeError):
-                raise ValidationError({"min_price": "min_price must be a valid integer."})
-            queryset = queryset.annotate(min_detail_price=Min('details__price')).filter(min_detail_price__gte=min_price_val)
-
-        max_delivery_time_param = self.request.query_params.get('max_delivery_time', None)
-        if max_delivery_time_param:
-            try:
-                max_delivery_time_val = int(max_delivery_time_param)
-            except (ValueError, TypeError):
-                raise ValidationError({"max_delivery_time": "must be a valid number"})
-            
-            queryset = queryset.annotate(
-                min_delivery=Min('details__delivery_time_in_days')
-            ).filter(min_delivery__lte=max_delivery_time_val)
-
-
-        return queryset.distinct()
+        """
+        Offers with owners and detail links preloaded, unless ?fields= /
+        ?omit= drops them. Query-parameter filtering happens in OfferFilterSet.
+        """
+        return get_offer_read_queryset(OfferSerializer.get_requested_fields(self.request))
+
+    def get_fast_read_queryset(self):
+        return Offer.objects.all()
+
+    def filter_queryset(self, queryset):
+        """
+        Answer from the in-memory read index when it is enabled and can
+        handle the request, otherwise filter in SQL.
+        """
+        indexed = self.filter_from_read_index(queryset)
+        if indexed is not None:
+            return indexed
+        return super().filter_queryset(queryset)
+
+    def filter_from_read_index(self, queryset):
+        """
+        Return an IndexedOfferList for the request, or None if the read index
+        is disabled or the request needs SQL (search, offer_type, cursor
+        pagination, invalid filters).
+
+        Only the rows of the requested page are loaded from the database.
+        """
+        if not read_index.is_enabled() or self.request.method != 'GET':
+            return None
+        if not set(self.request.query_params) <= self.read_index_query_params:
+            return None
+        filterset = OfferFilterSet(self.request.query_params, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            # Let DjangoFilterBackend report the errors.
+            return None
+        ordering = filters.OrderingFilter().get_ordering(self.request, queryset, self)
+        if not ordering or any(term.lstrip('-') not in read_index.ORDERING_KEYS for term in ordering):
+            return None
+        cleaned = filterset.form.cleaned_data
+        ids = read_index.get_index().query(
+            ordering,
+            user_id=cleaned.get('user_id'),
+            min_price=cleaned.get('min_price'),
+            max_price=cleaned.get('max_price'),
+            max_delivery_time=cleaned.get('max_delivery_time'),
+        )
+        return read_index.IndexedOfferList(ids, queryset)
+
+    def get_cache_key(self, request, **kwargs):
+        return offer_cache.list_key(request, self.cache_query_params)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List offers, served from the response cache for anonymous clients.
+        """
+        return self.cached_response(request, partial(super().list, request, *args, **kwargs))
 
     def get_permissions_classes(self,request):
         if request.method == 'POST':
@@ -88,10 +202,13 @@ class OfferListView(generics.ListCreateAPIView):
             return [IsAuthenticated()]
         return super().get_permissions(request)
 
+    @idempotent('offers.create')
     def post(self, request):
         """
         Create a new offer.
 
+        Retries sending the same `Idempotency-Key` header replay the first
+        response instead of creating another offer (see core/idempotency.py).
         """
         user = request.user
         serializer = OfferCreateSerializer(data=request.data, context={'request': request})
@@ -107,7 +224,332 @@ class OfferListView(generics.ListCreateAPIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)    
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class OfferDetailsView(generics.RetrieveAPIView):
+class OfferBulkCreateView(APIView):
+    """
+    Create many offers (each with its details) in one request.
+
+    POST /api/offers/bulk/:
+        Body: a list of offers in the same shape as POST /api/offers/
+            [
+              {"title": "...", "description": "...", "details": [{...}, {...}, {...}]},
+              ...
+            ]
+
+        Rules:
+            - Only business users can create offers.
+            - At most `max_batch_size` offers per request.
+            - All items are validated first. If any item is invalid nothing
+              is written, so a corrected batch can simply be resent.
+            - Valid batches are written in one transaction with two
+              bulk INSERTs (offers, then details).
+            - Optional `Idempotency-Key` header: a retry with the same key
+              replays the first response instead of writing the batch again
+              (see core/idempotency.py).
+
+        Responses:
+            201 Created:
+                {"results": [{"index": 0, "id": <int>, "offer": {...}, "errors": null}, ...]}
+            400 Bad Request:
+                {"results": [{"index": 0, "id": null, "offer": null, "errors": {...} | null}, ...]}
+            401 Unauthorized / 403 Forbidden: not logged in / not a business user
+    """
+    permission_classes = [IsAuthenticated]
+    max_batch_size = 500
+
+    @idempotent('offers.bulk_create')
+    def post(self, request):
+        """
+        Validate and bulk-create the submitted offers.
+        """
+        if request.user.type != 'business':
+            return Response({"error": "Only business users can create offers."}, status=status.HTTP_403_FORBIDDEN)
+
+        if not isinstance(request.data, list):
+            return Response({"error": "Expected a list of offers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = OfferCreateSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=self.max_batch_size, context={'request': request}
+        )
+        if not serializer.is_valid():
+            if not isinstance(serializer.errors, list):
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            results = [
+                {"index": index, "id": None, "offer": None, "errors": errors or None}
+                for index, errors in enumerate(serializer.errors)
+            ]
+            return Response({"results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer.save()
+        results = [
+            {"index": index, "id": item['id'], "offer": item, "errors": None}
+            for index, item in enumerate(serializer.data)
+        ]
+        return Response({"results": results}, status=status.HTTP_201_CREATED)
+
+
+class OfferFacetsView(OfferResponseCacheMixin, generics.GenericAPIView):
+    """
+    Offer counts for the price, delivery-time and offer-type filter widgets.
+
+    GET /api/offers/facets/:
+        Accepts the same filters as GET /api/offers/ (search plus
+        OfferFilterSet) and counts the matching offers in a
+        single aggregate query using conditional COUNTs.
+
+        Response: 200 OK
+            {
+              "count": <int>,
+              "price": [{"min": 0, "max": 50, "count": <int>}, ..., {"min": 1000, "max": null, "count": <int>}],
+              "max_delivery_time": [{"days": 1, "count": <int>}, ...],
+              "offer_type": {"basic": <int>, "standard": <int>, "premium": <int>}
+            }
+
+        Price buckets are half-open ranges on the offer's min_price.
+        Delivery buckets are cumulative, matching ?max_delivery_time=<days>.
+        Offer-type counts are offers having at least one detail of that type.
+        Anonymous responses are cached with the same catalog version as the list.
+    """
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    filterset_class = OfferFilterSet
+    search_fields = ['title', 'description']
+    price_buckets = [(0, 50), (50, 100), (100, 250), (250, 500), (500, 1000), (1000, None)]
+    delivery_buckets = [1, 3, 7, 14, 30]
+    cache_kind = 'facets'
+    cache_query_params = (
+        'search', 'min_price', 'max_price', 'max_delivery_time', 'user_id', 'offer_type', 'feature', 'feature_match',
+    )
+
+    def get_queryset(self):
+        return Offer.objects.all()
+
+    def get_cache_key(self, request, **kwargs):
+        return offer_cache.list_key(request, self.cache_query_params, kind=self.cache_kind)
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, partial(self.get_facets, request))
+
+    def get_facets(self, request):
+        aggregates = {'count': Count('id')}
+        for index, (low, high) in enumerate(self.price_buckets):
+            condition = Q(min_price__gte=low)
+            if high is not None:
+                condition &= Q(min_price__lt=high)
+            aggregates[f'price_{index}'] = Count('id', filter=condition)
+        for days in self.delivery_buckets:
+            aggregates[f'delivery_{days}'] = Count('id', filter=Q(min_delivery_time__lte=days))
+        for offer_type, _ in OfferDetail.OFFER_TYPE:
+            has_type = Exists(OfferDetail.objects.filter(offer=OuterRef('pk'), offer_type=offer_type))
+            aggregates[f'type_{offer_type}'] = Count('id', filter=Q(has_type))
+
+        counts = self.filter_queryset(self.get_queryset()).aggregate(**aggregates)
+        return Response({
+            'count': counts['count'],
+            'price': [
+                {'min': low, 'max': high, 'count': counts[f'price_{index}']}
+                for index, (low, high) in enumerate(self.price_buckets)
+            ],
+            'max_delivery_time': [
+                {'days': days, 'count': counts[f'delivery_{days}']} for days in self.delivery_buckets
+            ],
+            'offer_type': {
+                offer_type: counts[f'type_{offer_type}'] for offer_type, _ in OfferDetail.OFFER_TYPE
+            },
+        }, status=status.HTTP_200_OK)
+
+
+class OfferFeaturesView(OfferResponseCacheMixin, generics.GenericAPIView):
+    """
+    The most common offer features with the number of offers using them.
+
+    GET /api/offers/features/:
+        Query parameters:
+            limit: number of features to return (default 20, at most 100).
+            search and the OfferFilterSet filters, as on GET /api/offers/:
+                only matching offers are counted.
+
+        Response: 200 OK
+            [{"name": "Logo Design", "offer_count": <int>}, ...]
+
+        Features are ordered by offer count (descending), then name. An
+        offer counts once per feature even if several of its details list it.
+        Counts are read from the feature index (offers_app/features.py);
+        anonymous responses are cached with the catalog version.
+
+        400 Bad Request: invalid limit or filter
+    """
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    filterset_class = OfferFilterSet
+    search_fields = ['title', 'description']
+    default_limit = 20
+    max_limit = 100
+    cache_kind = 'features'
+    cache_query_params = (
+        'limit', 'search', 'min_price', 'max_price', 'max_delivery_time', 'user_id', 'offer_type', 'feature',
+        'feature_match',
+    )
+
+    def get_queryset(self):
+        return Offer.objects.all()
+
+    def get_cache_key(self, request, **kwargs):
+        return offer_cache.list_key(request, self.cache_query_params, kind=self.cache_kind)
+
+    def get_limit(self, request):
+        value = request.query_params.get('limit')
+        if value is None:
+            return self.default_limit
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({'limit': f'Must be an integer between 1 and {self.max_limit}.'})
+        return limit
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, partial(self.get_features, request))
+
+    def get_features(self, request):
+        limit = self.get_limit(request)
+        offer_ids = None
+        if set(request.query_params) - {'limit'}:
+            offer_ids = self.filter_queryset(self.get_queryset()).values('id')
+        return Response(features.top_features(limit, offer_ids=offer_ids), status=status.HTTP_200_OK)
+
+
+class OfferSuggestView(APIView):
+    """
+    Title suggestions for the offer search box (typeahead).
+
+    GET /api/offers/suggest/:
+        Query parameters:
+            q: what the user typed so far; every title word is matched as a
+                prefix ("des" finds "Logo Design", "logo d" finds
+                "Logo Design"). Case, accents and punctuation are ignored.
+            limit: number of suggestions (default 10, at most 20).
+
+        Response: 200 OK
+            {"results": [{"id": <int>, "title": <str>, "popularity": <int>}, ...]}
+
+        Suggestions are the most popular matching offers (number of orders),
+        one per distinct title, answered from the per-process prefix index in
+        offers_app/suggest.py without a database query once it is built.
+
+        400 Bad Request: missing q or invalid limit
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 20
+
+    def get(self, request):
+        query = request.query_params.get('q')
+        if query is None:
+            raise ValidationError({'q': 'This query parameter is required.'})
+        limit = request.query_params.get('limit', self.default_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({'limit': f'Must be an integer between 1 and {self.max_limit}.'})
+        results = suggest.get_index().suggest(query, limit)
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class OfferSuggestStatsView(APIView):
+    """
+    Size and lookup metrics of this process's suggestion index (admin only).
+
+    GET /api/offers/suggest/stats/:
+        Response: 200 OK
+            {
+              "offers": <int>, "entries": <int>, "pending": <int>, "removed": <int>,
+              "memory_bytes": <int>, "age_seconds": <float | null>,
+              "max_age_seconds": <int>, "max_offers": <int>,
+              "lookups": <int>, "avg_lookup_ms": <float>
+            }
+
+        `memory_bytes` is the size of the index's arrays, lists and strings.
+        `pending` / `removed` count overlay rows and tombstones waiting for
+        the next in-memory compaction.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(suggest.get_index().get_stats(), status=status.HTTP_200_OK)
+
+
+class OfferExportView(generics.GenericAPIView):
+    """
+    Stream all matching offers with their details as NDJSON or CSV.
+
+    GET /api/offers/export/:
+        Query parameters:
+            file_format: "ndjson" (default) or "csv".
+            search and the OfferFilterSet filters, as on GET /api/offers/.
+
+        Behavior:
+            - Offers are read in id order with `iterator(chunk_size=...)` and
+              their details are prefetched per chunk, so memory use stays
+              flat whatever the number of offers.
+            - NDJSON: one offer per line with a nested "details" list.
+            - CSV: one line per offer detail; the offer columns repeat and the
+              detail columns are prefixed with "detail_".
+
+        Responses:
+            200 OK: streamed file (Content-Disposition: attachment)
+            400 Bad Request: invalid filter or file_format
+    """
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    filterset_class = OfferFilterSet
+    search_fields = ['title', 'description']
+    offer_fields = [
+        'id', 'user', 'title', 'description', 'image', 'min_price', 'min_delivery_time', 'created_at', 'updated_at',
+    ]
+    detail_fields = ['id', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type']
+
+    def get_queryset(self):
+        return Offer.objects.only(*self.offer_fields).prefetch_related(
+            Prefetch('details', queryset=OfferDetail.objects.order_by('id'))
+        )
+
+    def get(self, request, *args, **kwargs):
+        export_format = get_export_format(request)
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        if export_format == 'csv':
+            columns = self.offer_fields + [f'detail_{name}' for name in self.detail_fields]
+            rows = self.iter_detail_rows(queryset)
+        else:
+            columns = self.offer_fields + ['details']
+            rows = self.iter_offer_rows(queryset)
+        return stream_export(rows, columns, export_format, 'offers')
+
+    def offer_row(self, offer):
+        row = {name: getattr(offer, name) for name in self.offer_fields if name not in ('user', 'image')}
+        row['user'] = offer.user_id
+        row['image'] = offer.image.name or None
+        return row
+
+    def detail_row(self, detail):
+        return {name: getattr(detail, name) for name in self.detail_fields}
+
+    def iter_offer_rows(self, queryset):
+        for offer in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row = self.offer_row(offer)
+            row['details'] = [self.detail_row(detail) for detail in offer.details.all()]
+            yield row
+
+    def iter_detail_rows(self, queryset):
+        for offer in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row = self.offer_row(offer)
+            for detail in offer.details.all():
+                yield {**row, **{f'detail_{name}': value for name, value in self.detail_row(detail).items()}}
+
+
+class OfferDetailsView(OfferResponseCacheMixin, generics.RetrieveAPIView):
     """
     View for retrieving details of an offer.
 
@@ -123,6 +565,8 @@ class OfferDetailsView(generics.RetrieveAPIView):
     serializer_class = OfferSerializer
     permission_classes = [AllowAny]
     lookup_url_kwarg = 'id' 
+    cache_kind = 'detail'
+    cache_query_params = ('fields', 'omit')
 
     def get_serializer_class(self):
         """
@@ -131,9 +575,18 @@ class OfferDetailsView(generics.RetrieveAPIView):
         return OfferUpdateSerializer if self.request.method in ('PATCH', 'PUT') else OfferSerializer
     
     def get_queryset(self):
-        queryset = Offer.objects.all()
+        queryset = get_offer_read_queryset(OfferSerializer.get_requested_fields(self.request))
 
         return queryset
+
+    def get_cache_key(self, request, **kwargs):
+        return offer_cache.detail_key(request, kwargs['id'], self.cache_query_params)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve a single offer, served from the response cache for anonymous clients.
+        """
+        return self.cached_response(request, partial(super().retrieve, request, *args, **kwargs), **kwargs)
     
     def patch(self, request, id):
         """
@@ -206,5 +659,30 @@ class OneOfferDetailsView(generics.RetrieveAPIView):
         """
         queryset = super().get_queryset()
         return queryset
-    
-    
\ No newline at end of file
+
+
+class OfferCacheStatsView(APIView):
+    """
+    Hit/miss counters of the offer response cache (admin only).
+
+    GET /api/offers/cache-stats/:
+        Response: 200 OK
+            {
+              "list": {"hits": <int>, "misses": <int>, "hit_rate": <float>},
+              "detail": {"hits": <int>, "misses": <int>, "hit_rate": <float>},
+              "facets": {"hits": <int>, "misses": <int>, "hit_rate": <float>},
+              "features": {"hits": <int>, "misses": <int>, "hit_rate": <float>},
+              "timeout": <int seconds>
+            }
+
+    DELETE /api/offers/cache-stats/:
+        Reset the counters, e.g. after changing the TTL.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(offer_cache.get_stats(), status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        offer_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
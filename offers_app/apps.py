@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OffersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offers_app'
+
+    def ready(self):
+        from offers_app import signals  # noqa: F401
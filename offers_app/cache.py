@@ -0,0 +1,145 @@
+"""
+Versioned response cache for the public offer endpoints.
+
+Cache keys embed a version number instead of being deleted on writes:
+
+    offers:list:<catalog version>:<hash of host + normalized query params>
+    offers:facets:<catalog version>:<hash of host + normalized query params>
+    offers:features:<catalog version>:<hash of host + normalized query params>
+    offers:detail:<offer id>:<offer version>:<hash of host + query params>
+
+Any Offer / OfferDetail save or delete bumps the catalog version and the
+version of the affected offer; a change to an owner's name bumps the catalog
+version and the versions of the owner's offers (see offers_app/signals.py),
+so stale entries
+are simply never looked up again and expire through their TTL. Bumps are
+deferred to `transaction.on_commit`, so a concurrent reader can never cache
+uncommitted data under the new version.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = 'offers:version:catalog'
+OFFER_VERSION_KEY = 'offers:version:offer:{}'
+STATS_KEY = 'offers:stats:{}:{}'
+STATS_KINDS = ('list', 'detail', 'facets', 'features')
+
+
+def get_timeout():
+    return getattr(settings, 'OFFERS_RESPONSE_CACHE_TIMEOUT', 60)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp rather than 1, so a version that was evicted
+        # from the cache never restarts at a number old entries still use.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def get_catalog_version():
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def get_offer_version(offer_id):
+    return _get_version(OFFER_VERSION_KEY.format(offer_id))
+
+
+def invalidate_offers(offer_ids=()):
+    """
+    Invalidate the list cache and the detail cache of the given offers once
+    the current transaction commits (immediately outside a transaction).
+    """
+    offer_ids = set(offer_ids)
+
+    def bump():
+        _bump(CATALOG_VERSION_KEY)
+        for offer_id in offer_ids:
+            _bump(OFFER_VERSION_KEY.format(offer_id))
+
+    transaction.on_commit(bump)
+
+
+def normalize_params(request, allowed_params):
+    """
+    Return a canonical, sorted tuple of the allowed query params, or None if
+    the request carries a parameter the cache does not know about (such
+    requests are not cached, so an unknown filter can never be answered
+    from the wrong entry).
+    """
+    params = request.query_params
+    if any(name not in allowed_params for name in params):
+        return None
+    normalized = []
+    for name in sorted(params):
+        values = [' '.join(value.split()) for value in params.getlist(name)]
+        if name in ('search', 'feature'):
+            # Both are matched case-insensitively.
+            values = [value.lower() for value in values]
+        values = [value for value in values if value]
+        if values:
+            normalized.append((name, tuple(values)))
+    return tuple(normalized)
+
+
+def list_key(request, allowed_params, kind='list'):
+    """
+    Key for a catalog-wide response (list, facets, features), tied to the catalog version.
+    """
+    normalized = normalize_params(request, allowed_params)
+    if normalized is None:
+        return None
+    digest = hashlib.sha1(repr((request.get_host(), normalized)).encode()).hexdigest()
+    return f'offers:{kind}:{get_catalog_version()}:{digest}'
+
+
+def detail_key(request, offer_id, allowed_params=()):
+    normalized = normalize_params(request, allowed_params)
+    if normalized is None:
+        return None
+    digest = hashlib.sha1(repr((request.get_host(), normalized)).encode()).hexdigest()
+    return f'offers:detail:{offer_id}:{get_offer_version(offer_id)}:{digest}'
+
+
+def record(kind, hit):
+    key = STATS_KEY.format(kind, 'hits' if hit else 'misses')
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_stats():
+    """
+    Return hit/miss counters per endpoint kind plus the configured TTL.
+    """
+    stats = {}
+    for kind in STATS_KINDS:
+        hits = cache.get(STATS_KEY.format(kind, 'hits'), 0)
+        misses = cache.get(STATS_KEY.format(kind, 'misses'), 0)
+        total = hits + misses
+        stats[kind] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+        }
+    stats['timeout'] = get_timeout()
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(kind, outcome) for kind in STATS_KINDS for outcome in ('hits', 'misses')])
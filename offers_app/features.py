@@ -0,0 +1,187 @@
+"""
+Inverted index from feature names to offers.
+
+`OfferDetail.features` is a free-form JSON list. Every string in it is
+normalized into a `Feature` row, and each (detail, feature) pair is stored as
+an `OfferDetailFeature` link carrying the offer id, so a feature filter is an
+index lookup on (feature, offer) instead of a scan that parses every
+detail's JSON.
+
+Freshness:
+    - OfferDetail saves call `sync_details()` (see offers_app/signals.py);
+      deletes cascade to the links.
+    - The bulk create path and OfferUpdateSerializer (bulk_update, no
+      signals) call `sync_details()` themselves.
+    - `rebuild_offer_feature_index` rebuilds every link from scratch and
+      drops unused features.
+"""
+from django.db import connection, transaction
+from django.db.models import Count
+
+from offers_app.models import Feature, OfferDetail, OfferDetailFeature
+
+MAX_LENGTH = 255
+
+
+def normalize(name):
+    """
+    Return (key, display name) for a feature string, or None if it is blank
+    or not a string. The key collapses whitespace and ignores case.
+    """
+    if not isinstance(name, str):
+        return None
+    name = ' '.join(name.split())[:MAX_LENGTH]
+    if not name:
+        return None
+    return name.casefold(), name
+
+
+def normalize_features(features):
+    """
+    Return {key: display name} for a detail's features list (first spelling wins).
+    """
+    normalized = {}
+    if isinstance(features, list):
+        for feature in features:
+            pair = normalize(feature)
+            if pair is not None:
+                normalized.setdefault(*pair)
+    return normalized
+
+
+def get_feature_ids(names, create=False):
+    """
+    Map normalized keys to Feature ids.
+
+    Args:
+        names (dict): {key: display name}, as returned by normalize_features().
+        create (bool): insert missing features (one bulk INSERT).
+    """
+    ids = dict(Feature.objects.filter(key__in=names).values_list('key', 'id'))
+    missing = [key for key in names if key not in ids]
+    if create and missing:
+        Feature.objects.bulk_create(
+            [Feature(key=key, name=names[key]) for key in missing], ignore_conflicts=True,
+        )
+        ids.update(Feature.objects.filter(key__in=missing).values_list('key', 'id'))
+    return ids
+
+
+def sync_details(details):
+    """
+    Bring the links of the given OfferDetail instances in line with their
+    `features` lists: one query for the existing links, at most one bulk
+    INSERT of new features, one DELETE and one bulk INSERT of links.
+    """
+    details = [detail for detail in details if detail.pk is not None]
+    if not details:
+        return
+    wanted_names = {detail.pk: normalize_features(detail.features) for detail in details}
+    all_names = {}
+    for names in wanted_names.values():
+        for key, name in names.items():
+            all_names.setdefault(key, name)
+
+    with transaction.atomic():
+        feature_ids = get_feature_ids(all_names, create=True)
+        wanted = {
+            (detail.pk, feature_ids[key]) for detail in details for key in wanted_names[detail.pk]
+        }
+        existing = {
+            (detail_id, feature_id): link_id
+            for link_id, detail_id, feature_id in OfferDetailFeature.objects.filter(
+                detail__in=wanted_names,
+            ).values_list('id', 'detail_id', 'feature_id')
+        }
+        stale = [link_id for pair, link_id in existing.items() if pair not in wanted]
+        if stale:
+            OfferDetailFeature.objects.filter(pk__in=stale).delete()
+        offer_ids = {detail.pk: detail.offer_id for detail in details}
+        OfferDetailFeature.objects.bulk_create([
+            OfferDetailFeature(detail_id=detail_id, offer_id=offer_ids[detail_id], feature_id=feature_id)
+            for detail_id, feature_id in wanted - existing.keys()
+        ])
+
+
+def rebuild(batch_size=2000):
+    """
+    Recreate every link from OfferDetail.features and drop features no
+    detail uses any more. Returns the number of details processed. Run
+    inside a transaction.
+
+    Starts from an empty link table, so there is nothing to diff: links are
+    written with plain batched INSERTs instead of going through
+    `sync_details()`.
+    """
+    OfferDetailFeature.objects.all().delete()
+    quote = connection.ops.quote_name
+    insert_sql = (
+        f'INSERT INTO {quote(OfferDetailFeature._meta.db_table)} '
+        f'({quote("detail_id")}, {quote("offer_id")}, {quote("feature_id")}) VALUES (%s, %s, %s)'
+    )
+    feature_ids = {}
+    count = 0
+    rows = []
+    details = OfferDetail.objects.values_list('id', 'offer_id', 'features').iterator(chunk_size=batch_size)
+    with connection.cursor() as cursor:
+        for detail_id, offer_id, detail_features in details:
+            names = normalize_features(detail_features)
+            missing = {key: name for key, name in names.items() if key not in feature_ids}
+            if missing:
+                feature_ids.update(get_feature_ids(missing, create=True))
+            rows.extend((detail_id, offer_id, feature_ids[key]) for key in names)
+            count += 1
+            if len(rows) >= batch_size:
+                cursor.executemany(insert_sql, rows)
+                rows = []
+        if rows:
+            cursor.executemany(insert_sql, rows)
+    Feature.objects.filter(detail_links__isnull=True).delete()
+    return count
+
+
+def offer_ids_with_features(names, match='all'):
+    """
+    Return a subquery of the ids of offers that have all (`match='all'`) or
+    any (`match='any'`) of the given feature names, or None if no offer can
+    match (an unknown feature under 'all', or no known feature at all).
+
+    An offer has a feature if any of its details lists it.
+    """
+    keys = {}
+    for name in names:
+        pair = normalize(name)
+        if pair is not None:
+            keys.setdefault(*pair)
+    feature_ids = set(get_feature_ids(keys).values())
+    if not feature_ids or (match == 'all' and len(feature_ids) < len(keys)):
+        return None
+    links = OfferDetailFeature.objects.filter(feature_id__in=feature_ids)
+    if match == 'any' or len(feature_ids) == 1:
+        return links.values('offer_id')
+    return (
+        links.values('offer_id')
+        .annotate(matched=Count('feature_id', distinct=True))
+        .filter(matched=len(feature_ids))
+        .values('offer_id')
+    )
+
+
+def top_features(limit=20, offer_ids=None):
+    """
+    Return the `limit` features used by the most offers, as
+    [{"name": <str>, "offer_count": <int>}, ...], ties by name.
+
+    Args:
+        offer_ids: optional subquery / list restricting the offers counted.
+    """
+    links = OfferDetailFeature.objects.all()
+    if offer_ids is not None:
+        links = links.filter(offer_id__in=offer_ids)
+    # Grouped on the (feature, offer) index; the LIMIT keeps only the top rows.
+    rows = (
+        links.values('feature_id', 'feature__name')
+        .annotate(offer_count=Count('offer_id', distinct=True))
+        .order_by('-offer_count', 'feature__name')[:limit]
+    )
+    return [{'name': row['feature__name'], 'offer_count': row['offer_count']} for row in rows]
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Min, OuterRef, Subquery
+from offers_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Recompute Offer.min_price and Offer.min_delivery_time for existing rows.
+
+    Usage:
+        python manage.py backfill_offer_min_values [--batch-size 1000]
+
+    Behavior:
+        - Walks the offers in primary-key ranges of `--batch-size`.
+        - Each range is updated by one UPDATE with correlated subqueries,
+          inside its own transaction, so the write lock is held briefly.
+    """
+    help = 'Backfill the denormalized min_price / min_delivery_time columns on Offer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+        min_price = Subquery(details.annotate(m=Min('price')).values('m'))
+        min_delivery_time = Subquery(details.annotate(m=Min('delivery_time_in_days')).values('m'))
+
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(
+                Offer.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                updated += Offer.objects.filter(pk__in=ids).update(
+                    min_price=min_price,
+                    min_delivery_time=min_delivery_time,
+                )
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled min values for {updated} offers.'))
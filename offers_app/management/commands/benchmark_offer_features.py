@@ -0,0 +1,124 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.http import QueryDict
+from offers_app import features
+from offers_app.api.filters import OfferFilterSet
+from offers_app.management.seed import seed_offers
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Compare feature filtering by scanning OfferDetail.features with the
+    feature index.
+
+    Usage:
+        python manage.py benchmark_offer_features [--details 300000] [--repeat 5]
+
+    Behavior:
+        - Seeds `--details` offer details and builds the feature index inside
+          a transaction that is rolled back at the end.
+        - For each scenario, builds the scan queryset (json_each over every
+          detail's features, one IN per feature) and the OfferFilterSet
+          queryset backed by the index.
+        - Checks that both return the same offers, then prints EXPLAIN QUERY
+          PLAN and the median time of the count plus the first page for each,
+          and the top features with their counts.
+    """
+    help = 'EXPLAIN QUERY PLAN and timings for JSON-scan vs. indexed ?feature= filtering.'
+
+    scenarios = {
+        'common feature': (['Logo Design'], 'all'),
+        'rare feature': (['Documentation'], 'all'),
+        'common AND rare': (['Logo Design', 'Documentation'], 'all'),
+        'three features, all': (['Logo Design', 'Flyer', 'Source Files'], 'all'),
+        'three features, any': (['Poster', 'Packaging', 'Documentation'], 'any'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--details', type=int, default=300000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write('The scan baseline uses SQLite json_each(); skipping it on other databases.')
+        with transaction.atomic():
+            users, offer_count = seed_offers(options['details'], options['users'])
+            start = time.perf_counter()
+            features.rebuild()
+            self.stdout.write(
+                f'Seeded {offer_count} offers / {offer_count * 3} details / {len(users)} users; '
+                f'feature index built in {(time.perf_counter() - start) * 1000:.0f} ms.'
+            )
+
+            for label, (names, match) in self.scenarios.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                indexed = self.indexed_queryset(names, match).order_by('updated_at', 'id')
+                after = self.run('index', indexed, options['repeat'])
+                if connection.vendor == 'sqlite':
+                    scan = self.scan_queryset(names, match).order_by('updated_at', 'id')
+                    if list(scan.values_list('pk', flat=True)) != list(indexed.values_list('pk', flat=True)):
+                        self.stderr.write(self.style.ERROR('  result sets differ'))
+                    before = self.run('scan', scan, options['repeat'])
+                    self.stdout.write(
+                        f'  before {before:9.3f} ms | after {after:9.3f} ms | x{before / max(after, 0.001):.1f}'
+                    )
+
+            self.stdout.write(self.style.MIGRATE_HEADING('top features'))
+            start = time.perf_counter()
+            top = features.top_features(10)
+            self.stdout.write(f'  {(time.perf_counter() - start) * 1000:.3f} ms')
+            for row in top:
+                self.stdout.write(f"    {row['offer_count']:8d}  {row['name']}")
+            transaction.set_rollback(True)
+
+    def scan_queryset(self, names, match):
+        """
+        The unindexed plan: expand every detail's JSON list with json_each()
+        and compare each element.
+        """
+        subqueries = [
+            RawSQL(
+                'SELECT d.offer_id FROM offers_app_offerdetail d, json_each(d.features) f '
+                "WHERE f.type = 'text' AND lower(f.value) = %s",
+                [name.lower()],
+            )
+            for name in names
+        ]
+        queryset = Offer.objects.all()
+        if match == 'any':
+            condition = None
+            for subquery in subqueries:
+                q = Offer.objects.filter(pk__in=subquery)
+                condition = q if condition is None else condition | q
+            return condition
+        for subquery in subqueries:
+            queryset = queryset.filter(pk__in=subquery)
+        return queryset
+
+    def indexed_queryset(self, names, match):
+        query = QueryDict(mutable=True)
+        query.setlist('feature', names)
+        query['feature_match'] = match
+        filterset = OfferFilterSet(query, queryset=Offer.objects.all())
+        if not filterset.is_valid():
+            raise ValueError(filterset.errors)
+        return filterset.qs
+
+    def run(self, label, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            queryset.count()
+            list(queryset[:6])
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        self.stdout.write(f'  {label}: {median:.3f} ms')
+        for line in queryset.explain().splitlines():
+            self.stdout.write(f'      {line}')
+        return median
@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, Min, OuterRef
+from django.http import QueryDict
+from offers_app.api.filters import OfferFilterSet
+from offers_app.management.seed import seed_offers
+from offers_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Compare the legacy annotate + DISTINCT offer filtering with OfferFilterSet.
+
+    Usage:
+        python manage.py benchmark_offer_filters [--details 300000] [--repeat 5]
+
+    Behavior:
+        - Seeds `--details` offer details inside a transaction that is rolled
+          back at the end, so the database is left untouched.
+        - For each filter combination, builds the legacy queryset (one
+          `Min('details__...')` annotation per filter, joined over the
+          details, then `.distinct()`) and the OfferFilterSet queryset.
+        - Checks that both return the same offers, then prints EXPLAIN QUERY
+          PLAN and the median time of the first page for each.
+    """
+    help = 'EXPLAIN QUERY PLAN and timings for legacy offer filtering vs. OfferFilterSet.'
+
+    scenarios = {
+        'min_price': {'min_price': '1000'},
+        'min_price + max_delivery_time': {'min_price': '1000', 'max_delivery_time': '7'},
+        'max_price + offer_type': {'max_price': '500', 'offer_type': 'premium'},
+        'all filters': {'min_price': '100', 'max_price': '2000', 'max_delivery_time': '14', 'offer_type': 'premium'},
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--details', type=int, default=300000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            users, offer_count = seed_offers(options['details'], options['users'])
+            self.stdout.write(f'Seeded {offer_count} offers / {offer_count * 3} details / {len(users)} users.')
+
+            for label, params in self.scenarios.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                legacy = self.legacy_queryset(params).order_by('updated_at', 'id')
+                filterset = self.filterset_queryset(params).order_by('updated_at', 'id')
+                if list(legacy.values_list('pk', flat=True)) != list(filterset.values_list('pk', flat=True)):
+                    self.stderr.write(self.style.ERROR('  result sets differ'))
+                before = self.run('legacy', legacy[:6], options['repeat'])
+                after = self.run('filterset', filterset[:6], options['repeat'])
+                self.stdout.write(
+                    f'  before {before:9.3f} ms | after {after:9.3f} ms | x{before / max(after, 0.001):.1f}'
+                )
+            transaction.set_rollback(True)
+
+    def legacy_queryset(self, params):
+        """
+        The pre-FilterSet plan: every filter adds its own aggregate over the
+        joined details and the result is de-duplicated with DISTINCT.
+        """
+        queryset = Offer.objects.annotate(cheapest=Min('details__price'))
+        if 'min_price' in params:
+            queryset = queryset.annotate(
+                min_detail_price=Min('details__price')).filter(min_detail_price__gte=int(params['min_price']))
+        if 'max_price' in params:
+            queryset = queryset.filter(cheapest__lte=int(params['max_price']))
+        if 'max_delivery_time' in params:
+            queryset = queryset.annotate(
+                min_delivery=Min('details__delivery_time_in_days')).filter(
+                min_delivery__lte=int(params['max_delivery_time']))
+        if 'offer_type' in params:
+            queryset = queryset.filter(
+                Exists(OfferDetail.objects.filter(offer=OuterRef('pk'), offer_type=params['offer_type'])))
+        return queryset.distinct()
+
+    def filterset_queryset(self, params):
+        query = QueryDict(mutable=True)
+        query.update(params)
+        filterset = OfferFilterSet(query, queryset=Offer.objects.all())
+        if not filterset.is_valid():
+            raise ValueError(filterset.errors)
+        return filterset.qs
+
+    def run(self, label, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(query.all())
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        self.stdout.write(f'  {label}: {median:.3f} ms')
+        for line in query.explain().splitlines():
+            self.stdout.write(f'      {line}')
+        return median
@@ -0,0 +1,111 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Min
+from offers_app.api.pagination import OfferKeysetPagination
+from offers_app.management.seed import seed_offers
+from offers_app.models import Offer, OfferDetail
+
+INDEXES = {
+    Offer: ['offer_user_updated_idx', 'offer_updated_id_idx', 'offer_min_price_id_idx'],
+    OfferDetail: ['offerdetail_offer_price_idx', 'offerdetail_offer_days_idx'],
+}
+
+
+class Command(BaseCommand):
+    """
+    Show query plans and timings of the offer filter paths with and without
+    the composite indexes from migration 0010.
+
+    Usage:
+        python manage.py benchmark_offer_indexes [--details 1000000] [--repeat 5]
+
+    Behavior:
+        - Seeds `--details` offer details (three per offer) spread over a
+          set of business users inside a transaction that is rolled back at
+          the end, so the database is left untouched.
+        - Runs every query with the indexes, then drops them (SQLite DDL is
+          transactional) and runs them again.
+        - Prints EXPLAIN QUERY PLAN and the median time for each run.
+    """
+    help = 'EXPLAIN QUERY PLAN and before/after timings for the offer composite indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--details', type=int, default=1000000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark drops and restores SQLite indexes; run it on SQLite.')
+
+        with transaction.atomic():
+            self.seed(options['details'], options['users'])
+            queries = self.get_queries()
+
+            self.stdout.write(self.style.MIGRATE_HEADING('With composite indexes'))
+            after = self.run(queries, options['repeat'])
+
+            with connection.cursor() as cursor:
+                for names in INDEXES.values():
+                    for name in names:
+                        cursor.execute(f'DROP INDEX {name}')
+                cursor.execute('ANALYZE')
+            self.stdout.write(self.style.MIGRATE_HEADING('Without composite indexes'))
+            before = self.run(queries, options['repeat'])
+
+            self.stdout.write(self.style.MIGRATE_HEADING('Summary (median ms)'))
+            for label in queries:
+                self.stdout.write(
+                    f'{label:<38} before {before[label]:9.3f} | after {after[label]:9.3f} | '
+                    f'x{before[label] / max(after[label], 0.001):.1f}'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, detail_count, user_count):
+        users, offer_count = seed_offers(detail_count, user_count)
+        self.user_id = users[len(users) // 2].pk
+        self.offer_id = Offer.objects.order_by('pk').values_list('pk', flat=True)[offer_count // 2]
+        pivot = Offer.objects.get(pk=self.offer_id)
+        self.pivot_updated_at, self.pivot_price = pivot.updated_at, pivot.min_price
+        self.stdout.write(f'Seeded {offer_count} offers / {offer_count * 3} details / {user_count} users.')
+
+    def keyset_filter(self, key, value):
+        paginator = OfferKeysetPagination()
+        paginator.key = key
+        return paginator.get_position_filter(False, value, self.offer_id)
+
+    def get_queries(self):
+        """
+        Return {label: queryset} for the access paths of the offers list and
+        of Offer.refresh_min_values().
+        """
+        offers = Offer.objects.all()
+        details = OfferDetail.objects.all()
+        return {
+            'list by user_id, newest first': offers.filter(user_id=self.user_id).order_by('-updated_at')[:6],
+            'keyset page on (updated_at, id)': offers.filter(
+                self.keyset_filter('updated_at', self.pivot_updated_at)).order_by('updated_at', 'id')[:6],
+            'keyset page on (min_price, id)': offers.filter(
+                self.keyset_filter('min_price', self.pivot_price)).order_by('min_price', 'id')[:6],
+            'min(price) of one offer': details.filter(
+                offer_id=self.offer_id).values('offer').annotate(m=Min('price')),
+            'min(delivery_time_in_days) of one offer': details.filter(
+                offer_id=self.offer_id).values('offer').annotate(m=Min('delivery_time_in_days')),
+        }
+
+    def run(self, queries, repeat):
+        medians = {}
+        for label, query in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(query.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            medians[label] = statistics.median(timings)
+            self.stdout.write(f'{label}: {medians[label]:.3f} ms')
+            for line in query.explain().splitlines():
+                self.stdout.write(f'    {line}')
+        return medians
@@ -0,0 +1,88 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from offers_app import search
+from offers_app.models import Offer
+
+WORDS = [
+    'logo', 'design', 'website', 'branding', 'flyer', 'business', 'card', 'app',
+    'mobile', 'backend', 'frontend', 'django', 'python', 'react', 'seo', 'marketing',
+    'video', 'editing', 'photo', 'retouch', 'illustration', 'icon', 'landing', 'page',
+    'shop', 'wordpress', 'database', 'api', 'cloud', 'security', 'audit', 'consulting',
+]
+
+
+class Command(BaseCommand):
+    """
+    Compare the LIKE-based search with the FTS5 index on a seeded dataset.
+
+    Usage:
+        python manage.py benchmark_offer_search [--offers 100000] [--repeat 5]
+
+    Behavior:
+        - Seeds `--offers` synthetic offers and builds the index inside a
+          transaction that is rolled back at the end, so the database is
+          left untouched.
+        - For each term, times the first page plus COUNT for both paths and
+          prints the median in milliseconds.
+    """
+    help = 'Benchmark ?search= on the offers list: LIKE scan vs. FTS5 index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--terms', nargs='+', default=['logo', 'django backend', 'secur', 'photo retouch'])
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The offers full-text index is only available on SQLite.')
+
+        with transaction.atomic():
+            self.seed(options['offers'])
+            search.rebuild_index()
+            for term in options['terms']:
+                like_ms, like_count = self.measure(self.like_queryset(term), options['repeat'])
+                fts_ms, fts_count = self.measure(self.fts_queryset(term), options['repeat'])
+                self.stdout.write(
+                    f'{term!r:>18}: LIKE {like_ms:8.2f} ms ({like_count} hits) | '
+                    f'FTS {fts_ms:8.2f} ms ({fts_count} hits) | x{like_ms / max(fts_ms, 0.001):.1f}'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(42)
+        syllables = ['ka', 'lo', 'mi', 'ter', 'nu', 'sa', 'vor', 'pel', 'di', 'ran', 'go', 'fi']
+        filler = [''.join(rng.choices(syllables, k=3)) for _ in range(3000)]
+        batch = []
+        for i in range(count):
+            batch.append(Offer(
+                title=' '.join(rng.choices(WORDS, k=2) + rng.choices(filler, k=2)).title(),
+                description=' '.join(rng.choices(WORDS, k=2) + rng.choices(filler, k=40)),
+            ))
+            if len(batch) == 5000:
+                Offer.objects.bulk_create(batch)
+                batch = []
+        Offer.objects.bulk_create(batch)
+
+    def like_queryset(self, term):
+        condition = Q()
+        for word in term.split():
+            condition &= Q(title__icontains=word) | Q(description__icontains=word)
+        return Offer.objects.filter(condition).order_by('updated_at')
+
+    def fts_queryset(self, term):
+        match = search.build_match_query(term)
+        return search.filter_queryset(Offer.objects.all(), match).order_by('search_rank', '-updated_at', 'id')
+
+    def measure(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset[:6])
+            count = queryset.count()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), count
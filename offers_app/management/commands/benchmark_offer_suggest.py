@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from offers_app import suggest
+from offers_app.management.seed import seed_offers
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Time /api/offers/suggest/ lookups against the LIKE query a keystroke
+    used to cost.
+
+    Usage:
+        python manage.py benchmark_offer_suggest [--details 300000] [--repeat 200]
+
+    Behavior:
+        - Seeds `--details` offer details with titles made of common words
+          inside a transaction that is rolled back at the end.
+        - Builds a suggestion index and reports build time and memory.
+        - For each query prefix, prints the median time of the ten most
+          popular `title LIKE` matches in SQL and of `SuggestIndex.suggest()`.
+    """
+    help = 'Timings and memory of the in-memory offer title suggestion index.'
+
+    words = [
+        'logo', 'design', 'web', 'landing', 'page', 'brand', 'identity', 'flyer', 'poster', 'seo', 'audit', 'app',
+        'mobile', 'react', 'python', 'data', 'video', 'intro', 'motion', 'café',
+    ]
+    queries = ['l', 'lo', 'logo', 'logo d', 'design pa', 'cafe', 'zzz']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--details', type=int, default=300000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            users, offer_count = seed_offers(options['details'], options['users'])
+            rng = random.Random(7)
+            offers = list(Offer.objects.only('id', 'title'))
+            for offer in offers:
+                offer.title = ' '.join(rng.choices(self.words, k=rng.randint(2, 5))).title()
+            Offer.objects.bulk_update(offers, ['title'], batch_size=5000)
+            self.stdout.write(f'Seeded {offer_count} offers / {len(users)} users.')
+
+            index = suggest.SuggestIndex()
+            start = time.perf_counter()
+            index.rebuild()
+            stats = index.get_stats()
+            self.stdout.write(
+                f"Index built in {(time.perf_counter() - start) * 1000:.0f} ms: {stats['offers']} offers, "
+                f"{stats['entries']} entries, {stats['memory_bytes'] / 1024 / 1024:.1f} MiB."
+            )
+
+            for query in self.queries:
+                like = (
+                    Offer.objects.filter(title__icontains=query)
+                    .annotate(popularity=Count('details__orders'))
+                    .order_by('-popularity', 'title')
+                    .values_list('id', 'title', 'popularity')[:10]
+                )
+                before = self.run(lambda: list(like.all()), max(options['repeat'] // 20, 3))
+                after = self.run(lambda: index.suggest(query, 10), options['repeat'])
+                self.stdout.write(
+                    f'  {query!r:12} LIKE {before:9.3f} ms | index {after:7.4f} ms | x{before / max(after, 0.0001):.0f}'
+                )
+            transaction.set_rollback(True)
+
+    def run(self, lookup, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            lookup()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from offers_app import cache, features
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the offer feature index from OfferDetail.features.
+
+    Usage:
+        python manage.py rebuild_offer_feature_index
+
+    Behavior:
+        - Replaces every OfferDetailFeature link in one transaction and
+          deletes features no detail lists any more.
+        - Invalidates the offer response cache, whose feature-filtered
+          entries may be stale.
+    """
+    help = 'Rebuild the feature index behind ?feature= and /api/offers/features/.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = features.rebuild()
+            cache.invalidate_offers()
+        self.stdout.write(self.style.SUCCESS(f'Indexed the features of {count} offer details.'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+from offers_app import search
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the offers full-text index from the offers table.
+
+    Usage:
+        python manage.py rebuild_offer_search_index
+
+    Behavior:
+        - Creates the FTS5 table if it is missing.
+        - Replaces all index rows in one transaction and merges the index
+          segments ('optimize').
+    """
+    help = 'Rebuild the SQLite FTS5 index used by ?search= on the offers list.'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The offers full-text index is only available on SQLite.')
+        try:
+            with transaction.atomic():
+                count = search.rebuild_index()
+        except OperationalError as exc:
+            raise CommandError(f'Could not build the full-text index: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} offers.'))
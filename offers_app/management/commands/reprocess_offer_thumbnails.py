@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from offers_app import thumbnails
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Render thumbnails for existing offer images in parallel.
+
+    Usage:
+        python manage.py reprocess_offer_thumbnails [--workers 4] [--force]
+
+    Behavior:
+        - By default only offers whose thumbnails are missing or stale are
+          processed; `--force` re-renders every image.
+        - Images are rendered by a pool of `--workers` threads and the
+          command waits for all of them to finish.
+    """
+    help = 'Generate card/detail/retina thumbnails for existing offer images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--force', action='store_true')
+
+    def handle(self, *args, **options):
+        offers = Offer.objects.exclude(image='').exclude(image__isnull=True).only('id', 'image', 'thumbnails')
+        jobs = [
+            (offer.pk, offer.image.name)
+            for offer in offers.iterator(chunk_size=500)
+            if options['force'] or thumbnails.needs_thumbnails(offer)
+        ]
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            results = list(executor.map(lambda job: thumbnails.run_in_worker(*job), jobs))
+
+        done = sum(1 for result in results if result is not None)
+        self.stdout.write(self.style.SUCCESS(f'Rendered thumbnails for {done} of {len(jobs)} offers.'))
@@ -0,0 +1,77 @@
+import random
+
+from django.db import connection
+from offers_app.models import Offer, OfferDetail
+from userprofile_app.models import UserProfile
+
+OFFER_TYPES = [offer_type for offer_type, _ in OfferDetail.OFFER_TYPE]
+FEATURES = [
+    'Logo Design', 'Business Card', 'Flyer', 'Letterhead', 'Brand Guide', 'Social Media Kit', 'Landing Page',
+    'Responsive Design', 'SEO Setup', 'Copywriting', 'Source Files', 'Favicon', 'Mockups', 'Print Ready',
+    'Vector Files', 'Icon Set', 'Newsletter Template', 'Banner Ads', 'Poster', 'Packaging', 'Illustration',
+    'Animation', 'Video Intro', 'Photo Editing', 'Stationery', 'Email Signature', 'Presentation', 'Infographic',
+    'Commercial License', 'Express Delivery', 'Unlimited Revisions', 'Hosting Setup', 'Domain Setup',
+    'Analytics Setup', 'Maintenance', 'Translation', 'Accessibility Audit', 'Performance Audit', 'Code Review',
+    'Documentation',
+]
+
+
+def seed_offers(detail_count, user_count, seed=7, batch_size=5000):
+    """
+    Bulk-insert synthetic business users, offers and three details per offer
+    for the benchmark commands.
+
+    Offers get consistent min_price / min_delivery_time columns and
+    `updated_at` values spread over one year. About one offer in five has
+    no premium detail, so offer_type filters are selective. Each detail
+    lists one to five FEATURES, skewed so that the first names are common
+    and the last ones rare (drawn from a separate generator, so the other
+    columns do not depend on them). bulk_create skips the feature index;
+    call `offers_app.features.rebuild()` when a benchmark needs it.
+
+    Returns:
+        tuple: (users, offer_count)
+    """
+    rng = random.Random(seed)
+    feature_rng = random.Random(seed + 1)
+    feature_weights = [1 / rank for rank in range(1, len(FEATURES) + 1)]
+    users = UserProfile.objects.bulk_create([
+        UserProfile(username=f'bench-business-{i}', type='business') for i in range(user_count)
+    ])
+    offer_count = max(detail_count // 3, 1)
+    offers = []
+    for i in range(offer_count):
+        prices = [rng.randint(10, 5000) for _ in range(3)]
+        days = [rng.randint(1, 60) for _ in range(3)]
+        offers.append(Offer(
+            user=rng.choice(users), title=f'Offer {i}',
+            min_price=min(prices), min_delivery_time=min(days),
+        ))
+        if len(offers) == batch_size or i == offer_count - 1:
+            Offer.objects.bulk_create(offers)
+            details = []
+            for offer in offers:
+                types = OFFER_TYPES if rng.random() > 0.2 else ['basic', 'standard', 'standard']
+                for position, offer_type in enumerate(types):
+                    details.append(OfferDetail(
+                        offer=offer, title=offer_type, revisions=1, offer_type=offer_type,
+                        features=sorted(set(feature_rng.choices(
+                            FEATURES, feature_weights, k=feature_rng.randint(1, 5),
+                        ))),
+                        price=offer.min_price if position == 0 else rng.randint(offer.min_price, offer.min_price + 500),
+                        delivery_time_in_days=(
+                            offer.min_delivery_time if position == 0
+                            else rng.randint(offer.min_delivery_time, offer.min_delivery_time + 10)
+                        ),
+                    ))
+            OfferDetail.objects.bulk_create(details)
+            offers = []
+
+    with connection.cursor() as cursor:
+        # bulk_create stamps every row with the same auto_now value.
+        cursor.execute(
+            "UPDATE offers_app_offer SET updated_at = "
+            "datetime('2024-01-01', '+' || (abs(random()) % 31536000) || ' seconds')"
+        )
+        cursor.execute('ANALYZE')
+    return users, offer_count
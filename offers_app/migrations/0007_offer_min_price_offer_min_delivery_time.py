@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0006_alter_offerdetail_offer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import OperationalError, migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from offers_app.search import create_index_table, OFFER_TABLE, FTS_TABLE
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            create_index_table(cursor)
+        except OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE.
+            return
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            f'SELECT id, title, description FROM {OFFER_TABLE}'
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from offers_app.search import FTS_TABLE
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_offer_min_price_offer_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0008_offer_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0009_offer_thumbnails'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'updated_at'], name='offer_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['updated_at', 'id'], name='offer_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_price', 'id'], name='offer_min_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_days_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_features(apps, schema_editor):
+    from offers_app.features import normalize_features
+    Feature = apps.get_model('offers_app', 'Feature')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    OfferDetailFeature = apps.get_model('offers_app', 'OfferDetailFeature')
+
+    feature_ids = {}
+    links = []
+    for detail in OfferDetail.objects.only('id', 'offer_id', 'features').iterator(chunk_size=2000):
+        for key, name in normalize_features(detail.features).items():
+            if key not in feature_ids:
+                feature_ids[key] = Feature.objects.create(key=key, name=name).pk
+            links.append(OfferDetailFeature(detail_id=detail.pk, offer_id=detail.offer_id, feature_id=feature_ids[key]))
+        if len(links) >= 2000:
+            OfferDetailFeature.objects.bulk_create(links)
+            links = []
+    OfferDetailFeature.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0010_offer_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OfferDetailFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_links', to='offers_app.offerdetail')),
+                ('feature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detail_links', to='offers_app.feature')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_links', to='offers_app.offer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['feature', 'offer'], name='offerdetailfeature_feat_offer')],
+                'constraints': [models.UniqueConstraint(fields=('detail', 'feature'), name='offerdetailfeature_detail_feature_uniq')],
+            },
+        ),
+        migrations.RunPython(index_existing_features, migrations.RunPython.noop),
+    ]
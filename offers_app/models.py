@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Min
 from userprofile_app.models import UserProfile
 
 
@@ -13,24 +14,60 @@ class Offer(models.Model):
     Core fields:
         title (str): Human-friendly name of the offer.
         image (File): Optional file upload (e.g., preview image).
+        thumbnails (JSON): Paths of the rendered thumbnails plus the image
+            name they were rendered from (see offers_app/thumbnails.py).
         description (text): Free-form description of the offer.
 
+    Denormalized fields (kept current by `refresh_min_values()`):
+        min_price (int, nullable): Lowest price across all details.
+        min_delivery_time (int, nullable): Shortest delivery time across all details.
+
     Timestamps:
         created_at (datetime): Auto-set when the offer is created.
         updated_at (datetime): Auto-updated on each modification.
 
+    Indexes:
+        (user, updated_at), (updated_at, id) and (min_price, id) back the
+        user_id filter and the list orderings / keyset pagination.
+
     String representation:
         Returns the offer title.
     """
     user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, null=True, blank=True)
     title = models.CharField(max_length=255)
     image = models.FileField(upload_to='uploads/', null=True, blank=True)
+    thumbnails = models.JSONField(default=dict, blank=True)
     description = models.TextField(default="", blank=True)
+    min_price = models.IntegerField(null=True, blank=True)
+    min_delivery_time = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at'], name='offer_user_updated_idx'),
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_id_idx'),
+            models.Index(fields=['min_price', 'id'], name='offer_min_price_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
+
+    def refresh_min_values(self):
+        """
+        Recompute `min_price` and `min_delivery_time` from the current details.
+
+        Uses a single aggregate query and writes the result with `update()`,
+        so `updated_at` is not touched. Call this inside the same transaction
+        that changed the details.
+        """
+        values = self.details.aggregate(
+            min_price=Min('price'),
+            min_delivery_time=Min('delivery_time_in_days'),
+        )
+        Offer.objects.filter(pk=self.pk).update(**values)
+        self.min_price = values['min_price']
+        self.min_delivery_time = values['min_delivery_time']
     
 
 class OfferDetail(models.Model):
@@ -54,6 +91,10 @@ class OfferDetail(models.Model):
         features (JSON): List of included features (e.g., ["Logo", "Business Card"]).
         offer_type (choice): One of ('basic', 'standard', 'premium').
 
+    Indexes:
+        (offer, price) and (offer, delivery_time_in_days) cover the per-offer
+        min aggregates in Offer.refresh_min_values().
+
     String representation:
         Returns the detail title.
     """
@@ -71,9 +112,64 @@ class OfferDetail(models.Model):
     features = models.JSONField()
     offer_type = models.CharField(max_length=255, choices=OFFER_TYPE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+            models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_days_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class Feature(models.Model):
+    """
+    One distinct feature name used in OfferDetail.features.
 
-    
+    Core fields:
+        key (str, unique): Normalized name used for matching (whitespace
+            collapsed, case-folded), so "Logo  design" and "logo design"
+            are the same feature.
+        name (str): Display name, as first seen.
+
+    Rows are created by offers_app/features.py when details are saved;
+    features no longer used by any detail are kept and simply have no links.
+
+    String representation:
+        Returns the display name.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255)
+
+    def __str__(self):
+        return self.name
+
+
+class OfferDetailFeature(models.Model):
+    """
+    Inverted-index entry: `detail` lists `feature`.
+
+    Relationships:
+        detail (FK OfferDetail): The detail whose features list contains the feature.
+        offer (FK Offer): The detail's offer, copied so that feature filters
+            resolve to offer ids without joining the details table.
+        feature (FK Feature): The feature.
+
+    Constraints / indexes:
+        (detail, feature) is unique; (feature, offer) answers "which offers
+        have feature X" from the index alone.
+
+    Maintained from OfferDetail saves and the bulk create / update paths
+    (see offers_app/features.py); never edited by hand.
+    """
+    detail = models.ForeignKey(OfferDetail, on_delete=models.CASCADE, related_name='feature_links')
+    offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name='feature_links')
+    feature = models.ForeignKey(Feature, on_delete=models.CASCADE, related_name='detail_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['detail', 'feature'], name='offerdetailfeature_detail_feature_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['feature', 'offer'], name='offerdetailfeature_feat_offer'),
+        ]
@@ -0,0 +1,303 @@
+"""
+In-process columnar read index for the offers list.
+
+The index keeps five parallel `array('q')` columns (offer id, user id,
+min_price, min_delivery_time, updated_at in epoch microseconds), one row per
+offer; NULLs (offers without owner or details) are stored as `NULL`.
+Filters are evaluated as byte masks built with C-level `map()` calls, sort
+orders are cached permutations of row positions, and only the ids of the
+requested page are handed back to the view, which loads those rows from the
+database. Unfiltered pages cost a copy of a cached order; filtered pages
+cost one pass over the masked columns, independent of the page number.
+Writes move the changed rows within the cached orders instead of sorting
+them again.
+
+Freshness:
+    - Offer / OfferDetail saves and deletes (see offers_app/signals.py) and
+      the bulk create path call `refresh_offers()`, which re-reads the
+      affected rows once the transaction commits.
+    - Every process holds its own copy, built lazily on the first query after
+      startup and rebuilt once it is older than OFFERS_READ_INDEX_MAX_AGE, so
+      writes made by other processes (workers, management commands) show up
+      within that bound.
+
+Settings:
+    OFFERS_READ_INDEX (bool, default False): answer eligible offer list
+        requests from the index.
+    OFFERS_READ_INDEX_MAX_AGE (int, default 300): seconds after which the
+        index is rebuilt from the database.
+"""
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import timezone
+from itertools import compress
+
+from django.conf import settings
+from django.db import transaction
+
+from offers_app.models import Offer
+
+NULL = -(2 ** 63)
+COLUMNS = ('id', 'user_id', 'min_price', 'min_delivery_time', 'updated_at')
+ORDERING_KEYS = ('updated_at', 'min_price')
+
+
+def is_enabled():
+    return getattr(settings, 'OFFERS_READ_INDEX', False)
+
+
+def get_max_age():
+    return getattr(settings, 'OFFERS_READ_INDEX_MAX_AGE', 300)
+
+
+def _to_micros(value):
+    return int(value.astimezone(timezone.utc).timestamp() * 1_000_000)
+
+
+def _row(values):
+    offer_id, user_id, min_price, min_delivery_time, updated_at = values
+    return (
+        offer_id,
+        NULL if user_id is None else user_id,
+        NULL if min_price is None else min_price,
+        NULL if min_delivery_time is None else min_delivery_time,
+        _to_micros(updated_at),
+    )
+
+
+class OfferReadIndex:
+    """
+    Columnar snapshot of the filter and sort columns of all offers.
+
+    All public methods are thread-safe. Sort orders are built on the first
+    query that needs them and then kept current by `refresh()`.
+    """
+    max_patched_rows = 1000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.built_at = None
+        self.clear()
+
+    def clear(self):
+        self.columns = {name: array('q') for name in COLUMNS}
+        self.positions = {}
+        self.orders = {}
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def is_stale(self):
+        return self.built_at is None or time.monotonic() - self.built_at > get_max_age()
+
+    def rebuild(self):
+        """
+        Reload every offer from the database.
+        """
+        rows = Offer.objects.order_by('pk').values_list(*COLUMNS).iterator(chunk_size=5000)
+        with self.lock:
+            self.clear()
+            for values in rows:
+                self._append(_row(values))
+            self.built_at = time.monotonic()
+
+    def refresh(self, offer_ids):
+        """
+        Re-read the given offers; ids that no longer exist are removed.
+
+        Up to `max_patched_rows` changed rows are moved within the cached
+        sort orders (a binary search and an array insert or delete per
+        order and row). Larger batches drop the cached orders instead,
+        and the next query that needs one sorts the index again.
+        """
+        offer_ids = set(offer_ids)
+        if not offer_ids or self.built_at is None:
+            return
+        rows = [_row(values) for values in Offer.objects.filter(pk__in=offer_ids).values_list(*COLUMNS)]
+        with self.lock:
+            if len(offer_ids) > self.max_patched_rows:
+                self.orders = {}
+            for row in rows:
+                position = self.positions.get(row[0])
+                if position is None:
+                    self._append(row)
+                else:
+                    self._unsort(position)
+                    for name, value in zip(COLUMNS, row):
+                        self.columns[name][position] = value
+                    self._sort_in(position)
+            for offer_id in offer_ids - {row[0] for row in rows}:
+                self._remove(offer_id)
+
+    def _append(self, row):
+        position = self.positions[row[0]] = len(self.columns['id'])
+        for name, value in zip(COLUMNS, row):
+            self.columns[name].append(value)
+        self._sort_in(position)
+
+    def _remove(self, offer_id):
+        """
+        Swap-remove a row: the last row takes its position.
+        """
+        position = self.positions.pop(offer_id, None)
+        if position is None:
+            return
+        self._unsort(position)
+        last = len(self.columns['id']) - 1
+        if position != last:
+            moved = [
+                (positions, self._locate(ordering, positions, last))
+                for ordering, (positions, _) in self.orders.items()
+            ]
+            for column in self.columns.values():
+                column[position] = column[last]
+            self.positions[self.columns['id'][position]] = position
+            for positions, index in moved:
+                positions[index] = position
+        for column in self.columns.values():
+            column.pop()
+
+    def _sort_key(self, ordering):
+        """
+        Return a function mapping a row position to its key in `ordering`:
+        ascending on the key is the order built by `get_order()`.
+        """
+        terms = [(self.columns[term.lstrip('-')], -1 if term.startswith('-') else 1) for term in ordering]
+        ids, id_sign = self.columns['id'], terms[0][1]
+
+        def key(position):
+            return (*(sign * column[position] for column, sign in terms), id_sign * ids[position])
+        return key
+
+    def _locate(self, ordering, positions, position):
+        """
+        Index of the row at `position` in the cached order `positions`;
+        keys are unique (they end with the id), so bisection finds it.
+        """
+        key = self._sort_key(ordering)
+        return bisect_left(positions, key(position), key=key)
+
+    def _unsort(self, position):
+        for ordering, (positions, ids) in self.orders.items():
+            index = self._locate(ordering, positions, position)
+            del positions[index]
+            del ids[index]
+
+    def _sort_in(self, position):
+        for ordering, (positions, ids) in self.orders.items():
+            index = self._locate(ordering, positions, position)
+            positions.insert(index, position)
+            ids.insert(index, self.columns['id'][position])
+
+    def get_order(self, ordering):
+        """
+        Return (positions, ids): the row positions and the offer ids sorted
+        by `ordering` (e.g. ['-min_price', 'updated_at']), ties broken by id
+        in the direction of the first term, as in the keyset pagination and
+        SQLite's (key, id) index walks.
+
+        NULLs are stored as the smallest integer, so they sort first
+        ascending and last descending, like SQLite.
+        """
+        ordering = tuple(ordering)
+        order = self.orders.get(ordering)
+        if order is None:
+            ids = self.columns['id']
+            positions = sorted(range(len(ids)), key=ids.__getitem__, reverse=ordering[0].startswith('-'))
+            # Stable sorts from the least to the most significant key.
+            for term in reversed(ordering):
+                column = self.columns[term.lstrip('-')]
+                positions.sort(key=column.__getitem__, reverse=term.startswith('-'))
+            order = self.orders[ordering] = (array('q', positions), array('q', map(ids.__getitem__, positions)))
+        return order
+
+    def get_mask(self, user_id=None, min_price=None, max_price=None, max_delivery_time=None):
+        """
+        Return a bytes mask over the row positions (1 = row matches), or
+        None when no filter is given.
+        """
+        masks = []
+        if user_id is not None:
+            masks.append(bytes(map(user_id.__eq__, self.columns['user_id'])))
+        if min_price is not None:
+            masks.append(bytes(map(min_price.__le__, self.columns['min_price'])))
+        if max_price is not None:
+            masks.append(bytes(map(max_price.__ge__, self.columns['min_price'])))
+            masks.append(bytes(map(NULL.__ne__, self.columns['min_price'])))
+        if max_delivery_time is not None:
+            masks.append(bytes(map(max_delivery_time.__ge__, self.columns['min_delivery_time'])))
+            masks.append(bytes(map(NULL.__ne__, self.columns['min_delivery_time'])))
+        if not masks:
+            return None
+        combined = int.from_bytes(masks[0], 'little')
+        for mask in masks[1:]:
+            combined &= int.from_bytes(mask, 'little')
+        return combined.to_bytes(len(self), 'little')
+
+    def query(self, ordering, **filters):
+        """
+        Return the ids of all matching offers in `ordering` order.
+        """
+        with self.lock:
+            positions, ids = self.get_order(ordering)
+            mask = self.get_mask(**filters)
+            if mask is None:
+                # Cached orders are updated in place by refresh().
+                return ids[:]
+            return array('q', compress(ids, map(mask.__getitem__, positions)))
+
+
+_index = OfferReadIndex()
+_build_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Return the process-wide index, (re)building it when it is missing or
+    older than OFFERS_READ_INDEX_MAX_AGE.
+    """
+    if _index.is_stale():
+        with _build_lock:
+            if _index.is_stale():
+                _index.rebuild()
+    return _index
+
+
+def refresh_offers(offer_ids):
+    """
+    Update the given offers in the index once the current transaction
+    commits (immediately outside a transaction).
+    """
+    if not is_enabled():
+        return
+    offer_ids = set(offer_ids)
+    transaction.on_commit(lambda: _index.refresh(offer_ids))
+
+
+class IndexedOfferList:
+    """
+    Sequence of offers backed by an ordered id list from the read index.
+
+    Works with Django's Paginator: `len()` is the total count and slicing
+    loads only the sliced rows from `queryset`, in index order. `queryset`
+    may also be a `.values()` queryset that includes "id".
+    """
+
+    def __init__(self, ids, queryset):
+        self.ids = ids
+        self.queryset = queryset
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        ids = list(self.ids[index])
+        by_pk = {
+            row['id'] if isinstance(row, dict) else row.pk: row
+            for row in self.queryset.filter(pk__in=ids)
+        }
+        return [by_pk[offer_id] for offer_id in ids if offer_id in by_pk]
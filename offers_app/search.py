@@ -0,0 +1,139 @@
+"""
+Full-text search index for offer titles and descriptions.
+
+The index is an SQLite FTS5 table (`offers_app_offer_fts`) that stores its own
+copy of `title` and `description`, keyed by the offer id as rowid. It is
+created by migration 0008 and kept in sync from the Offer post_save /
+post_delete signals (see offers_app/signals.py). Code paths that bypass
+signals (bulk_create, queryset.update on title/description) must call
+`index_offers()` themselves; `rebuild_offer_search_index` repairs any drift.
+
+On databases without FTS5 every helper is a no-op and `is_available()`
+returns False, so callers can fall back to the plain LIKE search.
+"""
+import re
+
+from django.db import connection
+
+FTS_TABLE = 'offers_app_offer_fts'
+OFFER_TABLE = 'offers_app_offer'
+
+# Title matches weigh ten times as much as description matches in bm25().
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+RANK_SQL = f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_available = {}
+
+
+def is_available():
+    """
+    Return True if the FTS table exists on the current database.
+
+    The result is cached per database name, so the test database and the
+    development database are checked independently.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    name = str(connection.settings_dict['NAME'])
+    if name not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _available[name] = cursor.fetchone() is not None
+    return _available[name]
+
+
+def create_index_table(cursor):
+    """
+    Create the FTS5 table. Used by the migration and the rebuild command.
+
+    `prefix='2 3'` keeps extra prefix indexes so short `term*` queries do
+    not need to scan the whole term list.
+    """
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, description, "
+        "tokenize = 'unicode61 remove_diacritics 2', "
+        "prefix = '2 3')"
+    )
+
+
+def build_match_query(term):
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS syntax characters cannot leak in) and
+    marked as a prefix, and all words must match:
+        "logo des" -> '"logo"* AND "des"*'
+
+    Returns None if the input contains no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return ' AND '.join(f'"{token}"*' for token in tokens)
+
+
+def filter_queryset(queryset, match):
+    """
+    Restrict an Offer queryset to rows matching `match` and annotate them
+    with `search_rank` (bm25, lower is better).
+
+    The FTS table is joined on rowid rather than used in a correlated
+    subquery, so SQLite evaluates the MATCH once and drives the join from
+    the index.
+    """
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {OFFER_TABLE}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={'search_rank': RANK_SQL},
+    )
+
+
+def index_offers(offers):
+    """
+    Insert or replace the index rows for the given Offer instances.
+    """
+    if not is_available():
+        return
+    rows = [(offer.pk, offer.title or '', offer.description or '') for offer in offers]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)', rows
+        )
+
+
+def remove_offers(offer_ids):
+    """
+    Drop the index rows for the given offer ids.
+    """
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in offer_ids])
+
+
+def rebuild_index():
+    """
+    Rebuild the whole index from the offers table and merge its segments.
+
+    Returns:
+        int: number of indexed offers.
+    """
+    with connection.cursor() as cursor:
+        create_index_table(cursor)
+        _available[str(connection.settings_dict['NAME'])] = True
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            f'SELECT id, title, description FROM {OFFER_TABLE}'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
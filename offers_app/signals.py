@@ -0,0 +1,133 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from offers_app import cache, features, read_index, search, suggest, thumbnails
+from offers_app.models import Offer, OfferDetail
+from userprofile_app.models import UserProfile
+
+# UserProfile columns rendered into the offers as `user_details`.
+USER_DETAIL_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_min_values_on_detail_delete(sender, instance, origin=None, **kwargs):
+    """
+    Keep the denormalized min values of the parent offer current after a
+    detail is deleted.
+
+    Skipped when the delete cascades from an Offer (instance or queryset),
+    because the parent row is about to disappear anyway.
+    """
+    if isinstance(origin, Offer) or getattr(origin, 'model', None) is Offer:
+        return
+    Offer(pk=instance.offer_id).refresh_min_values()
+
+
+@receiver(post_save, sender=Offer)
+def index_offer_on_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Re-index the offer's title and description in the full-text index.
+
+    Saves restricted to other fields (update_fields) are skipped.
+    """
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    search.index_offers([instance])
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_from_index_on_delete(sender, instance, **kwargs):
+    """
+    Drop the deleted offer from the full-text index.
+    """
+    search.remove_offers([instance.pk])
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_offer_cache(sender, instance, **kwargs):
+    """
+    Bump the catalog version and the offer's own version.
+    """
+    cache.invalidate_offers([instance.pk])
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_cache_on_detail_change(sender, instance, **kwargs):
+    """
+    Bump the catalog version and the version of the detail's parent offer.
+    """
+    cache.invalidate_offers([instance.offer_id])
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_offer_cache_on_owner_change(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Bump the catalog version and the versions of the user's offers, whose
+    cached responses embed the owner's `user_details`.
+
+    New users own no offers yet, and saves restricted to other fields
+    (update_fields, e.g. last_login on login) are skipped.
+    """
+    if created or (update_fields is not None and not USER_DETAIL_FIELDS & set(update_fields)):
+        return
+    cache.invalidate_offers(Offer.objects.filter(user_id=instance.pk).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def refresh_offer_read_index(sender, instance, **kwargs):
+    """
+    Re-read the offer's filter and sort columns into the in-memory read index.
+    """
+    read_index.refresh_offers([instance.pk])
+
+
+@receiver(post_save, sender=Offer)
+def refresh_offer_suggestions(sender, instance, update_fields=None, **kwargs):
+    """
+    Re-read the offer's title into the in-memory suggestion index.
+
+    Saves restricted to other fields (update_fields) are skipped.
+    """
+    if update_fields is not None and 'title' not in update_fields:
+        return
+    suggest.refresh_offers([instance.pk])
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_suggestions(sender, instance, **kwargs):
+    """
+    Drop the deleted offer from the in-memory suggestion index.
+    """
+    suggest.refresh_offers([instance.pk])
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_read_index_on_detail_change(sender, instance, **kwargs):
+    """
+    Re-read the parent offer, whose min values may have changed.
+    """
+    read_index.refresh_offers([instance.offer_id])
+
+
+@receiver(post_save, sender=OfferDetail)
+def sync_offer_detail_features(sender, instance, update_fields=None, **kwargs):
+    """
+    Update the feature index links of the saved detail.
+
+    Saves restricted to other fields (update_fields) are skipped.
+    """
+    if update_fields is not None and 'features' not in update_fields:
+        return
+    features.sync_details([instance])
+
+
+@receiver(post_save, sender=Offer)
+def schedule_offer_thumbnails(sender, instance, **kwargs):
+    """
+    Hand a new or replaced image to the thumbnail workers.
+    """
+    if thumbnails.needs_thumbnails(instance):
+        thumbnails.schedule(instance)
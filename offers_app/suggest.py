@@ -0,0 +1,468 @@
+"""
+In-process prefix index for offer title suggestions (typeahead).
+
+Every offer title is normalized (case-folded, accents and punctuation
+removed, whitespace collapsed) and indexed once per word start, so "des"
+finds "Logo Design". The index keeps:
+
+    - one row per offer: offer id, display title, normalized title and
+      popularity (number of orders of the offer's details);
+    - `entries`, an `array('q')` of (row, word offset) pairs sorted by the
+      normalized title from that offset on, searched with `bisect`;
+    - a max segment tree over the entries' popularity, so the N most popular
+      matches of any prefix are found with O(N log n) work, however many
+      titles share the prefix.
+
+Updates are incremental: a changed or deleted offer's row is tombstoned and
+the new version goes into a small sorted overlay (`insort`) that queries
+search next to the main entries. Once `MAX_PENDING` rows have been added or
+tombstoned, the index is compacted in memory (no database access).
+
+Compaction and the periodic rebuild never run on a request: `get_index()`
+starts them in a background thread, which builds a new `SuggestIndex`
+while lookups keep reading the current one, re-applies the offers
+refreshed in the meantime and then swaps the new index in. Only the very
+first build of a process runs on the request that needs it.
+
+Memory is bounded: titles are cut to `MAX_TITLE_LENGTH` characters, at most
+`MAX_WORDS` word starts are indexed per title and at most
+OFFERS_SUGGEST_MAX_OFFERS offers (the most popular) are kept. `get_stats()`
+reports the current footprint.
+
+Freshness:
+    - Offer saves and deletes (see offers_app/signals.py) and the bulk create
+      path call `refresh_offers()` once the transaction commits.
+    - Popularity changes (new orders) show up when the index is rebuilt,
+      in the background once it is older than OFFERS_SUGGEST_MAX_AGE
+      seconds, or when the offer is saved.
+
+Settings:
+    OFFERS_SUGGEST_MAX_AGE (int, default 300): seconds after which the
+        index is rebuilt from the database.
+    OFFERS_SUGGEST_MAX_OFFERS (int, default 200000): most offers indexed.
+"""
+import heapq
+import re
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+
+from offers_app.models import Offer
+
+MAX_TITLE_LENGTH = 100
+MAX_WORDS = 8
+MAX_PENDING = 1000
+OFFSET_BITS = 8
+OFFSET_MASK = (1 << OFFSET_BITS) - 1
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_max_age():
+    return getattr(settings, 'OFFERS_SUGGEST_MAX_AGE', 300)
+
+
+def get_max_offers():
+    return getattr(settings, 'OFFERS_SUGGEST_MAX_OFFERS', 200000)
+
+
+def normalize(text):
+    """
+    Case-fold, strip accents and punctuation and collapse whitespace:
+    "Café  Logo-Design!" -> "cafe logo design".
+    """
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_WORD_RE.findall(text))
+
+
+def word_offsets(key):
+    """
+    Offsets of the first MAX_WORDS word starts of a normalized title.
+    """
+    offsets = [0]
+    position = key.find(' ')
+    while position != -1 and len(offsets) < MAX_WORDS:
+        offsets.append(position + 1)
+        position = key.find(' ', position + 1)
+    return offsets
+
+
+def load_rows(queryset):
+    """
+    Yield (offer id, title, popularity) for the offers in `queryset`.
+    """
+    return (
+        queryset.annotate(popularity=Count('details__orders'))
+        .values_list('id', 'title', 'popularity')
+        .iterator(chunk_size=5000)
+    )
+
+
+class SuggestIndex:
+    """
+    Prefix index over offer titles; see the module docstring.
+
+    All public methods are thread-safe.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.built_at = None
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.clear()
+
+    def clear(self):
+        self.offer_ids = array('q')
+        self.popularity = array('q')
+        self.titles = []
+        self.keys = []
+        self.rows = {}
+        self.removed = set()
+        self.pending = []
+        self.pending_entries = []
+        self.entries = array('q')
+        self.entry_popularity = array('q')
+        self.tree = array('q')
+        self.tree_size = 0
+
+    def is_stale(self):
+        return self.built_at is None or time.monotonic() - self.built_at > get_max_age()
+
+    def needs_compaction(self):
+        return len(self.pending) + len(self.removed) >= MAX_PENDING
+
+    def rebuild(self):
+        """
+        Reload every offer from the database.
+        """
+        rows = sorted(load_rows(Offer.objects.all()), key=lambda row: (-row[2], row[0]))
+        with self.lock:
+            self.clear()
+            for offer_id, title, popularity in rows[:get_max_offers()]:
+                self._add_row(offer_id, title, popularity)
+            self._sort()
+            self.built_at = time.monotonic()
+
+    def refresh(self, offer_ids):
+        """
+        Re-read the given offers; ids that no longer exist are removed.
+        """
+        offer_ids = set(offer_ids)
+        if not offer_ids or self.built_at is None:
+            return
+        rows = list(load_rows(Offer.objects.filter(pk__in=offer_ids)))
+        with self.lock:
+            for offer_id in offer_ids:
+                row = self.rows.pop(offer_id, None)
+                if row is not None:
+                    self.removed.add(row)
+            for offer_id, title, popularity in rows:
+                row = self._add_row(offer_id, title, popularity)
+                self.pending.append(row)
+                key = self.keys[row]
+                for offset in word_offsets(key) if key else ():
+                    insort(self.pending_entries, (key[offset:], row))
+
+    def _add_row(self, offer_id, title, popularity):
+        row = len(self.titles)
+        title = (title or '')[:MAX_TITLE_LENGTH]
+        self.offer_ids.append(offer_id)
+        self.popularity.append(popularity)
+        self.titles.append(title)
+        self.keys.append(normalize(title))
+        self.rows[offer_id] = row
+        return row
+
+    def _sort(self):
+        """
+        Rebuild `entries` and the segment tree from the live rows.
+        """
+        keys = self.keys
+        entries = [
+            row << OFFSET_BITS | offset
+            for row in self.rows.values() if keys[row]
+            for offset in word_offsets(keys[row])
+        ]
+        entries.sort(key=lambda entry: keys[entry >> OFFSET_BITS][entry & OFFSET_MASK:])
+        self.entries = array('q', entries)
+        self.entry_popularity = array('q', (self.popularity[entry >> OFFSET_BITS] for entry in entries))
+
+        # tree[node] is the entry position with the highest popularity below
+        # `node` (lowest position on ties); leaves start at tree_size.
+        size = 1
+        while size < len(entries):
+            size *= 2
+        tree = array('q', [-1]) * (2 * size)
+        tree[size:size + len(entries)] = array('q', range(len(entries)))
+        for node in range(size - 1, 0, -1):
+            tree[node] = self._better(tree[2 * node], tree[2 * node + 1])
+        self.tree = tree
+        self.tree_size = size
+
+    def compacted(self):
+        """
+        Return a new index without the tombstoned rows and with the overlay
+        merged into the sorted entries, keeping the OFFERS_SUGGEST_MAX_OFFERS
+        most popular offers. Same age as this one.
+
+        Only the row map is copied under the lock: rows are append-only,
+        so the titles and popularity of the copied rows do not change
+        while the new index is sorted.
+        """
+        with self.lock:
+            live_rows = self.rows.copy()
+            built_at = self.built_at
+        live = sorted(
+            ((offer_id, self.titles[row], self.popularity[row]) for offer_id, row in live_rows.items()),
+            key=lambda row: (-row[2], row[0]),
+        )
+        index = SuggestIndex()
+        for offer_id, title, popularity in live[:get_max_offers()]:
+            index._add_row(offer_id, title, popularity)
+        index._sort()
+        index.built_at = built_at
+        return index
+
+    def _better(self, left, right):
+        """
+        The more popular of two entry positions, the lower one on ties.
+        """
+        if left == -1 or right == -1:
+            return max(left, right)
+        left_popularity = self.entry_popularity[left]
+        right_popularity = self.entry_popularity[right]
+        if right_popularity > left_popularity or (right_popularity == left_popularity and right < left):
+            return right
+        return left
+
+    def _argmax(self, low, high):
+        """
+        Position of the most popular entry in entries[low:high].
+        """
+        best = -1
+        tree = self.tree
+        low += self.tree_size
+        high += self.tree_size
+        while low < high:
+            if low & 1:
+                best = self._better(best, tree[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                best = self._better(best, tree[high])
+            low //= 2
+            high //= 2
+        return best
+
+    def _range(self, prefix):
+        length = len(prefix)
+        keys = self.keys
+
+        def key(entry):
+            offset = entry & OFFSET_MASK
+            return keys[entry >> OFFSET_BITS][offset:offset + length]
+
+        return bisect_left(self.entries, prefix, key=key), bisect_right(self.entries, prefix, key=key)
+
+    def suggest(self, query, limit=10):
+        """
+        Return up to `limit` offers whose title has a word starting with
+        the normalized `query` (several words match as a phrase prefix), as
+        [{"id": <int>, "title": <str>, "popularity": <int>}, ...], most
+        popular first, ties in alphabetical order of the matched text.
+        Offers with the same normalized title are returned once.
+        """
+        prefix = normalize(query)
+        start = time.perf_counter()
+        with self.lock:
+            candidates = []
+            if prefix:
+                candidates = self._top_sorted(prefix, limit) + self._top_pending(prefix)
+            # Stable: equally popular matches keep their index order.
+            candidates.sort(key=lambda row: -self.popularity[row])
+            results = []
+            seen = set()
+            for row in candidates:
+                if self.keys[row] not in seen:
+                    seen.add(self.keys[row])
+                    results.append({
+                        'id': self.offer_ids[row], 'title': self.titles[row], 'popularity': self.popularity[row],
+                    })
+                    if len(results) == limit:
+                        break
+            self.lookups += 1
+            self.lookup_seconds += time.perf_counter() - start
+        return results
+
+    def _top_sorted(self, prefix, limit):
+        """
+        Up to `limit` live rows with distinct titles from the sorted entries,
+        in popularity order, popped lazily from the segment tree.
+        """
+        low, high = self._range(prefix)
+        if low >= high:
+            return []
+        rows = []
+        seen = set()
+        heap = [(0, self._argmax(low, high), low, high)]
+        while heap and len(rows) < limit:
+            _, position, low, high = heapq.heappop(heap)
+            row = self.entries[position] >> OFFSET_BITS
+            if row not in self.removed and self.keys[row] not in seen:
+                seen.add(self.keys[row])
+                rows.append(row)
+            for part_low, part_high in ((low, position), (position + 1, high)):
+                if part_low < part_high:
+                    best = self._argmax(part_low, part_high)
+                    heapq.heappush(heap, (-self.entry_popularity[best], best, part_low, part_high))
+        return rows
+
+    def _top_pending(self, prefix):
+        """
+        Live overlay rows matching `prefix`, in alphabetical order of the
+        matched text.
+        """
+        position = bisect_left(self.pending_entries, (prefix,))
+        rows = []
+        for suffix, row in self.pending_entries[position:]:
+            if not suffix.startswith(prefix):
+                break
+            if row not in self.removed and row not in rows:
+                rows.append(row)
+        return rows
+
+    def get_stats(self):
+        with self.lock:
+            string_bytes = sum(sys.getsizeof(title) for title in self.titles)
+            string_bytes += sum(sys.getsizeof(key) for key in self.keys)
+            container_bytes = sum(sys.getsizeof(container) for container in (
+                self.offer_ids, self.popularity, self.titles, self.keys, self.rows, self.removed,
+                self.pending, self.pending_entries, self.entries, self.entry_popularity, self.tree,
+            ))
+            return {
+                'offers': len(self.rows),
+                'entries': len(self.entries),
+                'pending': len(self.pending),
+                'removed': len(self.removed),
+                'memory_bytes': string_bytes + container_bytes,
+                'age_seconds': None if self.built_at is None else round(time.monotonic() - self.built_at, 1),
+                'max_age_seconds': get_max_age(),
+                'max_offers': get_max_offers(),
+                'lookups': self.lookups,
+                'avg_lookup_ms': round(self.lookup_seconds / self.lookups * 1000, 4) if self.lookups else 0.0,
+            }
+
+
+_index = SuggestIndex()
+_build_lock = threading.Lock()
+_swap_lock = threading.Lock()
+# Offer ids refreshed while a background build runs; None when none runs.
+_refreshed_during_build = None
+
+
+def get_index():
+    """
+    Return the process-wide index.
+
+    The first call builds it. Later calls return the current index at
+    once and, when it is older than OFFERS_SUGGEST_MAX_AGE or has
+    MAX_PENDING overlay rows and tombstones, start a background rebuild
+    or compaction (see `schedule_swap()`).
+    """
+    index = _index
+    if index.built_at is None:
+        with _build_lock:
+            if _index.built_at is None:
+                _index.rebuild()
+        return _index
+    if index.is_stale():
+        schedule_swap(rebuilt_index)
+    elif index.needs_compaction():
+        schedule_swap(index.compacted)
+    return index
+
+
+def rebuilt_index():
+    index = SuggestIndex()
+    index.rebuild()
+    return index
+
+
+def run_in_background(function):
+    def run():
+        try:
+            function()
+        finally:
+            # The thread's own database connection.
+            connection.close()
+
+    threading.Thread(target=run, name='offer-suggest-build', daemon=True).start()
+
+
+def schedule_swap(make_index):
+    """
+    Build a replacement index with `make_index()` in a background thread
+    and swap it in; does nothing while another build runs.
+
+    Returns:
+        bool: whether a build was started.
+    """
+    global _refreshed_during_build
+    with _swap_lock:
+        if _refreshed_during_build is not None:
+            return False
+        _refreshed_during_build = set()
+    run_in_background(partial(_build_and_swap, make_index))
+    return True
+
+
+def _build_and_swap(make_index):
+    """
+    Build the new index, re-apply the offers refreshed in the meantime and
+    swap it in once no refresh is left over. A failed build leaves the
+    current index in place; the next `get_index()` retries.
+    """
+    global _index, _refreshed_during_build
+    try:
+        index = make_index()
+        while True:
+            with _swap_lock:
+                offer_ids, _refreshed_during_build = _refreshed_during_build, set()
+                if not offer_ids:
+                    index.lookups, index.lookup_seconds = _index.lookups, _index.lookup_seconds
+                    _index = index
+                    return
+            index.refresh(offer_ids)
+    finally:
+        with _swap_lock:
+            _refreshed_during_build = None
+
+
+def _refresh(offer_ids):
+    with _swap_lock:
+        index = _index
+        if _refreshed_during_build is not None:
+            _refreshed_during_build.update(offer_ids)
+    index.refresh(offer_ids)
+
+
+def refresh_offers(offer_ids):
+    """
+    Update the given offers in the index once the current transaction
+    commits (immediately outside a transaction). No-op until the index has
+    been built by a first query.
+    """
+    if _index.built_at is None:
+        return
+    offer_ids = set(offer_ids)
+    transaction.on_commit(lambda: _refresh(offer_ids))
@@ -1,3 +1,999 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import random
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from offers_app import cache as offer_cache, features, read_index, suggest, thumbnails
+from offers_app.api.views import OfferResponseCacheMixin
+from offers_app.models import Offer, OfferDetail
+from userprofile_app.models import UserProfile
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'offers-tests'}}
+
+
+def sql_ids(ordering, user_id=None, min_price=None, max_price=None, max_delivery_time=None):
+    """
+    The ids OfferReadIndex.query() must return, read with SQL: ties broken
+    by id in the direction of the first term, NULLs first ascending.
+    """
+    queryset = Offer.objects.all()
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    if min_price is not None:
+        queryset = queryset.filter(min_price__gte=min_price)
+    if max_price is not None:
+        queryset = queryset.filter(min_price__lte=max_price)
+    if max_delivery_time is not None:
+        queryset = queryset.filter(min_delivery_time__lte=max_delivery_time)
+    id_term = '-id' if ordering[0].startswith('-') else 'id'
+    return list(queryset.order_by(*ordering, id_term).values_list('id', flat=True))
+
+
+class ReadIndexTestCase(TestCase):
+    """
+    Offers with repeating prices, delivery times and update times, some
+    without owner or details (NULL columns).
+    """
+    orderings = [
+        ['updated_at'], ['-updated_at'], ['min_price'], ['-min_price'],
+        ['updated_at', 'min_price'], ['-min_price', 'updated_at'],
+    ]
+    filter_sets = [
+        {}, {'min_price': 150}, {'max_price': 300}, {'max_delivery_time': 4},
+        {'min_price': 100, 'max_price': 400, 'max_delivery_time': 6},
+    ]
+
+    def setUp(self):
+        self.random = random.Random(7)
+        self.users = [
+            UserProfile.objects.create_user(f'business{number}', f'b{number}@example.com', 'pw', type='business')
+            for number in range(3)
+        ]
+        for number in range(60):
+            self.create_offer(number)
+
+    def create_offer(self, number):
+        has_details = self.random.random() > 0.2
+        offer = Offer.objects.create(
+            user=self.random.choice(self.users + [None]),
+            title=f'Offer {number}',
+            min_price=self.random.choice([50, 100, 150, 200, 400, 800]) if has_details else None,
+            min_delivery_time=self.random.randint(1, 9) if has_details else None,
+        )
+        self.touch(offer.pk)
+        return offer.pk
+
+    def touch(self, offer_id):
+        Offer.objects.filter(pk=offer_id).update(
+            updated_at=timezone.now() - timedelta(hours=self.random.randint(0, 20)),
+        )
+
+    def build_index(self):
+        index = read_index.OfferReadIndex()
+        index.rebuild()
+        return index
+
+    def assertIndexMatchesSql(self, index):
+        filter_sets = self.filter_sets + [{'user_id': user.id} for user in self.users]
+        for ordering in self.orderings:
+            for filters in filter_sets:
+                self.assertEqual(
+                    list(index.query(ordering, **filters)), sql_ids(ordering, **filters), (ordering, filters),
+                )
+
+
+class OfferReadIndexTests(ReadIndexTestCase):
+
+    def test_query_matches_sql(self):
+        self.assertIndexMatchesSql(self.build_index())
+
+    @override_settings(OFFERS_READ_INDEX=True, CACHES=NO_CACHE)
+    def test_list_view_serves_offers_without_owner(self):
+        read_index._index.built_at = None
+        self.addCleanup(read_index._index.clear)
+        expected = sql_ids(['-min_price'])
+        for page in (1, 2, 10):
+            response = APIClient().get(f'/api/offers/?ordering=-min_price&page={page}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['count'], len(expected))
+            self.assertEqual(
+                [row['id'] for row in response.json()['results']], expected[(page - 1) * 6:page * 6],
+            )
+
+    def test_refresh_keeps_cached_orders_in_sync(self):
+        index = self.build_index()
+        self.assertIndexMatchesSql(index)
+        cached = set(index.orders)
+        offer_ids = list(Offer.objects.order_by('id').values_list('id', flat=True))
+        changed = self.random.sample(offer_ids[:-1], 15)
+        for offer_id in changed[:10]:
+            Offer.objects.filter(pk=offer_id).update(
+                user=self.random.choice(self.users + [None]),
+                min_price=self.random.choice([None, 75, 150, 900]),
+                min_delivery_time=self.random.choice([None, 2, 5]),
+            )
+            self.touch(offer_id)
+        deleted = changed[10:] + [offer_ids[-1]]
+        Offer.objects.filter(pk__in=deleted).delete()
+        created = [self.create_offer(number) for number in range(60, 70)]
+        index.refresh(changed + [offer_ids[-1]] + created)
+        self.assertEqual(set(index.orders), cached)
+        self.assertEqual(len(index), Offer.objects.count())
+        self.assertIndexMatchesSql(index)
+
+    def test_refresh_of_large_batch_drops_cached_orders(self):
+        index = self.build_index()
+        index.query(['min_price'])
+        index.max_patched_rows = 2
+        offer_ids = list(Offer.objects.values_list('id', flat=True)[:3])
+        Offer.objects.filter(pk__in=offer_ids).update(min_price=1)
+        index.refresh(offer_ids)
+        self.assertEqual(index.orders, {})
+        self.assertIndexMatchesSql(index)
+
+
+class SuggestIndexSwapTests(TestCase):
+    """
+    Rebuilds and compactions run through `suggest.run_in_background`,
+    replaced here by a list the test runs by hand.
+    """
+
+    def setUp(self):
+        self.offers = [Offer.objects.create(title=title) for title in ('Logo Design', 'Logo Animation', 'Web Shop')]
+        self.background = []
+        patcher = mock.patch.object(suggest, 'run_in_background', self.background.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.reset_index)
+        self.reset_index()
+
+    def reset_index(self):
+        suggest._index = suggest.SuggestIndex()
+        suggest._refreshed_during_build = None
+
+    def titles(self, query):
+        return sorted(row['title'] for row in suggest.get_index().suggest(query))
+
+    def test_first_build_runs_on_the_request(self):
+        self.assertEqual(self.titles('logo'), ['Logo Animation', 'Logo Design'])
+        self.assertEqual(self.background, [])
+
+    def test_stale_index_is_rebuilt_in_the_background(self):
+        index = suggest.get_index()
+        index.built_at = time.monotonic() - suggest.get_max_age() - 1
+        Offer.objects.filter(pk=self.offers[2].pk).update(title='Logo Print')
+        self.assertIs(suggest.get_index(), index)
+        self.assertIs(suggest.get_index(), index)
+        self.assertEqual(len(self.background), 1)
+        self.assertEqual(self.titles('logo'), ['Logo Animation', 'Logo Design'])
+
+        self.background.pop()()
+        self.assertIsNot(suggest.get_index(), index)
+        self.assertFalse(suggest.get_index().is_stale())
+        self.assertEqual(self.titles('logo'), ['Logo Animation', 'Logo Design', 'Logo Print'])
+
+    def test_compaction_runs_in_the_background(self):
+        index = suggest.get_index()
+        with mock.patch.object(suggest, 'MAX_PENDING', 2):
+            for offer in self.offers[:2]:
+                Offer.objects.filter(pk=offer.pk).update(title=offer.title + ' Pro')
+                index.refresh([offer.pk])
+            self.assertTrue(index.needs_compaction())
+            self.assertIs(suggest.get_index(), index)
+            self.assertEqual(len(self.background), 1)
+            self.background.pop()()
+        compacted = suggest.get_index()
+        self.assertIsNot(compacted, index)
+        self.assertEqual(compacted.get_stats()['pending'], 0)
+        self.assertEqual(compacted.built_at, index.built_at)
+        self.assertEqual(self.titles('logo'), ['Logo Animation Pro', 'Logo Design Pro'])
+
+    def test_refreshes_during_a_build_reach_the_new_index(self):
+        suggest.get_index()
+        offer = self.offers[2]
+
+        def make_index():
+            index = suggest.rebuilt_index()
+            # Committed after the new index read the offers.
+            Offer.objects.filter(pk=offer.pk).update(title='Zebra Stripes')
+            suggest._refresh([offer.pk])
+            return index
+
+        self.assertTrue(suggest.schedule_swap(make_index))
+        self.assertFalse(suggest.schedule_swap(make_index))
+        self.background.pop()()
+        self.assertEqual(self.titles('zebra'), ['Zebra Stripes'])
+        self.assertIsNone(suggest._refreshed_during_build)
+
+
+class OfferResponseCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.offer = Offer.objects.create(title='Logo Design')
+
+    def test_anonymous_list_is_cached_until_an_offer_changes(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/offers/')['X-Cache'], 'MISS')
+        self.assertEqual(client.get('/api/offers/')['X-Cache'], 'HIT')
+        with self.captureOnCommitCallbacks(execute=True):
+            Offer.objects.create(title='Web Shop')
+        response = client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_owner_name_change_invalidates_list_and_detail(self):
+        owner = UserProfile.objects.create_user('owner', 'o@example.com', 'pw', type='business', first_name='Ann')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.user = owner
+            self.offer.save()
+        client = APIClient()
+        for url in ('/api/offers/', f'/api/offers/{self.offer.pk}/'):
+            self.assertEqual(client.get(url)['X-Cache'], 'MISS')
+            self.assertEqual(client.get(url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            owner.last_login = timezone.now()
+            owner.save(update_fields=['last_login'])
+        self.assertEqual(client.get('/api/offers/')['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            owner.first_name = 'Anna'
+            owner.save()
+        response = client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['user_details']['first_name'], 'Anna')
+        response = client.get(f'/api/offers/{self.offer.pk}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['user_details']['first_name'], 'Anna')
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        client = APIClient()
+        client.force_authenticate(UserProfile.objects.create_user('customer', 'c@example.com', 'pw'))
+        self.assertNotIn('X-Cache', client.get('/api/offers/'))
+
+    def test_default_cache_key_renders_without_cache(self):
+        request = RequestFactory().get('/')
+        request.user = mock.Mock(is_authenticated=False)
+        response = OfferResponseCacheMixin().cached_response(request, lambda: Response({'ok': True}))
+        self.assertEqual(response.data, {'ok': True})
+        self.assertNotIn('X-Cache', response)
+
+
+@override_settings(CACHES=NO_CACHE)
+class OfferKeysetPaginationTests(ReadIndexTestCase):
+    """
+    `?pagination=cursor` walks over offers with NULL min_price and
+    repeated keys, model rows and `.values()` rows alike.
+    """
+
+    def walk(self, url, link):
+        ids, pages = [], 0
+        while url:
+            response = APIClient().get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            page = [row['id'] for row in response.json()['results']]
+            ids = ids + page if link == 'next' else page + ids
+            url = response.json()[link]
+            pages += 1
+            self.assertLess(pages, 50)
+        return ids, response.json()
+
+    def assertRoundTrip(self, ordering):
+        expected = sql_ids([ordering])
+        forward, last_page = self.walk(f'/api/offers/?pagination=cursor&ordering={ordering}', 'next')
+        self.assertEqual(forward, expected, ordering)
+        # Back from the last page over the `previous` links.
+        previous = last_page['previous']
+        backward, _ = self.walk(previous, 'previous')
+        self.assertEqual(backward + [row['id'] for row in last_page['results']], expected, ordering)
+
+    def test_round_trips(self):
+        for ordering in ('min_price', '-min_price', 'updated_at', '-updated_at'):
+            self.assertRoundTrip(ordering)
+
+    @override_settings(FAST_READ_SERIALIZERS=True)
+    def test_round_trips_on_fast_read_path(self):
+        for ordering in ('min_price', '-min_price', 'updated_at', '-updated_at'):
+            self.assertRoundTrip(ordering)
+
+    def test_count_and_invalid_cursor(self):
+        response = APIClient().get('/api/offers/?pagination=cursor&include_count=true')
+        self.assertEqual(response.json()['count'], Offer.objects.count())
+        self.assertEqual(APIClient().get('/api/offers/?cursor=not-a-cursor').status_code, 404)
+
+
+def detail_payload(offer_type, price, delivery_time_in_days, features=('Logo',)):
+    return {
+        'title': f'{offer_type.title()} Package',
+        'revisions': 2,
+        'delivery_time_in_days': delivery_time_in_days,
+        'price': price,
+        'features': list(features),
+        'offer_type': offer_type,
+    }
+
+
+def offer_payload(title, prices=(100, 200, 300), delivery_times=(7, 5, 3), description=''):
+    return {
+        'title': title,
+        'description': description,
+        'details': [
+            detail_payload(offer_type, price, days)
+            for offer_type, price, days in zip(('basic', 'standard', 'premium'), prices, delivery_times)
+        ],
+    }
+
+
+@override_settings(CACHES=NO_CACHE)
+class OfferApiTestCase(TestCase):
+    """
+    A business user with an authenticated client; offers are created over
+    POST /api/offers/ so every signal and index update runs.
+    """
+
+    def setUp(self):
+        self.business = UserProfile.objects.create_user('business', 'b@example.com', 'pw', type='business')
+        self.client = APIClient()
+        self.client.force_authenticate(self.business)
+
+    def create_offer(self, title='Logo Design', **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/offers/', offer_payload(title, **kwargs), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return Offer.objects.get(pk=response.json()['id'])
+
+    def patch_offer(self, offer, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/offers/{offer.pk}/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        offer.refresh_from_db()
+        return response
+
+
+class OfferMinValuesTests(OfferApiTestCase):
+
+    def assertMinValues(self, offer, min_price, min_delivery_time):
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (min_price, min_delivery_time))
+
+    def test_set_on_create(self):
+        offer = self.create_offer(prices=(250, 120, 400), delivery_times=(4, 9, 2))
+        self.assertMinValues(offer, 120, 2)
+
+    def test_updated_by_detail_patch(self):
+        offer = self.create_offer()
+        self.patch_offer(offer, {'details': [detail_payload('premium', 80, 1)]})
+        self.assertMinValues(offer, 80, 1)
+        self.patch_offer(offer, {'details': [detail_payload('premium', 500, 9)]})
+        self.assertMinValues(offer, 100, 5)
+
+    def test_recomputed_after_detail_delete(self):
+        offer = self.create_offer(prices=(100, 200, 300), delivery_times=(7, 5, 3))
+        offer.details.get(offer_type='basic').delete()
+        self.assertMinValues(offer, 200, 3)
+        offer.details.all().delete()
+        self.assertMinValues(offer, None, None)
+
+    def test_filled_in_by_backfill(self):
+        offers = [
+            self.create_offer('Logo Design', prices=(100, 200, 300)),
+            self.create_offer('Web Shop', prices=(90, 40, 70), delivery_times=(2, 8, 6)),
+        ]
+        empty = Offer.objects.create(user=self.business, title='No Details')
+        Offer.objects.update(min_price=None, min_delivery_time=None)
+
+        stdout = io.StringIO()
+        call_command('backfill_offer_min_values', batch_size=1, stdout=stdout)
+        self.assertIn('Backfilled min values for 3 offers.', stdout.getvalue())
+        self.assertMinValues(offers[0], 100, 3)
+        self.assertMinValues(offers[1], 40, 2)
+        self.assertMinValues(empty, None, None)
+
+
+class OfferSearchTests(OfferApiTestCase):
+    """
+    `?search=` over the FTS index, kept in sync by the create signals.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.logo = self.create_offer('Logo Design', prices=(100, 200, 300), description='Brand work')
+        self.brand = self.create_offer('Brand Kit', prices=(400, 500, 600), description='Logo and flyer design')
+        self.shop = self.create_offer('Web Shop', prices=(50, 60, 70), description='Online store')
+        other = UserProfile.objects.create_user('other', 'o@example.com', 'pw', type='business')
+        self.client.force_authenticate(other)
+        self.other_logo = self.create_offer('Logo Animation', prices=(80, 90, 95))
+        self.client.force_authenticate(self.business)
+
+    def search(self, query):
+        response = APIClient().get(f'/api/offers/?search={query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_title_ranks_above_description(self):
+        ids = self.search('logo')
+        self.assertEqual(set(ids), {self.logo.pk, self.brand.pk, self.other_logo.pk})
+        self.assertEqual(ids[-1], self.brand.pk)
+
+    def test_every_word_matches_as_prefix(self):
+        self.assertEqual(self.search('log des'), [self.logo.pk, self.brand.pk])
+        self.assertEqual(self.search('web sto'), [self.shop.pk])
+        self.assertEqual(self.search('logo store'), [])
+
+    def test_fts_syntax_is_treated_as_text(self):
+        logo = self.search('logo')
+        for query in ('%22logo', 'logo*', '-logo', '(logo)', 'logo%5E'):
+            self.assertEqual(self.search(query), logo, query)
+        # Operators and column filters are searched as plain words.
+        for query in ('logo%20OR%20shop', 'NEAR(logo%20design)', 'title:logo', '%22%2A%28%29'):
+            self.assertEqual(self.search(query), [], query)
+
+    def test_combines_with_creator_and_price_filters(self):
+        self.assertEqual(self.search(f'logo&user_id={self.business.pk}'), [self.logo.pk, self.brand.pk])
+        self.assertEqual(self.search('logo&min_price=300'), [self.brand.pk])
+        self.assertEqual(self.search('logo&max_price=90'), [self.other_logo.pk])
+        self.assertEqual(self.search(f'design&user_id={self.business.pk}&max_price=100'), [self.logo.pk])
+
+
+class OfferBulkCreateTests(OfferApiTestCase):
+    """
+    POST /api/offers/bulk/ validates every item before writing and updates
+    the indexes that bulk_create skips by sending no signals.
+    """
+
+    def bulk_create(self, items):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/offers/bulk/', items, format='json')
+
+    def test_errors_are_reported_per_index_and_nothing_is_written(self):
+        invalid = offer_payload('Too Few Details')
+        invalid['details'] = invalid['details'][:2]
+        no_title = offer_payload('')
+        response = self.bulk_create([offer_payload('Logo Design'), invalid, offer_payload('Web Shop'), no_title])
+        self.assertEqual(response.status_code, 400)
+        results = response.json()['results']
+        self.assertEqual([row['index'] for row in results], [0, 1, 2, 3])
+        self.assertEqual([row['errors'] is None for row in results], [True, False, True, False])
+        self.assertIn('non_field_errors', results[1]['errors'])
+        self.assertIn('title', results[3]['errors'])
+        self.assertTrue(all(row['id'] is None for row in results))
+        self.assertFalse(Offer.objects.exists())
+        self.assertFalse(OfferDetail.objects.exists())
+
+    def test_only_business_users_and_lists_are_accepted(self):
+        self.assertEqual(self.bulk_create({'title': 'Logo Design'}).status_code, 400)
+        self.assertEqual(self.bulk_create([]).status_code, 400)
+        self.business.type = 'customer'
+        self.business.save()
+        self.assertEqual(self.bulk_create([offer_payload('Logo Design')]).status_code, 403)
+
+    @override_settings(OFFERS_READ_INDEX=True, CACHES=LOCMEM_CACHE)
+    def test_created_offers_reach_every_index(self):
+        read_index._index.rebuild()
+        self.addCleanup(read_index._index.clear)
+        suggest._index = suggest.SuggestIndex()
+        suggest._index.rebuild()
+        self.addCleanup(setattr, suggest, '_index', suggest.SuggestIndex())
+        version = offer_cache.get_catalog_version()
+
+        items = [
+            offer_payload('Logo Design', prices=(120, 200, 300)),
+            offer_payload('Flyer Print', prices=(30, 40, 50)),
+        ]
+        items[1]['details'][0]['features'] = ['Flyer', 'Print Ready']
+        response = self.bulk_create(items)
+        self.assertEqual(response.status_code, 201, response.content)
+        ids = [row['id'] for row in response.json()['results']]
+        self.assertEqual(
+            list(Offer.objects.filter(pk__in=ids).order_by('pk').values_list('min_price', 'min_delivery_time')),
+            [(120, 3), (30, 3)],
+        )
+        self.assertEqual(OfferDetail.objects.filter(offer_id__in=ids).count(), 6)
+
+        self.assertNotEqual(offer_cache.get_catalog_version(), version)
+        search = APIClient().get('/api/offers/?search=flyer').json()['results']
+        self.assertEqual([row['id'] for row in search], [ids[1]])
+        with_feature = Offer.objects.filter(pk__in=features.offer_ids_with_features(['print ready']))
+        self.assertEqual(list(with_feature.values_list('pk', flat=True)), [ids[1]])
+        self.assertEqual(list(read_index._index.query(['min_price'])), sql_ids(['min_price']))
+        self.assertEqual(sorted(row['title'] for row in suggest.get_index().suggest('flyer')), ['Flyer Print'])
+
+
+class OfferPatchTests(OfferApiTestCase):
+    """
+    OfferUpdateSerializer writes only what differs from the stored offer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.offer = self.create_offer(prices=(100, 200, 300), delivery_times=(7, 5, 3))
+        self.details = {detail.offer_type: detail for detail in self.offer.details.all()}
+
+    def bulk_updates(self, data):
+        with mock.patch.object(QuerySet, 'bulk_update', autospec=True, side_effect=QuerySet.bulk_update) as bulk_update:
+            self.patch_offer(self.offer, data)
+        return [(sorted(obj.pk for obj in call.args[1]), list(call.args[2])) for call in bulk_update.call_args_list]
+
+    def test_unchanged_patch_writes_nothing(self):
+        updated_at = self.offer.updated_at
+        data = offer_payload('Logo Design')
+        # The offer, its details for validation and its details for the response.
+        with self.assertNumQueries(3):
+            response = self.client.patch(f'/api/offers/{self.offer.pk}/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.updated_at, updated_at)
+
+    def test_only_changed_details_are_updated(self):
+        basic, premium = self.details['basic'], self.details['premium']
+        data = {'details': [
+            detail_payload('basic', 100, 7),
+            detail_payload('standard', 200, 5),
+            detail_payload('premium', 250, 3),
+        ]}
+        self.assertEqual(self.bulk_updates(data), [([premium.pk], ['price'])])
+
+        data['details'][0]['title'] = 'Starter'
+        data['details'][2]['revisions'] = 5
+        self.assertEqual(self.bulk_updates(data), [([basic.pk, premium.pk], ['revisions', 'title'])])
+        self.assertEqual(
+            list(self.offer.details.order_by('pk').values_list('title', 'revisions', 'price')),
+            [('Starter', 2, 100), ('Standard Package', 2, 200), ('Premium Package', 5, 250)],
+        )
+
+    def test_updated_at_and_min_values_follow_the_changes(self):
+        updated_at = self.offer.updated_at
+        self.patch_offer(self.offer, {'details': [dict(detail_payload('basic', 100, 7), title='Starter')]})
+        self.assertGreater(self.offer.updated_at, updated_at)
+        self.assertEqual((self.offer.min_price, self.offer.min_delivery_time), (100, 3))
+
+        updated_at = self.offer.updated_at
+        data = {'details': [detail_payload('standard', 60, 1)]}
+        # The two reads, one UPDATE per table inside a savepoint, the response's details.
+        with self.assertNumQueries(7):
+            self.client.patch(f'/api/offers/{self.offer.pk}/', data, format='json')
+        self.offer.refresh_from_db()
+        self.assertGreater(self.offer.updated_at, updated_at)
+        self.assertEqual((self.offer.min_price, self.offer.min_delivery_time), (60, 1))
+
+    def test_unknown_offer_type_writes_nothing(self):
+        updated_at = self.offer.updated_at
+        data = {'title': 'Renamed', 'details': [detail_payload('basic', 10, 1), detail_payload('gold', 5, 1)]}
+        response = self.client.patch(f'/api/offers/{self.offer.pk}/', data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, 'Logo Design')
+        self.assertEqual((self.offer.min_price, self.offer.updated_at), (100, updated_at))
+        self.assertEqual(self.offer.details.get(offer_type='basic').price, 100)
+
+
+class OfferReadQueryCountTests(OfferApiTestCase):
+    """
+    Listing and retrieving offers costs a constant number of queries,
+    however many offers, owners and details a page holds.
+    """
+
+    def setUp(self):
+        super().setUp()
+        owners = [self.business] + [
+            UserProfile.objects.create_user(f'owner{number}', f'o{number}@example.com', 'pw', type='business')
+            for number in range(2)
+        ]
+        for number in range(6):
+            self.client.force_authenticate(owners[number % 3])
+            self.create_offer(f'Offer {number}')
+        self.client.force_authenticate(self.business)
+        self.offer = Offer.objects.first()
+
+    def assertListQueries(self, count, url='/api/offers/'):
+        for page_size in (1, 6):
+            with self.assertNumQueries(count):
+                response = APIClient().get(f'{url}{"&" if "?" in url else "?"}page_size={page_size}')
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(len(response.json()['results']), page_size)
+
+    def test_list(self):
+        # COUNT, the page with its owners, the detail links of the page.
+        self.assertListQueries(3)
+        self.assertListQueries(2, '/api/offers/?fields=id,title,user_details')
+
+    @override_settings(FAST_READ_SERIALIZERS=True)
+    def test_list_on_fast_read_path(self):
+        self.assertListQueries(3)
+
+    def test_detail(self):
+        with self.assertNumQueries(2):
+            response = APIClient().get(f'/api/offers/{self.offer.pk}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()['details']), 3)
+        self.assertEqual(response.json()['user_details']['username'], 'business')
+
+
+class OfferFeatureTests(OfferApiTestCase):
+    """
+    The feature index behind `?feature=` and GET /api/offers/features/.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.logo = self.create_offer_with_features('Logo Design', ['Logo', 'Source Files'], ['Business Card'])
+        self.card = self.create_offer_with_features('Card Print', ['business  card'], ['Flyer'], price=40)
+        self.flyer = self.create_offer_with_features('Flyer Print', ['FLYER', 'Logo'], [], price=60)
+
+    def create_offer_with_features(self, title, *detail_features, price=100):
+        data = offer_payload(title, prices=(price, price + 10, price + 20))
+        for index, detail in enumerate(data['details']):
+            detail['features'] = detail_features[index] if index < len(detail_features) else []
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/offers/', data, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def filtered(self, query):
+        response = APIClient().get(f'/api/offers/?{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(row['id'] for row in response.json()['results'])
+
+    def top(self, query=''):
+        response = APIClient().get(f'/api/offers/features/?{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(row['name'], row['offer_count']) for row in response.json()]
+
+    def test_feature_filter_matches_all_or_any(self):
+        self.assertEqual(self.filtered('feature=logo'), [self.logo, self.flyer])
+        self.assertEqual(self.filtered('feature=Business%20%20Card'), [self.logo, self.card])
+        self.assertEqual(self.filtered('feature=Logo&feature=Flyer'), [self.flyer])
+        self.assertEqual(
+            self.filtered('feature=Logo&feature=Flyer&feature_match=any'), [self.logo, self.card, self.flyer],
+        )
+        self.assertEqual(self.filtered('feature=Logo&feature=Unknown'), [])
+        self.assertEqual(self.filtered('feature=Logo&feature=Unknown&feature_match=any'), [self.logo, self.flyer])
+        self.assertEqual(self.filtered('feature=logo&max_price=80'), [self.flyer])
+        self.assertEqual(APIClient().get('/api/offers/?feature=Logo&feature_match=some').status_code, 400)
+
+    def test_top_features_are_counted_per_offer(self):
+        self.assertEqual(
+            self.top(), [('Business Card', 2), ('Flyer', 2), ('Logo', 2), ('Source Files', 1)],
+        )
+        self.assertEqual(self.top('limit=2'), [('Business Card', 2), ('Flyer', 2)])
+        self.assertEqual(self.top('max_price=80'), [('Flyer', 2), ('Business Card', 1), ('Logo', 1)])
+        self.assertEqual(
+            self.top('feature=logo'), [('Logo', 2), ('Business Card', 1), ('Flyer', 1), ('Source Files', 1)],
+        )
+        self.assertEqual(APIClient().get('/api/offers/features/?limit=0').status_code, 400)
+
+    def test_top_features_limit_is_applied_by_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(features.top_features(1), [{'name': 'Business Card', 'offer_count': 2}])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LIMIT 1', queries[0]['sql'])
+
+
+def image_upload(name, size):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'navy').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(CACHES=NO_CACHE, OFFERS_THUMBNAILS_ASYNC=False)
+class OfferThumbnailTests(TestCase):
+    """
+    Thumbnails render inline on commit into a temporary MEDIA_ROOT.
+    """
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_offer(self, size, render=True):
+        with self.captureOnCommitCallbacks(execute=render):
+            return Offer.objects.create(title='Logo Design', image=image_upload('logo.png', size))
+
+    def thumbnail_urls(self, offer):
+        response = APIClient().get(f'/api/offers/{offer.pk}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['thumbnails']
+
+    def test_original_image_is_served_until_thumbnails_are_ready(self):
+        offer = self.create_offer((1600, 1200), render=False)
+        image_url = 'http://testserver' + offer.image.url
+        self.assertEqual(self.thumbnail_urls(offer), {name: image_url for name in thumbnails.THUMBNAIL_SIZES})
+
+        thumbnails.generate_thumbnails(offer.pk, offer.image.name)
+        urls = self.thumbnail_urls(offer)
+        offer.refresh_from_db()
+        self.assertEqual(
+            urls, {name: 'http://testserver' + default_storage.url(offer.thumbnails[name]) for name in urls},
+        )
+        self.assertTrue(urls['card'].startswith(f'http://testserver/uploads/thumbnails/{offer.pk}/'))
+        self.assertTrue(urls['card'].endswith('-card-400x300.jpg'))
+
+    def test_replaced_image_falls_back_to_the_new_original(self):
+        offer = self.create_offer((1600, 1200))
+        offer.image = image_upload('flyer.png', (1600, 1200))
+        with self.captureOnCommitCallbacks(execute=False):
+            offer.save()
+        self.assertEqual(set(self.thumbnail_urls(offer).values()), {'http://testserver' + offer.image.url})
+
+    def test_thumbnails_are_scaled_down_but_never_up(self):
+        offer = self.create_offer((1600, 1000))
+        offer.refresh_from_db()
+        with default_storage.open(offer.thumbnails['card']) as card:
+            self.assertEqual(Image.open(card).size, (400, 300))
+
+        offer = self.create_offer((200, 300))
+        offer.refresh_from_db()
+        for name in thumbnails.THUMBNAIL_SIZES:
+            with default_storage.open(offer.thumbnails[name]) as thumbnail:
+                self.assertEqual(Image.open(thumbnail).size, (200, 150), name)
+
+
+@override_settings(CACHES=NO_CACHE)
+class OfferFacetsTests(TestCase):
+    """
+    Every facet count equals the count of the offer list under the same
+    filters narrowed by the filter the bucket stands for.
+    """
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.user = UserProfile.objects.create_user('business', 'b@example.com', 'pw', type='business')
+        for number in range(40):
+            offer = Offer.objects.create(
+                user=rng.choice([self.user, None]), title=rng.choice(['Logo Design', 'Web Shop']) + f' {number}',
+            )
+            for offer_type in rng.sample(['basic', 'standard', 'premium'], rng.randint(0, 3)):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, features=[], offer_type=offer_type,
+                    price=rng.choice([10, 50, 99, 100, 249, 250, 600, 1000, 2500]),
+                    delivery_time_in_days=rng.choice([1, 2, 3, 5, 7, 10, 14, 30, 45]),
+                )
+            offer.refresh_min_values()
+
+    def get(self, url, params):
+        response = APIClient().get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def list_count(self, filters, **narrowed):
+        return self.get('/api/offers/', {**filters, **narrowed})['count']
+
+    def test_bucket_counts(self):
+        facets = self.get('/api/offers/facets/', {})
+        offers = list(Offer.objects.values('min_price', 'min_delivery_time'))
+        self.assertEqual(facets['count'], 40)
+        for bucket in facets['price']:
+            expected = [
+                offer for offer in offers if offer['min_price'] is not None and offer['min_price'] >= bucket['min']
+                and (bucket['max'] is None or offer['min_price'] < bucket['max'])
+            ]
+            self.assertEqual(bucket['count'], len(expected), bucket)
+        for bucket in facets['max_delivery_time']:
+            expected = [
+                offer for offer in offers
+                if offer['min_delivery_time'] is not None and offer['min_delivery_time'] <= bucket['days']
+            ]
+            self.assertEqual(bucket['count'], len(expected), bucket)
+        for offer_type, count in facets['offer_type'].items():
+            self.assertEqual(count, Offer.objects.filter(details__offer_type=offer_type).count(), offer_type)
+
+    def test_facets_follow_the_active_filters(self):
+        filter_sets = [
+            {}, {'search': 'logo'}, {'min_price': 100}, {'max_delivery_time': 7}, {'offer_type': 'premium'},
+            {'user_id': self.user.pk, 'max_price': 600},
+        ]
+        for filters in filter_sets:
+            facets = self.get('/api/offers/facets/', filters)
+            self.assertEqual(facets['count'], self.list_count(filters), filters)
+            for bucket in facets['price']:
+                bounds = {'min_price': max(bucket['min'], filters.get('min_price', 0))}
+                if bucket['max'] is not None:
+                    bounds['max_price'] = min(bucket['max'] - 1, filters.get('max_price', bucket['max']))
+                self.assertEqual(bucket['count'], self.list_count(filters, **bounds), (filters, bucket))
+            for bucket in facets['max_delivery_time']:
+                days = min(bucket['days'], filters.get('max_delivery_time', bucket['days']))
+                self.assertEqual(
+                    bucket['count'], self.list_count(filters, max_delivery_time=days), (filters, bucket),
+                )
+            for offer_type, count in facets['offer_type'].items():
+                if filters.get('offer_type') == offer_type:
+                    self.assertEqual(count, facets['count'], filters)
+                elif 'offer_type' not in filters:
+                    self.assertEqual(count, self.list_count(filters, offer_type=offer_type), (filters, offer_type))
+
+
+def legacy_filter_offers(queryset, params):
+    """
+    The hand-written filters OfferFilterSet replaced, kept as the reference.
+    """
+    if params.get('user_id'):
+        queryset = queryset.filter(user_id=params['user_id'])
+    if params.get('min_price') is not None:
+        queryset = queryset.filter(min_price__gte=int(params['min_price']))
+    if params.get('max_delivery_time'):
+        queryset = queryset.filter(min_delivery_time__lte=int(params['max_delivery_time']))
+    return queryset
+
+
+@override_settings(CACHES=NO_CACHE)
+class OfferFilterSetTests(ReadIndexTestCase):
+
+    def list_ids(self, params):
+        ids, page = [], 1
+        while True:
+            response = APIClient().get('/api/offers/', {**params, 'page': page})
+            self.assertEqual(response.status_code, 200, response.content)
+            ids += [row['id'] for row in response.json()['results']]
+            if not response.json()['next']:
+                return ids
+            page += 1
+
+    def test_matches_the_hand_written_filters(self):
+        filter_sets = [
+            {}, {'user_id': self.users[0].pk}, {'min_price': 150}, {'min_price': 0}, {'max_delivery_time': 4},
+            {'user_id': self.users[1].pk, 'min_price': 100, 'max_delivery_time': 6},
+            {'user_id': '', 'max_delivery_time': ''},
+        ]
+        for params in filter_sets:
+            expected = legacy_filter_offers(Offer.objects.all(), params).values_list('id', flat=True)
+            self.assertEqual(sorted(self.list_ids(params)), sorted(expected), params)
+
+    def test_max_price_and_offer_type(self):
+        offer = Offer.objects.filter(min_price__isnull=False).first()
+        OfferDetail.objects.create(
+            offer=offer, title='Premium', revisions=1, delivery_time_in_days=offer.min_delivery_time,
+            price=offer.min_price, features=[], offer_type='premium',
+        )
+        self.assertEqual(self.list_ids({'offer_type': 'premium'}), [offer.pk])
+        expected = Offer.objects.filter(min_price__lte=200).values_list('id', flat=True)
+        self.assertEqual(sorted(self.list_ids({'max_price': 200})), sorted(expected))
+
+    def test_invalid_values_are_rejected(self):
+        errors = {
+            'min_price': ['min_price must be a valid integer.'],
+            'max_price': ['max_price must be a valid integer.'],
+            'max_delivery_time': ['must be a valid number'],
+        }
+        for name, error in errors.items():
+            for value in ('abc', '1.5'):
+                response = APIClient().get('/api/offers/', {name: value})
+                self.assertEqual(response.status_code, 400, (name, value))
+                self.assertEqual(response.json(), {name: error})
+        for params in ({'user_id': 'me'}, {'offer_type': 'gold'}, {'feature_match': 'some'}):
+            response = APIClient().get('/api/offers/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(list(response.json()), list(params))
+            self.assertEqual(APIClient().get('/api/offers/facets/', params).status_code, 400, params)
+
+
+class OfferSparseFieldsetTests(OfferApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.offer = self.create_offer()
+
+    def get(self, url, status_code=200):
+        response = APIClient().get(url)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+    def test_list_and_detail_fields(self):
+        for fast in (False, True):
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                rows = self.get('/api/offers/?fields=id,title,min_price')['results']
+                self.assertEqual(rows, [{'id': self.offer.pk, 'title': 'Logo Design', 'min_price': 100}])
+                row = self.get('/api/offers/?omit=details,user_details,thumbnails,image')['results'][0]
+                self.assertEqual(set(row), {
+                    'id', 'user', 'title', 'description', 'created_at', 'updated_at', 'min_price', 'min_delivery_time',
+                })
+        detail = self.get(f'/api/offers/{self.offer.pk}/?fields=id,details')
+        self.assertEqual(set(detail), {'id', 'details'})
+        self.assertEqual(len(detail['details']), 3)
+        self.assertEqual(set(detail['details'][0]), {'id', 'url'})
+        response = self.client.get(f'/api/offerdetails/{detail["details"][0]["id"]}/?fields=price,offer_type')
+        self.assertEqual(response.json(), {'price': 100, 'offer_type': 'basic'})
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.get('/api/offers/?fields=id,secret', 400), {'fields': 'Unknown field(s): secret.'})
+        self.assertEqual(
+            self.get(f'/api/offers/{self.offer.pk}/?omit=bogus', 400), {'omit': 'Unknown field(s): bogus.'},
+        )
+
+
+class OfferExportTests(OfferApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.offers = [self.create_offer('Logo Design'), self.create_offer('Web Shop', prices=(50, 60, 70))]
+        other = UserProfile.objects.create_user('other', 'o@example.com', 'pw', type='business')
+        self.client.force_authenticate(other)
+        self.other_offer = self.create_offer('Logo Animation')
+
+    def export(self, query=''):
+        response = APIClient().get(f'/api/offers/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_has_one_offer_per_line(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [offer.pk for offer in self.offers + [self.other_offer]])
+        self.assertEqual(rows[1]['min_price'], 50)
+        self.assertEqual(rows[1]['user'], self.business.pk)
+        self.assertEqual([detail['price'] for detail in rows[1]['details']], [50, 60, 70])
+        self.assertEqual(rows[1]['details'][0]['features'], ['Logo'])
+
+    def test_csv_has_one_line_per_detail(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('?file_format=csv'))))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual([row['detail_offer_type'] for row in rows[:3]], ['basic', 'standard', 'premium'])
+        self.assertEqual({row['title'] for row in rows[3:6]}, {'Web Shop'})
+        self.assertEqual(rows[0]['detail_features'], '["Logo"]')
+
+    def test_owner_and_filters_scope_the_rows(self):
+        rows = [json.loads(line) for line in self.export(f'?user_id={self.business.pk}').splitlines()]
+        self.assertEqual([row['id'] for row in rows], [offer.pk for offer in self.offers])
+        rows = [json.loads(line) for line in self.export(f'?search=logo&user_id={self.business.pk}').splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.offers[0].pk])
+        rows = list(csv.DictReader(io.StringIO(self.export('?file_format=csv&max_price=60'))))
+        self.assertEqual({row['id'] for row in rows}, {str(self.offers[1].pk)})
+
+    def test_invalid_format_or_filter_is_rejected(self):
+        self.assertEqual(APIClient().get('/api/offers/export/?file_format=xml').status_code, 400)
+        self.assertEqual(APIClient().get('/api/offers/export/?min_price=cheap').status_code, 400)
+
+
+class OfferFastReadTests(OfferApiTestCase):
+    """
+    FAST_READ_SERIALIZERS renders the same bytes as OfferSerializer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_offer('Logo Design', description='Brand work')
+        offer = self.create_offer('Web Shop')
+        Offer.objects.filter(pk=offer.pk).update(
+            image='uploads/shop.png',
+            thumbnails={'source': 'uploads/shop.png', 'card': 'uploads/thumbnails/1/shop-card.jpg'},
+        )
+        Offer.objects.create(title='No Owner', image='uploads/plain.png')
+        Offer.objects.create(user=self.business, title='No Details', description='')
+
+    def assertSameBytes(self, url):
+        with self.settings(FAST_READ_SERIALIZERS=False):
+            expected = APIClient().get(url)
+        with self.settings(FAST_READ_SERIALIZERS=True):
+            fast = APIClient().get(url)
+        self.assertEqual(expected.status_code, 200, expected.content)
+        self.assertEqual(fast.content, expected.content, url)
+
+    def test_list_is_byte_identical(self):
+        queries = (
+            '', '?ordering=-min_price', '?page_size=2&page=2', '?fields=id,details,thumbnails',
+            '?omit=user_details', '?pagination=cursor&ordering=updated_at', '?search=logo',
+        )
+        for query in queries:
+            self.assertSameBytes(f'/api/offers/{query}')
@@ -0,0 +1,174 @@
+"""
+Background thumbnail generation for Offer.image.
+
+When an offer is saved with a new image, `schedule()` hands the offer id to a
+process-wide thread pool once the transaction commits. The worker renders
+one JPEG per entry in THUMBNAIL_SIZES and stores the resulting paths in
+`Offer.thumbnails` together with the source image name, so thumbnails of an
+image that was replaced in the meantime are never shown.
+
+Settings:
+    OFFERS_THUMBNAIL_WORKERS (int, default 2): size of the worker pool.
+    OFFERS_THUMBNAILS_ASYNC (bool, default True): set to False to render
+        inline on commit (useful in tests and management commands).
+"""
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from offers_app import cache as offer_cache
+from offers_app.models import Offer
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = {
+    'card': (400, 300),
+    'detail': (1200, 900),
+    'retina': (800, 600),
+}
+THUMBNAIL_DIR = 'uploads/thumbnails'
+THUMBNAIL_QUALITY = 85
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'OFFERS_THUMBNAIL_WORKERS', 2),
+                thread_name_prefix='offer-thumbnails',
+            )
+        return _executor
+
+
+def needs_thumbnails(offer):
+    """
+    True if the offer has an image whose thumbnails have not been rendered.
+    """
+    return bool(offer.image) and (offer.thumbnails or {}).get('source') != offer.image.name
+
+
+def schedule(offer):
+    """
+    Render the offer's thumbnails after the current transaction commits.
+    """
+    offer_id, source = offer.pk, offer.image.name
+
+    def submit():
+        if getattr(settings, 'OFFERS_THUMBNAILS_ASYNC', True):
+            get_executor().submit(run_in_worker, offer_id, source)
+        else:
+            generate_thumbnails_safely(offer_id, source)
+
+    transaction.on_commit(submit)
+
+
+def generate_thumbnails_safely(offer_id, source):
+    """
+    Like `generate_thumbnails()`, but logs failures (unreadable image,
+    storage errors) instead of raising; the original stays in use.
+    """
+    try:
+        return generate_thumbnails(offer_id, source)
+    except Exception:
+        logger.exception('Thumbnail generation failed for offer %s', offer_id)
+        return None
+
+
+def run_in_worker(offer_id, source):
+    """
+    Worker entry point: renders the thumbnails with the thread's own DB
+    connection, which is closed afterwards.
+    """
+    close_old_connections()
+    try:
+        return generate_thumbnails_safely(offer_id, source)
+    finally:
+        close_old_connections()
+
+
+def fit_size(image_size, size):
+    """
+    Return the largest size with the aspect ratio of `size` that is no
+    larger than `size` or `image_size`, so small images are never upscaled.
+    """
+    scale = min(1, image_size[0] / size[0], image_size[1] / size[1])
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def render_thumbnail(image, size):
+    """
+    Return JPEG bytes of `image` cropped to the aspect ratio of `size` and
+    scaled down to it. Images smaller than `size` are cropped only.
+    """
+    image = ImageOps.exif_transpose(image)
+    thumbnail = ImageOps.fit(image, fit_size(image.size, size))
+    if thumbnail.mode not in ('RGB', 'L'):
+        thumbnail = thumbnail.convert('RGB')
+    buffer = BytesIO()
+    thumbnail.save(buffer, format='JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def generate_thumbnails(offer_id, source):
+    """
+    Render all thumbnail sizes for `source` and attach them to the offer.
+
+    Returns:
+        dict | None: the stored thumbnails, or None if the offer no longer
+        uses `source` as its image.
+    """
+    stem = posixpath.splitext(posixpath.basename(source))[0]
+    thumbnails = {'source': source}
+    with default_storage.open(source, 'rb') as original:
+        image = Image.open(original)
+        image.load()
+    for name, size in THUMBNAIL_SIZES.items():
+        path = f'{THUMBNAIL_DIR}/{offer_id}/{stem}-{name}-{size[0]}x{size[1]}.jpg'
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        thumbnails[name] = default_storage.save(path, ContentFile(render_thumbnail(image, size)))
+
+    # Only attach the thumbnails if the image was not replaced meanwhile.
+    updated = Offer.objects.filter(pk=offer_id, image=source).update(thumbnails=thumbnails)
+    if not updated:
+        return None
+    offer_cache.invalidate_offers([offer_id])
+    return thumbnails
+
+
+def get_urls(offer, request=None):
+    """
+    Return {size name: URL} for the offer, falling back to the original
+    image URL for every size until the thumbnails are ready.
+
+    Returns None if the offer has no image.
+    """
+    return get_urls_for_image(offer.image.name, offer.thumbnails, request)
+
+
+def get_urls_for_image(image_name, thumbnails, request=None):
+    """
+    Like `get_urls()`, from the raw `image` and `thumbnails` column values.
+    """
+    if not image_name:
+        return None
+    thumbnails = thumbnails or {}
+    ready = thumbnails.get('source') == image_name
+    image_url = Offer._meta.get_field('image').storage.url(image_name)
+    urls = {}
+    for name in THUMBNAIL_SIZES:
+        url = default_storage.url(thumbnails[name]) if ready and name in thumbnails else image_url
+        urls[name] = request.build_absolute_uri(url) if request is not None else url
+    return urls
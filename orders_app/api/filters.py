@@ -0,0 +1,40 @@
+import django_filters
+from orders_app.models import Order
+from offers_app.models import OfferDetail
+
+ROLE_CHOICES = (('customer', 'Customer'), ('business', 'Business'))
+
+
+class OrderFilterSet(django_filters.FilterSet):
+    """
+    Query-parameter filters for the orders list.
+
+    Filters:
+        - status: in_progress / completed / cancelled
+        - offer_type: basic / standard / premium
+        - created_after: orders created at or after this ISO 8601 date or datetime
+        - created_before: orders created at or before this ISO 8601 date or datetime
+        - role: "customer" (orders you placed) or "business" (orders you
+          received); both by default
+
+    Every filter is a plain predicate on the orders table. The list reads
+    one index branch per role (see OrderListCreateView.get_keyset_branches):
+    (customer_user, created_at, id) for the customer side and
+    (business_user, status, created_at) or (business_user, created_at, id)
+    for the business side, so each combination is an index SEARCH.
+    """
+    status = django_filters.ChoiceFilter(choices=Order.STATUS_CHOICES)
+    offer_type = django_filters.ChoiceFilter(choices=OfferDetail.OFFER_TYPE)
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lte')
+    role = django_filters.ChoiceFilter(choices=ROLE_CHOICES, method='filter_role')
+
+    class Meta:
+        model = Order
+        fields = ['status', 'offer_type', 'created_after', 'created_before', 'role']
+
+    def filter_role(self, queryset, name, value):
+        user = self.request.user
+        if value == 'customer':
+            return queryset.filter(customer_user=user)
+        return queryset.filter(business_user=user)
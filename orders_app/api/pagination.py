@@ -0,0 +1,16 @@
+from core.pagination import KeysetPagination
+
+
+class OrderCursorPagination(KeysetPagination):
+    """
+    Opaque-cursor (keyset) pagination for the orders list, keyed on
+    (created_at, id).
+
+    Newest first by default; `?ordering=created_at` walks oldest first.
+    Query parameters: cursor, page_size (default 20, max 100) and
+    include_count; see core.pagination.KeysetPagination.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering_keys = ('created_at',)
+    datetime_keys = ('created_at',)
@@ -1,9 +1,15 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from core.fast_serializers import FastReadSerializer
+from core.serializers import SparseFieldsetMixin
+from orders_app import changes, counters
 from orders_app.models import Order
 from offers_app.models import OfferDetail
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Read serializer for the Order model.
 
@@ -31,6 +37,7 @@ class OrderSerializer(serializers.ModelSerializer):
           accidental writes through this serializer.
         - The foreign key to the original OfferDetail is intentionally not included in
           the output. Consumers should use the snapshot fields above.
+        - Supports `?fields=` / `?omit=` (see SparseFieldsetMixin).
     """
 
     class Meta:
@@ -53,6 +60,13 @@ class OrderSerializer(serializers.ModelSerializer):
 
 
 
+class OrderFastSerializer(FastReadSerializer):
+    """
+    Fast read path for OrderSerializer (see core.fast_serializers).
+    """
+    serializer_class = OrderSerializer
+
+
 class OrderCreateSerializer(serializers.Serializer):
     """
     Serializer used to create a new Order from a given OfferDetail.
@@ -94,7 +108,7 @@ class OrderCreateSerializer(serializers.Serializer):
             serializers.ValidationError: If no OfferDetail with this id exists.
         """
         try:
-            offer_detail = OfferDetail.objects.get(id=value)
+            offer_detail = OfferDetail.objects.select_related('offer').get(id=value)
         except OfferDetail.DoesNotExist:
             raise serializers.ValidationError("Offer detail with this ID does not exist.")
         return offer_detail
@@ -135,17 +149,19 @@ class OrderCreateSerializer(serializers.Serializer):
         user = self.context['request'].user
 
         offer = offer_detail.offer
-        return Order.objects.create(
-            customer_user = user,
-            business_user = offer.user,
-            offer_detail = offer_detail,
-            title = offer_detail.title,
-            revisions = offer_detail.revisions,
-            delivery_time_in_days = offer_detail.delivery_time_in_days,
-            price = offer_detail.price,
-            features = offer_detail.features,
-            offer_type = offer_detail.offer_type,
-        )
+        # Atomic with the status counter update (see orders_app/counters.py).
+        with transaction.atomic():
+            return Order.objects.create(
+                customer_user = user,
+                business_user_id = offer.user_id,
+                offer_detail = offer_detail,
+                title = offer_detail.title,
+                revisions = offer_detail.revisions,
+                delivery_time_in_days = offer_detail.delivery_time_in_days,
+                price = offer_detail.price,
+                features = offer_detail.features,
+                offer_type = offer_detail.offer_type,
+            )
     
     
 
@@ -167,4 +183,54 @@ class OrderStatusUpdateSerializer(serializers.ModelSerializer):
         model = Order   
         fields = [
             'status',
-        ]
\ No newline at end of file
+        ]
+
+    def update(self, instance, validated_data):
+        """
+        Move the order to the new status with a conditional UPDATE.
+
+        The UPDATE repeats the status it moves from, and the status counters
+        (see orders_app/counters.py) and the change feed move only if it
+        matched, so two requests saving the same change from the same
+        loaded status count it once. If another request changed the status
+        first, the current status is read again and the move retried from
+        there; once the order is in the target status nothing is written.
+
+        Raises:
+            NotFound: if the order was deleted in the meantime.
+        """
+        new_status = validated_data.get('status', instance.status)
+        old_status = getattr(instance, '_loaded_status', None) or instance.status
+        with transaction.atomic():
+            while old_status != new_status:
+                now = timezone.now()
+                if Order.objects.filter(pk=instance.pk, status=old_status).update(status=new_status, updated_at=now):
+                    counters.move(instance.business_user_id, old_status, new_status)
+                    changes.record(instance, 'updated')
+                    instance.updated_at = now
+                    break
+                old_status = Order.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+                if old_status is None:
+                    raise NotFound('No Order matches the given query.')
+        instance.status = instance._loaded_status = new_status
+        return instance
+
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Input of PATCH /api/orders/bulk-status/.
+
+    Expected input:
+        - ids (list of int, required): 1 to `max_ids` order ids; duplicates
+          are ignored.
+        - status (str, required): the target status (see Order.STATUS_CHOICES).
+    """
+    max_ids = 500
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1), allow_empty=False, max_length=max_ids,
+    )
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
@@ -1,9 +1,17 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderPatchView, OrderCountView, OrderCountCompletedView
+from .views import (
+    OrderListCreateView, OrderExportView, OrderBulkStatusView, OrderChangesView, OrderPatchView, OrderCountView,
+    OrderCountCompletedView, OrderStatusCountsView, OrderCountsView,
+)
 
 urlpatterns = [
     path('orders/', OrderListCreateView.as_view(), name='orders'),
+    path('orders/export/', OrderExportView.as_view(), name='orders-export'),
+    path('orders/bulk-status/', OrderBulkStatusView.as_view(), name='orders-bulk-status'),
+    path('orders/changes/', OrderChangesView.as_view(), name='orders-changes'),
     path('orders/<int:id>/', OrderPatchView.as_view(), name='order-patch'),
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
-    path('completed-order-count/<int:business_user_id>/', OrderCountCompletedView.as_view(), name='order-count-completed')
+    path('completed-order-count/<int:business_user_id>/', OrderCountCompletedView.as_view(), name='order-count-completed'),
+    path('order-status-counts/<int:business_user_id>/', OrderStatusCountsView.as_view(), name='order-status-counts'),
+    path('order-counts/', OrderCountsView.as_view(), name='order-counts'),
 ]
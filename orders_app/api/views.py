@@ -1,25 +1,105 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import generics, status, filters
-from .serializers import OrderCreateSerializer, OrderSerializer, OrderStatusUpdateSerializer
-from orders_app.models import Order
+from rest_framework.exceptions import ValidationError
+from .serializers import (
+    OrderBulkStatusSerializer, OrderCreateSerializer, OrderFastSerializer, OrderSerializer, OrderStatusUpdateSerializer,
+)
+from orders_app.models import ArchivedOrder, Order
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from userprofile_app.models import UserProfile
+from orders_app import changes, counters
+from core.idempotency import idempotent
+from core.exports import EXPORT_CHUNK_SIZE, get_export_format, stream_export
+from core.fast_serializers import FastReadListMixin
+from django_filters.rest_framework import DjangoFilterBackend
+from .filters import OrderFilterSet
+from .pagination import OrderCursorPagination
 
 
+def get_user_orders(user):
+    """
+    Orders the user takes part in, either as customer or as business user.
+    """
+    return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+
+
+def get_user_archived_orders(user):
+    """
+    Archived orders (see orders_app/archive.py) the user takes part in.
+    """
+    return ArchivedOrder.objects.filter(Q(customer_user=user) | Q(business_user=user))
+
 
-class OrderListCreateView(generics.ListCreateAPIView):
+def include_history(request):
+    """
+    True if `?history=true` asks for archived orders as well.
+    """
+    return request.query_params.get('history', '').lower() in ('1', 'true', 'yes')
+
+
+def filter_orders(request, queryset):
+    """
+    Apply OrderFilterSet (status, offer_type, created_after / created_before
+    and role) to `queryset`, as on GET /api/orders/.
+
+    Raises:
+        ValidationError: for an invalid filter value.
+    """
+    filterset = OrderFilterSet(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filterset.qs
+
+
+def get_business_counts_or_error(business_user_id, statuses=counters.STATUSES):
+    """
+    Return (counts, None) for a business user, or (None, 404 response) if
+    the user is not a business user. A missing user raises Http404, with
+    the same message get_object_or_404 gives.
+    """
+    user_type, counts = counters.get_business_counts(business_user_id, statuses)
+    if user_type is None:
+        raise Http404('No UserProfile matches the given query.')
+    if user_type != 'business':
+        return None, Response({'detail': 'User is not a business user'}, status=status.HTTP_404_NOT_FOUND)
+    return counts, None
+
+
+class OrderListCreateView(FastReadListMixin, generics.ListCreateAPIView):
     """
     List and create orders.
 
     GET:
-        Returns a list of orders where the current user is either the customer
-        or the business user. Supports ordering by "created_at" (default: newest first).
+        Returns the orders where the current user is either the customer
+        or the business user, cursor-paginated on (created_at, id):
+        newest first by default, oldest first with `?ordering=created_at`.
+        Follow `next` / `previous` for more pages; `page_size` (max 100) and
+        `include_count=true` are accepted, as are sparse fieldsets via
+        `?fields=` / `?omit=`.
+
+        Filters (see OrderFilterSet): `status`, `offer_type`,
+        `created_after`, `created_before` and `role=customer|business`.
+        An invalid value returns 400 Bad Request.
+
+        Each page is one UNION ALL of two index-backed branches (orders as
+        customer, orders as business user) merged in created_at order, so a
+        page costs the same whatever the number of orders.
+
+        Archived orders (see orders_app/archive.py) are left out unless
+        `?history=true` is passed. Then the two matching ArchivedOrder
+        branches join the same UNION ALL, with the same filters and item
+        shape.
 
         Response: 200 OK
-            [
+            {
+              "next": "<url>" | null,
+              "previous": "<url>" | null,
+              "results": [
               {
                 "id": ...,
                 "customer_user": ...,
@@ -35,7 +115,8 @@ class OrderListCreateView(generics.ListCreateAPIView):
                 "updated_at": "..."
               },
               ...
-            ]
+              ]
+            }
 
     POST:
         Creates a new order based on a single OfferDetail.
@@ -48,24 +129,84 @@ class OrderListCreateView(generics.ListCreateAPIView):
         Rules:
             - Only users with type "customer" can create an order.
             - The order will copy snapshot fields from the OfferDetail.
+            - Optional `Idempotency-Key` header: a retry with the same key
+              replays the first response (header `Idempotent-Replayed: true`)
+              instead of creating a second order; the same key with a
+              different body returns 422.
 
         Responses:
             201 Created: returns the created order (same shape as GET items)
             400 Bad Request: invalid data
             403 Forbidden: user is not a customer
+            422 Unprocessable Entity: Idempotency-Key reused for another body
     """
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = OrderFilterSet
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = OrderCursorPagination
+    fast_read_serializer_class = OrderFastSerializer
+    # The cursor is read from the rows.
+    fast_read_extra_columns = ('created_at',)
 
     def get_queryset(self):
         """
         Return only orders that belong to the current user, either as customer
         or as business user. This prevents users from seeing other users' orders.
         """
-        self = self.request.user
-        return Order.objects.filter(Q(customer_user=self) | Q(business_user=self))
+        queryset = get_user_orders(self.request.user)
+        # With ?fields= / ?omit= only the requested columns are loaded
+        # (e.g. the `features` JSON is skipped).
+        columns = OrderSerializer.get_requested_columns(self.request)
+        if columns is not None:
+            queryset = queryset.only(*columns, 'created_at')
+        return queryset
+
+    def get_keyset_branches(self, queryset):
+        """
+        Split the customer-OR-business queryset into two disjoint branches,
+        each served by its own (user, created_at, id) index; the paginator
+        reads them as one UNION ALL. With `?role=` only that side is read,
+        and with `?history=true` the archive is split the same way.
+        """
+        branches = self.split_by_role(queryset)
+        if self.include_history():
+            branches += self.split_by_role(self.get_history_queryset(queryset))
+        return branches
+
+    def split_by_role(self, queryset):
+        user = self.request.user
+        role = self.request.query_params.get('role')
+        if role == 'customer':
+            return [queryset.filter(customer_user=user)]
+        if role == 'business':
+            return [queryset.filter(business_user=user)]
+        return [
+            queryset.filter(customer_user=user),
+            queryset.filter(business_user=user).exclude(customer_user=user),
+        ]
+
+    def include_history(self):
+        return include_history(self.request)
+
+    def get_history_queryset(self, queryset):
+        """
+        The user's archived orders with the request's filters, loading the
+        same columns, in the same order, as `queryset` (model rows or
+        `.values()` rows on the fast read path), so both can be UNIONed.
+        """
+        archived = get_user_archived_orders(self.request.user)
+        fast = self.get_fast_read_serializer()
+        if fast is not None:
+            archived = archived.values(*fast.columns)
+        else:
+            columns = OrderSerializer.get_requested_columns(self.request)
+            if columns is not None:
+                archived = archived.only(*columns, 'created_at')
+            else:
+                archived = archived.defer('archived_at')
+        return OrderFilterSet(self.request.query_params, queryset=archived, request=self.request).qs
     
     def get_serializer_class(self):
         """
@@ -73,6 +214,7 @@ class OrderListCreateView(generics.ListCreateAPIView):
         """
         return OrderCreateSerializer if self.request.method == 'POST' else OrderSerializer
     
+    @idempotent('orders.create')
     def create(self, request, *args, **kwargs):
         """
         Create a new order from the given OfferDetail id.
@@ -80,6 +222,9 @@ class OrderListCreateView(generics.ListCreateAPIView):
         Permissions:
             - The current user must be authenticated and have type "customer".
 
+        Retries sending the same `Idempotency-Key` header replay the first
+        response instead of creating another order (see core/idempotency.py).
+
         Returns:
             201 Created with the created order on success.
             403 Forbidden if the user is not a customer.
@@ -98,6 +243,143 @@ class OrderListCreateView(generics.ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
+class OrderExportView(APIView):
+    """
+    Stream the current user's orders as NDJSON or CSV.
+
+    GET /api/orders/export/:
+        Query parameters:
+            file_format: "ndjson" (default) or "csv".
+            history: "true" to include archived orders, as for
+                GET /api/orders/.
+            status, offer_type, created_after, created_before, role: the
+                filters of GET /api/orders/ (see OrderFilterSet).
+
+        Behavior:
+            - Same scope as GET /api/orders/: orders where the current user is
+              the customer or the business user, narrowed to one side with
+              `?role=customer|business`. Archived orders (see
+              orders_app/archive.py) are left out unless `?history=true`
+              is passed; then live and archived rows are read as one
+              UNION ALL in the same order.
+            - Rows are read with `.values().iterator(chunk_size=...)` in
+              newest-first order and written as they are read, so memory use
+              stays flat whatever the number of orders.
+            - Columns are the fields of OrderSerializer; in CSV the features
+              list is JSON-encoded.
+
+        Responses:
+            200 OK: streamed file (Content-Disposition: attachment)
+            400 Bad Request: unsupported file_format or invalid filter
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        export_format = get_export_format(request)
+        columns = list(OrderSerializer.Meta.fields)
+        rows = filter_orders(request, get_user_orders(request.user)).values(*columns)
+        if include_history(request):
+            archived = filter_orders(request, get_user_archived_orders(request.user)).values(*columns)
+            rows = rows.union(archived, all=True)
+        rows = rows.order_by('-created_at', '-id')
+        return stream_export(rows.iterator(chunk_size=EXPORT_CHUNK_SIZE), columns, export_format, 'orders')
+
+
+class OrderChangesView(APIView):
+    """
+    Delta sync for the orders list: the current user's order changes after
+    a cursor (see orders_app/changes.py).
+
+    GET /api/orders/changes/?since=<cursor>:
+        Query parameters:
+            since: cursor from a previous response. Without it, only the
+                current cursor is returned: load /api/orders/ first, then
+                poll from that cursor.
+            limit: most changes read per call (default 100, at most 500).
+
+        Behavior:
+            - Reads the changes of orders where the user is the customer or
+              the business user, oldest first, over the (user, sequence)
+              indexes of the change log; the cost grows with the number of
+              changes, not with the number of orders.
+            - Several changes of one order in the same response are merged
+              into the latest one. Created / updated entries carry the
+              current order (same shape as GET /api/orders/ items), or null
+              if the order is gone; deleted / archived entries carry null.
+            - `has_more` is true when more changes are waiting: call again
+              with the returned cursor.
+
+        Response: 200 OK
+            {
+              "cursor": "<cursor>",
+              "has_more": false,
+              "results": [
+                {"seq": <int>, "id": <order id>, "action": "created" | "updated" | "deleted" | "archived",
+                 "order": {...} | null},
+                ...
+              ]
+            }
+
+        Responses:
+            400 Bad Request: malformed since or limit
+            410 Gone: changes after this cursor were pruned; reload
+                /api/orders/ and continue from the returned cursor
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 100
+    max_limit = 500
+
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get('since')
+        limit = self.get_limit(request)
+        oldest, newest = changes.get_bounds()
+        if since is None:
+            return Response({'cursor': str(newest or 0), 'has_more': False, 'results': []}, status=status.HTTP_200_OK)
+        try:
+            since = int(since)
+        except ValueError:
+            since = -1
+        if since < 0:
+            raise ValidationError({'since': 'Must be a cursor returned by this endpoint.'})
+        if not changes.is_complete(since, oldest):
+            return Response(
+                {'detail': 'Changes after this cursor were pruned; reload /api/orders/.', 'cursor': str(newest)},
+                status=status.HTTP_410_GONE,
+            )
+
+        rows = changes.read(request.user, since, limit)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        latest = {}
+        for seq, order_id, action in rows:
+            latest.pop(order_id, None)
+            latest[order_id] = (seq, action)
+        live_ids = [order_id for order_id, (_, action) in latest.items() if action in ('created', 'updated')]
+        orders = {order.pk: order for order in Order.objects.filter(pk__in=live_ids)}
+        results = [
+            {
+                'seq': seq,
+                'id': order_id,
+                'action': action,
+                'order': OrderSerializer(orders[order_id], context={'request': request}).data
+                if order_id in orders and action in ('created', 'updated') else None,
+            }
+            for order_id, (seq, action) in latest.items()
+        ]
+        cursor = rows[-1][0] if rows else max(since, 0)
+        return Response({'cursor': str(cursor), 'has_more': has_more, 'results': results}, status=status.HTTP_200_OK)
+
+    def get_limit(self, request):
+        limit = request.query_params.get('limit', self.default_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({'limit': f'Must be an integer between 1 and {self.max_limit}.'})
+        return limit
+
+
 class OrderPatchView(generics.RetrieveAPIView):
     """
     Update (patch) or delete a single order.
@@ -176,6 +458,106 @@ class OrderPatchView(generics.RetrieveAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 
+class OrderBulkStatusView(APIView):
+    """
+    Change the status of many orders at once.
+
+    PATCH /api/orders/bulk-status/:
+        Body:
+            { "ids": [<int>, ...], "status": "<new_status_value>" }
+
+        Permissions:
+            - The current user must be authenticated and of type "business".
+            - Only orders whose business user is the current user are
+              changed, as for PATCH /api/orders/<id>/; other ids are
+              reported as "forbidden".
+
+        Behavior:
+            - Reads the requested orders once, then moves the permitted ones
+              with one UPDATE per current status (at most two), in one
+              transaction. Each UPDATE repeats the status it moves from, so
+              the status counters (see orders_app/counters.py) move by
+              exactly the rows changed, even under concurrent updates. An
+              order whose status changed between the read and the UPDATE
+              (on databases without row locks) is not written and is
+              reported as "unchanged".
+            - The changed orders are logged to the change feed in the same
+              transaction (see orders_app/changes.py).
+            - Orders already in the target status are left untouched.
+            - At most 500 ids per request.
+
+        Response: 200 OK
+            {
+              "status": "<new_status_value>",
+              "updated": <int>,
+              "results": [
+                {"id": 1, "result": "updated"},
+                {"id": 2, "result": "unchanged"},
+                {"id": 3, "result": "forbidden"},
+                {"id": 4, "result": "not_found"}
+              ]
+            }
+
+        Responses:
+            400 Bad Request: invalid body
+            403 Forbidden: not a business user
+    """
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, *args, **kwargs):
+        user = request.user
+        if user.type != 'business':
+            return Response({"error": "You are not a business user"}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data['ids']
+        new_status = serializer.validated_data['status']
+
+        results = {}
+        updated = 0
+        with transaction.atomic():
+            by_status = {}
+            customers = {}
+            for order_id, customer_user_id, business_user_id, order_status in Order.objects.select_for_update().filter(
+                pk__in=ids,
+            ).values_list('id', 'customer_user_id', 'business_user_id', 'status'):
+                customers[order_id] = customer_user_id
+                if business_user_id != user.id:
+                    results[order_id] = 'forbidden'
+                elif order_status == new_status:
+                    results[order_id] = 'unchanged'
+                else:
+                    by_status.setdefault(order_status, []).append(order_id)
+            now = timezone.now()
+            moved_ids = []
+            for old_status, order_ids in by_status.items():
+                changed = Order.objects.filter(pk__in=order_ids, business_user=user, status=old_status).update(
+                    status=new_status, updated_at=now,
+                )
+                # Orders that changed status after the read were not
+                # written: they keep the result "unchanged".
+                results.update(dict.fromkeys(order_ids, 'unchanged'))
+                if changed < len(order_ids):
+                    # Only the rows this UPDATE wrote carry its timestamp.
+                    order_ids = list(Order.objects.filter(
+                        pk__in=order_ids, status=new_status, updated_at=now,
+                    ).values_list('id', flat=True))
+                counters.add(user.id, old_status, -changed)
+                updated += changed
+                moved_ids += order_ids
+            counters.add(user.id, new_status, updated)
+            results.update(dict.fromkeys(moved_ids, 'updated'))
+            changes.record_many([(order_id, customers[order_id], user.id) for order_id in moved_ids], 'updated')
+
+        return Response({
+            'status': new_status,
+            'updated': updated,
+            'results': [{'id': order_id, 'result': results.get(order_id, 'not_found')} for order_id in ids],
+        }, status=status.HTTP_200_OK)
+
+
 class OrderCountView(APIView):
     """
     Count in-progress orders for a given business user id.
@@ -186,7 +568,8 @@ class OrderCountView(APIView):
 
         Behavior:
             - Checks that the referenced user exists and has type "business".
-            - Counts orders with status='in_progress' for that business user.
+            - Reads the in_progress counter of that business user (see
+              orders_app/counters.py); user check and counter are one query.
 
         Responses:
             200 OK: { "order_count": <int> }
@@ -203,13 +586,10 @@ class OrderCountView(APIView):
         if business_user_id is None:
             return Response({'detail': 'Missing business user id'}, status=status.HTTP_400_BAD_REQUEST)
 
-        business_user = get_object_or_404(UserProfile, id=business_user_id)
-
-        if getattr(business_user, 'type', None) != 'business':
-            return Response({'detail': 'User is not a business user'}, status=status.HTTP_404_NOT_FOUND)
-        
-        count = Order.objects.filter(business_user=business_user, status='in_progress').count()
-        return Response({'order_count': count}, status=status.HTTP_200_OK)
+        counts, error = get_business_counts_or_error(business_user_id, ['in_progress'])
+        if error is not None:
+            return error
+        return Response({'order_count': counts['in_progress']}, status=status.HTTP_200_OK)
     
 
 class OrderCountCompletedView(APIView):
@@ -222,7 +602,8 @@ class OrderCountCompletedView(APIView):
 
         Behavior:
             - Checks that the referenced user exists and has type "business".
-            - Counts orders with status='completed' for that business user.
+            - Reads the completed counter of that business user (see
+              orders_app/counters.py); user check and counter are one query.
 
         Responses:
             200 OK: { "completed_order_count": <int> }
@@ -239,10 +620,102 @@ class OrderCountCompletedView(APIView):
         if business_user_id is None:
             return Response({'detail': 'Missing business user id'}, status=status.HTTP_400_BAD_REQUEST)
 
-        business_user = get_object_or_404(UserProfile, id=business_user_id)
+        counts, error = get_business_counts_or_error(business_user_id, ['completed'])
+        if error is not None:
+            return error
+        return Response({'completed_order_count': counts['completed']}, status=status.HTTP_200_OK)
 
-        if getattr(business_user, 'type', None) != 'business':
-            return Response({'detail': 'User is not a business user'}, status=status.HTTP_404_NOT_FOUND)
-        
-        count = Order.objects.filter(business_user=business_user, status='completed').count()
-        return Response({'completed_order_count': count}, status=status.HTTP_200_OK)
\ No newline at end of file
+
+class OrderStatusCountsView(APIView):
+    """
+    All order counts of a business user, by status.
+
+    GET /api/order-status-counts/<int:business_user_id>/:
+        Behavior:
+            - Checks that the referenced user exists and has type "business".
+            - Reads every status counter of that business user in the same
+              query (see orders_app/counters.py).
+
+        Responses:
+            200 OK:
+                {
+                  "business_user": <int>,
+                  "in_progress": <int>,
+                  "completed": <int>,
+                  "cancelled": <int>
+                }
+            404 Not Found: user is not a business user or does not exist
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, business_user_id, *args, **kwargs):
+        counts, error = get_business_counts_or_error(business_user_id)
+        if error is not None:
+            return error
+        return Response({'business_user': business_user_id, **counts}, status=status.HTTP_200_OK)
+
+
+class OrderCountsView(APIView):
+    """
+    In-progress and completed order counts of many business users at once,
+    for listing pages that show one card per business.
+
+    GET /api/order-counts/?business_user_ids=1,2,3:
+        Query parameters:
+            business_user_ids: comma-separated user ids (at most 100;
+                duplicates are ignored; each between 1 and 2**63 - 1).
+
+        Behavior:
+            - Reads the user types and the status counters of every id in
+              one query (see orders_app/counters.py).
+            - Unknown and non-business ids are reported in their own entry
+              and do not fail the request.
+            - Results keep the order of the requested ids.
+
+        Response: 200 OK
+            {
+              "results": [
+                {"business_user": 1, "order_count": <int>, "completed_order_count": <int>},
+                {"business_user": 2, "detail": "User is not a business user"},
+                {"business_user": 3, "detail": "Not found."}
+              ]
+            }
+
+        Responses:
+            400 Bad Request: missing, malformed, out of range or too many ids
+    """
+    permission_classes = [IsAuthenticated]
+    max_ids = 100
+    # Largest id the database can compare against (signed 64-bit).
+    max_id_value = 2 ** 63 - 1
+
+    def get(self, request, *args, **kwargs):
+        ids = self.get_business_user_ids(request)
+        found = counters.get_many_business_counts(ids, ['in_progress', 'completed'])
+        results = []
+        for business_user_id in ids:
+            user_type, counts = found.get(business_user_id, (None, None))
+            if user_type is None:
+                results.append({'business_user': business_user_id, 'detail': 'Not found.'})
+            elif user_type != 'business':
+                results.append({'business_user': business_user_id, 'detail': 'User is not a business user'})
+            else:
+                results.append({
+                    'business_user': business_user_id,
+                    'order_count': counts['in_progress'],
+                    'completed_order_count': counts['completed'],
+                })
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    def get_business_user_ids(self, request):
+        raw = request.query_params.get('business_user_ids', '')
+        try:
+            ids = [int(value) for value in raw.split(',') if value.strip()]
+        except ValueError:
+            raise ValidationError({'business_user_ids': 'Must be a comma-separated list of integers.'})
+        if any(not 1 <= business_user_id <= self.max_id_value for business_user_id in ids):
+            raise ValidationError({'business_user_ids': f'Ids must be between 1 and {self.max_id_value}.'})
+        ids = list(dict.fromkeys(ids))
+        if not 1 <= len(ids) <= self.max_ids:
+            raise ValidationError({'business_user_ids': f'Must list between 1 and {self.max_ids} ids.'})
+        return ids
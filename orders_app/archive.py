@@ -0,0 +1,92 @@
+"""
+Hot/cold archival of finished orders.
+
+Completed and cancelled orders whose last update is older than
+ORDERS_ARCHIVE_AFTER_DAYS are moved from `Order` to `ArchivedOrder` in
+batches. Each batch is one short transaction:
+
+    1. pick up to `batch_size` candidate ids over the (status, updated_at)
+       index (a read, outside the transaction);
+    2. INSERT INTO archived ... SELECT ... FROM orders for those ids;
+    3. log an "archived" entry per order to the change feed (see
+       orders_app/changes.py) and DELETE them from the orders table.
+
+Steps 2 and 3 repeat the status and age conditions, so an order changed
+between 1 and 2 stays where it is, and the write lock is held for one
+batch only. The DELETE is plain SQL: moving an order must not send
+post_delete, because archived orders still count in OrderStatusCounter.
+
+Settings:
+    ORDERS_ARCHIVE_AFTER_DAYS (int, default 90): age, by updated_at, after
+        which finished orders are archived.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from orders_app.models import ArchivedOrder, Order, OrderChange
+
+FINISHED_STATUSES = ('completed', 'cancelled')
+
+
+def get_archive_after_days():
+    return getattr(settings, 'ORDERS_ARCHIVE_AFTER_DAYS', 90)
+
+
+def archive_orders(older_than_days=None, batch_size=1000, pause=0.0, max_batches=None):
+    """
+    Move finished orders older than `older_than_days` (default
+    ORDERS_ARCHIVE_AFTER_DAYS) into ArchivedOrder, `batch_size` at a time,
+    sleeping `pause` seconds between batches so other writers get the lock.
+
+    Yields:
+        int: number of orders moved by each batch.
+    """
+    if older_than_days is None:
+        older_than_days = get_archive_after_days()
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    candidates = Order.objects.filter(status__in=FINISHED_STATUSES, updated_at__lt=cutoff)
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(candidates.order_by().values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        moved = move_orders(ids, cutoff)
+        batches += 1
+        yield moved
+        if pause:
+            time.sleep(pause)
+
+
+def move_orders(ids, cutoff):
+    """
+    Move the finished orders among `ids` last updated before `cutoff` in
+    one transaction; return how many were moved.
+    """
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in Order._meta.concrete_fields)
+    id_placeholders = ', '.join(['%s'] * len(ids))
+    condition = (
+        f"{quote('id')} IN ({id_placeholders}) AND {quote('status')} IN (%s, %s) AND {quote('updated_at')} < %s"
+    )
+    params = [*ids, *FINISHED_STATUSES, connection.ops.adapt_datetimefield_value(cutoff)]
+    archived_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(ArchivedOrder._meta.db_table)} ({columns}, {quote("archived_at")}) '
+            f'SELECT {columns}, %s FROM {quote(Order._meta.db_table)} WHERE {condition}',
+            [archived_at, *params],
+        )
+        cursor.execute(
+            f'INSERT INTO {quote(OrderChange._meta.db_table)} '
+            f'({quote("order_id")}, {quote("customer_user_id")}, {quote("business_user_id")}, {quote("action")}, '
+            f'{quote("created_at")}) '
+            f'SELECT {quote("id")}, {quote("customer_user_id")}, {quote("business_user_id")}, %s, %s '
+            f'FROM {quote(Order._meta.db_table)} WHERE {condition} ORDER BY {quote("id")}',
+            ['archived', archived_at, *params],
+        )
+        cursor.execute(f'DELETE FROM {quote(Order._meta.db_table)} WHERE {condition}', params)
+        return cursor.rowcount
@@ -0,0 +1,106 @@
+"""
+Change feed for orders (delta sync).
+
+Every order create, update, delete and archive appends an `OrderChange`
+row in the same transaction as the change itself:
+
+    - saves and deletes of Order (and deletes of ArchivedOrder) through the
+      signals in orders_app/signals.py;
+    - PATCH /api/orders/bulk-status/ (queryset update, no signals) through
+      `record_many()`;
+    - `archive_orders` through an INSERT ... SELECT next to its own
+      (see orders_app/archive.py).
+
+GET /api/orders/changes/?since=<cursor> returns the caller's changes with a
+sequence number above the cursor, read over the (user, id) indexes, so a
+poll costs one index range per side whatever the number of orders. SQLite
+serializes writers, so sequence numbers are handed out in commit order and
+a cursor never skips a change.
+
+Pruning:
+    Rows older than ORDERS_CHANGE_LOG_MAX_AGE_DAYS are deleted by
+    `prune_order_changes`; the newest row is always kept, so the oldest
+    retained sequence number tells whether a cursor is still complete.
+    Older cursors get 410 Gone and the client reloads /api/orders/.
+
+Settings:
+    ORDERS_CHANGE_LOG_MAX_AGE_DAYS (int, default 7): days changes are kept.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from orders_app.models import OrderChange
+
+
+def get_max_age_days():
+    return getattr(settings, 'ORDERS_CHANGE_LOG_MAX_AGE_DAYS', 7)
+
+
+def record(order, action):
+    OrderChange.objects.create(
+        order_id=order.pk,
+        customer_user_id=order.customer_user_id,
+        business_user_id=order.business_user_id,
+        action=action,
+    )
+
+
+def record_many(rows, action):
+    """
+    Log `action` for every (order id, customer user id, business user id)
+    in `rows` with one INSERT.
+    """
+    OrderChange.objects.bulk_create([
+        OrderChange(order_id=order_id, customer_user_id=customer_id, business_user_id=business_id, action=action)
+        for order_id, customer_id, business_id in rows
+    ])
+
+
+def get_bounds():
+    """
+    Return (oldest, newest) retained sequence numbers, (None, None) if the
+    log is empty.
+    """
+    bounds = OrderChange.objects.aggregate(oldest=Min('id'), newest=Max('id'))
+    return bounds['oldest'], bounds['newest']
+
+
+def is_complete(since, oldest):
+    """
+    True if no change after `since` has been pruned.
+    """
+    return oldest is None or since >= oldest - 1
+
+
+def read(user, since, limit):
+    """
+    Return up to `limit` + 1 changes of `user` (as customer or business
+    user) with a sequence number above `since`, oldest first, as
+    (id, order_id, action) tuples.
+    """
+    return list(
+        OrderChange.objects.filter(Q(customer_user_id=user.pk) | Q(business_user_id=user.pk), id__gt=since)
+        .order_by('id')
+        .values_list('id', 'order_id', 'action')[:limit + 1]
+    )
+
+
+def prune(max_age_days=None):
+    """
+    Delete changes older than `max_age_days` (default
+    ORDERS_CHANGE_LOG_MAX_AGE_DAYS), keeping the newest row.
+
+    Returns:
+        int: number of rows deleted.
+    """
+    if max_age_days is None:
+        max_age_days = get_max_age_days()
+    _, newest = get_bounds()
+    if newest is None:
+        return 0
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    deleted, _ = OrderChange.objects.filter(created_at__lt=cutoff, id__lt=newest).delete()
+    return deleted
@@ -0,0 +1,122 @@
+"""
+Per-business order counts by status.
+
+`OrderStatusCounter` holds one row per (business user, status). The count
+endpoints read these rows through the unique (business_user, status) index
+instead of running COUNT(*) over the orders table.
+
+Counters move by `F('count') + delta` in a single UPDATE, so concurrent
+orders never lose an increment. The first order of a status inserts the row.
+If two requests race on that insert, the loser falls back to the UPDATE.
+
+Freshness:
+    - Order creates and deletes (including cascades) move the counters
+      through the signals in orders_app/signals.py.
+    - Status changes through the API (OrderStatusUpdateSerializer and
+      PATCH /api/orders/bulk-status/) are conditional UPDATEs that repeat
+      the status they move from, and move the counters by the rows they
+      matched, so concurrent or repeated requests count a change once.
+    - Other `Order.save()` calls (admin, shell) move the counters through
+      the post_save signal, against the status the order was loaded with
+      (`Order.from_db`); such saves are not conditional, so racing them
+      with API changes can drift the counters until the next rebuild.
+    - Queryset `.update()` / `bulk_create()` send no signals. Code using
+      them must call `add()` itself.
+    - Archived orders (orders_app/archive.py) keep being counted: the move
+      sends no signals and deleting an archived order decrements.
+    - `rebuild_order_status_counters` recomputes every counter from the
+      live and archived orders.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from orders_app.models import ArchivedOrder, Order, OrderStatusCounter
+from userprofile_app.models import UserProfile
+
+STATUSES = [status for status, _ in Order.STATUS_CHOICES]
+
+
+def add(business_user_id, status, delta):
+    """
+    Add `delta` (may be negative) to the counter of (business_user_id, status).
+    """
+    if not delta:
+        return
+    counters = OrderStatusCounter.objects.filter(business_user_id=business_user_id, status=status)
+    if counters.update(count=F('count') + delta) or delta < 0:
+        # A missing row is never created by a decrement: the business user
+        # may be in the middle of a cascading delete.
+        return
+    try:
+        with transaction.atomic():
+            OrderStatusCounter.objects.create(business_user_id=business_user_id, status=status, count=delta)
+    except IntegrityError:
+        counters.update(count=F('count') + delta)
+
+
+def move(business_user_id, old_status, new_status):
+    """
+    Move one order of `business_user_id` from `old_status` to `new_status`.
+    """
+    if old_status == new_status:
+        return
+    add(business_user_id, old_status, -1)
+    add(business_user_id, new_status, 1)
+
+
+def get_business_counts(business_user_id, statuses=STATUSES):
+    """
+    Return (user type, {status: count}) for the given statuses in one
+    query, or (None, None) if the user does not exist.
+    """
+    return get_many_business_counts([business_user_id], statuses).get(business_user_id, (None, None))
+
+
+def get_many_business_counts(business_user_ids, statuses=STATUSES):
+    """
+    Return {user id: (user type, {status: count})} for the existing users
+    among `business_user_ids`, in one query.
+
+    The user types and every counter are read together: each counter is a
+    scalar subquery on the unique (business_user, status) index, so the
+    cost is one index lookup per (user, status).
+    """
+    annotations = {
+        f'count_{status}': Coalesce(
+            Subquery(
+                OrderStatusCounter.objects.filter(business_user=OuterRef('pk'), status=status).values('count')[:1]
+            ),
+            Value(0),
+            output_field=IntegerField(),
+        )
+        for status in statuses
+    }
+    rows = UserProfile.objects.filter(pk__in=business_user_ids).annotate(**annotations).values(
+        'pk', 'type', *annotations,
+    )
+    return {
+        row['pk']: (row['type'], {status: row[f'count_{status}'] for status in statuses})
+        for row in rows
+    }
+
+
+def rebuild():
+    """
+    Recompute every counter from the live and archived orders.
+
+    Returns:
+        int: number of counter rows written.
+    """
+    totals = {}
+    for model in (Order, ArchivedOrder):
+        for row in model.objects.order_by().values('business_user_id', 'status').annotate(count=Count('id')):
+            key = (row['business_user_id'], row['status'])
+            totals[key] = totals.get(key, 0) + row['count']
+    with transaction.atomic():
+        OrderStatusCounter.objects.all().delete()
+        counters = OrderStatusCounter.objects.bulk_create([
+            OrderStatusCounter(business_user_id=business_user_id, status=status, count=count)
+            for (business_user_id, status), count in totals.items()
+        ], batch_size=5000)
+    return len(counters)
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from orders_app import archive
+
+
+class Command(BaseCommand):
+    """
+    Move finished orders into the ArchivedOrder table.
+
+    Usage:
+        python manage.py archive_orders [--older-than-days 90] [--batch-size 1000] [--pause 0.05]
+
+    Behavior:
+        - Moves completed and cancelled orders not updated for
+          `--older-than-days` days (default ORDERS_ARCHIVE_AFTER_DAYS) in
+          batches of `--batch-size`, one short transaction per batch, and
+          sleeps `--pause` seconds between batches (see orders_app/archive.py).
+        - Order status counters and count endpoints are unaffected; archived
+          orders stay readable with GET /api/orders/?history=true.
+        - Safe to interrupt and rerun.
+    """
+    help = 'Archive finished orders older than ORDERS_ARCHIVE_AFTER_DAYS in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.05)
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        total = batches = 0
+        for moved in archive.archive_orders(
+            older_than_days=options['older_than_days'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            max_batches=options['max_batches'],
+        ):
+            total += moved
+            batches += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Batch {batches}: {moved} orders.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {total} orders in {batches} batches ({time.perf_counter() - start:.1f} s).'
+        ))
@@ -0,0 +1,91 @@
+import itertools
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from orders_app.api.views import OrderListCreateView
+from orders_app.management.seed import seed_orders
+
+
+class Command(BaseCommand):
+    """
+    Check that every combination of the GET /api/orders/ filters is served
+    by an index.
+
+    Usage:
+        python manage.py benchmark_order_filters [--orders 200000] [--repeat 5]
+
+    Behavior:
+        - Seeds `--orders` orders (see orders_app/management/seed.py) inside a
+          transaction that is rolled back at the end.
+        - Requests the first page of the hub user's orders through
+          OrderListCreateView for every combination of status, offer_type,
+          created_after, created_before and role, captures the page query
+          and prints its EXPLAIN QUERY PLAN and median time.
+        - Fails if any plan scans the orders table without an index.
+    """
+    help = 'EXPLAIN QUERY PLAN and timings for every combination of the order list filters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200000)
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark seeds timestamps with SQLite SQL; run it on SQLite.')
+
+        with transaction.atomic():
+            hub = seed_orders(options['orders'], options['users'])
+            now = timezone.now()
+            values = {
+                'status': 'completed',
+                'offer_type': 'premium',
+                'created_after': (now - timezone.timedelta(days=180)).isoformat(),
+                'created_before': (now - timezone.timedelta(days=30)).isoformat(),
+            }
+            roles = [None, 'customer', 'business']
+            view = OrderListCreateView.as_view()
+            factory = APIRequestFactory()
+            scans = []
+            for size in range(len(values) + 1):
+                for names in itertools.combinations(values, size):
+                    for role in roles:
+                        params = {name: values[name] for name in names}
+                        if role:
+                            params['role'] = role
+                        label = '&'.join(name if name != 'role' else f'role={role}' for name in params) or '(no filter)'
+
+                        def fetch():
+                            request = factory.get('/api/orders/', params, HTTP_HOST='localhost')
+                            force_authenticate(request, user=hub)
+                            response = view(request)
+                            if response.status_code != 200:
+                                raise CommandError(f'{label}: HTTP {response.status_code} {response.data}')
+                            return response
+
+                        with CaptureQueriesContext(connection) as queries:
+                            fetch()
+                        sql = [query['sql'] for query in queries.captured_queries if 'LIMIT' in query['sql']][-1]
+                        with connection.cursor() as cursor:
+                            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                            plan = [row[-1] for row in cursor.fetchall()]
+                        timings = []
+                        for _ in range(options['repeat']):
+                            start = time.perf_counter()
+                            fetch()
+                            timings.append((time.perf_counter() - start) * 1000)
+                        self.stdout.write(f'{label:<60} {statistics.median(timings):8.2f} ms')
+                        for line in plan:
+                            self.stdout.write(f'    {line}')
+                        if any(line.startswith('SCAN orders_app_order') for line in plan):
+                            scans.append(label)
+            transaction.set_rollback(True)
+
+        if scans:
+            raise CommandError(f'Full table scans: {", ".join(scans)}')
+        self.stdout.write(self.style.SUCCESS('Every filter combination is an index search.'))
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from orders_app.api.pagination import OrderCursorPagination
+from orders_app.management.seed import seed_orders
+from orders_app.models import Order
+
+
+class Command(BaseCommand):
+    """
+    Compare the ways of reading one page of GET /api/orders/ for a user with
+    many orders on both sides.
+
+    Usage:
+        python manage.py benchmark_order_list [--orders 500000] [--repeat 7]
+
+    Behavior:
+        - Seeds offers and `--orders` orders spread over random customers and
+          business users, plus a hub user who is the customer of about one
+          order in ten and the business user of another one in ten, with
+          created_at spread over one year, inside a transaction that is rolled back at the end.
+        - For the first page and a page deep into the hub user's orders, runs
+          the former unpaginated list, the single `customer OR business`
+          query with LIMIT and the UNION ALL page of OrderCursorPagination.
+        - Prints EXPLAIN QUERY PLAN of the UNION ALL page and the median time
+          of each query.
+    """
+    help = 'EXPLAIN QUERY PLAN and timings of the order list: OR query vs. UNION ALL keyset page.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=500000)
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=7)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark seeds timestamps with SQLite SQL; run it on SQLite.')
+
+        with transaction.atomic():
+            hub = seed_orders(options['orders'], options['users'])
+            orders = Order.objects.filter(Q(customer_user=hub) | Q(business_user=hub))
+            pivot = orders.order_by('-created_at', '-id').values('created_at', 'id')[orders.count() // 2]
+
+            paginator = OrderCursorPagination()
+            paginator.key = 'created_at'
+            page_size = paginator.page_size + 1
+            branches = [
+                Order.objects.filter(customer_user=hub),
+                Order.objects.filter(business_user=hub).exclude(customer_user=hub),
+            ]
+            order_by = paginator.get_order_by(True)
+            position = paginator.get_position_filter(True, pivot['created_at'], pivot['id'])
+
+            def union(position=None):
+                parts = [branch.filter(position) if position is not None else branch for branch in branches]
+                return parts[0].union(parts[1], all=True).order_by(*order_by)[:page_size]
+
+            cases = {
+                'full list (previous behavior)': orders.order_by('-created_at'),
+                'OR query, first page': orders.order_by(*order_by)[:page_size],
+                'UNION ALL, first page': union(),
+                'OR query, middle page': orders.filter(position).order_by(*order_by)[:page_size],
+                'UNION ALL, middle page': union(position),
+            }
+            self.stdout.write(f"Hub user: {orders.count()} orders of {options['orders']}.")
+            for line in union(position).explain().splitlines():
+                self.stdout.write(f'    {line}')
+            for label, query in cases.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    list(query.all())
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(f'{label:<32} {statistics.median(timings):9.3f} ms')
+            transaction.set_rollback(True)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from orders_app import changes
+
+
+class Command(BaseCommand):
+    """
+    Delete order change feed entries older than ORDERS_CHANGE_LOG_MAX_AGE_DAYS.
+
+    Usage:
+        python manage.py prune_order_changes [--max-age-days 7]
+
+    Behavior:
+        - One DELETE over the created_at index; the newest entry is kept.
+        - Clients polling with a cursor older than the oldest kept entry
+          get 410 Gone and reload the orders list. Run it from cron.
+    """
+    help = 'Delete old entries of the order change feed (see orders_app/changes.py).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-days', type=int, default=None)
+
+    def handle(self, *args, **options):
+        count = changes.prune(options['max_age_days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} order changes.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from orders_app import counters
+
+
+class Command(BaseCommand):
+    """
+    Recompute the per-business order status counters from the live and
+    archived orders.
+
+    Usage:
+        python manage.py rebuild_order_status_counters
+
+    Behavior:
+        - Replaces every OrderStatusCounter row in one transaction with a
+          GROUP BY (business_user, status) count of the live and archived
+          orders.
+        - Needed only after orders were changed without signals
+          (queryset `.update()`, raw SQL, `bulk_create`).
+    """
+    help = 'Recompute the order status counters behind the order count endpoints.'
+
+    def handle(self, *args, **options):
+        count = counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} order status counters.'))
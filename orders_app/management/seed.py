@@ -0,0 +1,56 @@
+import random
+
+from django.db import connection
+from offers_app.management.seed import seed_offers
+from offers_app.models import OfferDetail
+from orders_app.models import Order
+from userprofile_app.models import UserProfile
+
+
+def seed_orders(order_count, user_count, seed=7, batch_size=5000):
+    """
+    Bulk-insert synthetic offers, customers and orders for the benchmark
+    commands.
+
+    Orders go to random (customer, business user) pairs, except that a hub
+    user is the customer of one order in ten and the business user of
+    another one in ten. Statuses and offer types are mixed and created_at
+    is spread over the last year (with SQLite SQL, since the field is
+    auto_now_add). Runs ANALYZE afterwards.
+
+    Returns:
+        UserProfile: the hub user.
+    """
+    rng = random.Random(seed)
+    users, _ = seed_offers(3000, user_count // 2, seed=seed)
+    users += UserProfile.objects.bulk_create([
+        UserProfile(username=f'bench-customer-{i}', email=f'bench-customer-{i}@example.com')
+        for i in range(user_count - len(users))
+    ])
+    hub = users[0]
+    details = list(OfferDetail.objects.all())
+    statuses = [status for status, _ in Order.STATUS_CHOICES]
+    batch = []
+    for i in range(order_count):
+        customer, business = rng.sample(users, 2)
+        if i % 10 == 0:
+            customer = hub
+        elif i % 10 == 1:
+            business = hub
+        detail = rng.choice(details)
+        batch.append(Order(
+            customer_user=customer, business_user=business, offer_detail=detail, title=detail.title,
+            revisions=detail.revisions, delivery_time_in_days=detail.delivery_time_in_days,
+            price=detail.price, features=detail.features, offer_type=detail.offer_type,
+            status=rng.choices(statuses, weights=[2, 7, 1])[0],
+        ))
+        if len(batch) == batch_size:
+            Order.objects.bulk_create(batch)
+            batch = []
+    Order.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE orders_app_order SET created_at = datetime('now', '-' || abs(random() % 31536000) || ' seconds')"
+        )
+        cursor.execute('ANALYZE')
+    return hub
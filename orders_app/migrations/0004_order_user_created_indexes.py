@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0011_offer_feature_index'),
+        ('orders_app', '0003_alter_order_offer_detail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'created_at', 'id'], name='order_customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'created_at', 'id'], name='order_business_created_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0011_offer_feature_index'),
+        ('orders_app', '0004_order_user_created_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'status', 'created_at', 'id'], name='order_business_status_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_orders(apps, schema_editor):
+    Order = apps.get_model('orders_app', 'Order')
+    OrderStatusCounter = apps.get_model('orders_app', 'OrderStatusCounter')
+    rows = Order.objects.order_by().values('business_user_id', 'status').annotate(count=Count('id'))
+    OrderStatusCounter.objects.bulk_create([
+        OrderStatusCounter(business_user_id=row['business_user_id'], status=row['status'], count=row['count'])
+        for row in rows
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0005_order_business_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_status_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('business_user', 'status'), name='orderstatuscounter_user_status_uniq')],
+            },
+        ),
+        migrations.RunPython(count_existing_orders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0011_offer_feature_index'),
+        ('orders_app', '0006_order_status_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(default='', max_length=255)),
+                ('revisions', models.PositiveIntegerField(default=1)),
+                ('delivery_time_in_days', models.PositiveIntegerField(default=1)),
+                ('price', models.IntegerField(default=0)),
+                ('features', models.JSONField(blank=True, default=list)),
+                ('offer_type', models.CharField(choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')], default='basic', max_length=50)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='business_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_business', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='customer_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_customer', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='offer_detail',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to='offers_app.offerdetail'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['customer_user', 'created_at', 'id'], name='archivedorder_customer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['business_user', 'created_at', 'id'], name='archivedorder_business_idx'),
+        ),
+    ]
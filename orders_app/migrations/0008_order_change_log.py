@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0007_archived_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_id', models.BigIntegerField()),
+                ('customer_user_id', models.BigIntegerField()),
+                ('business_user_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted'), ('archived', 'Archived')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['customer_user_id', 'id'], name='orderchange_customer_idx'), models.Index(fields=['business_user_id', 'id'], name='orderchange_business_idx')],
+            },
+        ),
+    ]
@@ -21,6 +21,14 @@ class Order(models.Model):
         status (str): Current status of the order.
         created_at (datetime): When the order was created.
         updated_at (datetime): When the order was last updated.
+
+    Indexes:
+        (customer_user, created_at, id) and (business_user, created_at, id)
+        each serve one branch of the "my orders" list, read newest-first
+        and keyset-paginated (see OrderListCreateView).
+        (business_user, status, created_at, id) serves the same business
+        branch filtered by `?status=`, and the per-status order counts.
+        (status, updated_at) finds finished orders due for archiving.
     """
     
     STATUS_CHOICES = [
@@ -45,5 +53,137 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at', 'id'], name='order_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at', 'id'], name='order_business_created_idx'),
+            models.Index(
+                fields=['business_user', 'status', 'created_at', 'id'], name='order_business_status_idx',
+            ),
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as loaded, so a save can tell which counter to move
+        # (see orders_app/counters.py).
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedOrder(models.Model):
+    """
+    A finished (completed or cancelled) order moved out of Order by
+    `archive_orders` (see orders_app/archive.py).
+
+    Same fields, in the same order, and same on_delete rules as Order, plus
+    `archived_at`. The primary key is the original order id, so ids stay
+    stable and archived rows can be read in one UNION with live orders
+    (GET /api/orders/?history=true).
+
+    Archived orders still count in OrderStatusCounter: moving an order
+    leaves the counters untouched, and deleting an archived order
+    decrements them (see orders_app/signals.py).
+
+    Indexes:
+        (customer_user, created_at, id) and (business_user, created_at, id),
+        as on Order, serve the history branches of the orders list.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name='archived_orders_as_customer',
+    )
+    business_user = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name='archived_orders_as_business',
+    )
+    offer_detail = models.ForeignKey(OfferDetail, on_delete=models.CASCADE, related_name='archived_orders')
+    title = models.CharField(max_length=255, default="")
+    revisions = models.PositiveIntegerField(default=1)
+    delivery_time_in_days = models.PositiveIntegerField(default=1)
+    price = models.IntegerField(default=0)
+    features = models.JSONField(default=list, blank=True)
+    offer_type = models.CharField(max_length=50, choices=OfferDetail.OFFER_TYPE, default='basic')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at', 'id'], name='archivedorder_customer_idx'),
+            models.Index(fields=['business_user', 'created_at', 'id'], name='archivedorder_business_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class OrderStatusCounter(models.Model):
+    """
+    Number of orders per (business user, status), kept current by
+    orders_app/counters.py so the order count endpoints read one row
+    instead of counting orders.
+
+    Fields:
+        business_user (FK UserProfile): The business user receiving the orders.
+        status (str): One of Order.STATUS_CHOICES.
+        count (int): Orders of this business user currently in this status.
+    """
+    business_user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='order_status_counters')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['business_user', 'status'], name='orderstatuscounter_user_status_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.business_user_id} {self.status}: {self.count}'
+
+
+class OrderChange(models.Model):
+    """
+    Append-only log of order changes behind GET /api/orders/changes/ (see
+    orders_app/changes.py).
+
+    Fields:
+        id (int): Sequence number; only ever increases (AUTOINCREMENT on
+            SQLite, so pruned numbers are never reused).
+        order_id (int): The changed order. Not a foreign key: the log
+            outlives deleted orders.
+        customer_user_id / business_user_id (int): Parties of the order,
+            to read one user's changes.
+        action (str): created / updated / deleted / archived.
+        created_at (datetime): When the change was logged; rows older than
+            ORDERS_CHANGE_LOG_MAX_AGE_DAYS are pruned.
+
+    Indexes:
+        (customer_user_id, id) and (business_user_id, id) serve "this
+        user's changes after sequence N"; created_at serves pruning.
+    """
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+        ('archived', 'Archived'),
+    ]
+
+    order_id = models.BigIntegerField()
+    customer_user_id = models.BigIntegerField()
+    business_user_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['customer_user_id', 'id'], name='orderchange_customer_idx'),
+            models.Index(fields=['business_user_id', 'id'], name='orderchange_business_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f'#{self.pk} {self.action} order {self.order_id}'
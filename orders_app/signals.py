@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from orders_app import changes, counters
+from orders_app.models import ArchivedOrder, Order
+
+
+@receiver(post_save, sender=Order)
+def update_status_counters_on_save(sender, instance, created, **kwargs):
+    """
+    Count a new order, or move a saved one to its new status counter.
+    """
+    if created:
+        counters.add(instance.business_user_id, instance.status, 1)
+    else:
+        loaded_status = getattr(instance, '_loaded_status', None)
+        if loaded_status is not None:
+            counters.move(instance.business_user_id, loaded_status, instance.status)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=ArchivedOrder)
+def update_status_counters_on_delete(sender, instance, **kwargs):
+    """
+    Uncount a deleted order, live or archived, including orders deleted by
+    a cascade. (Archiving itself deletes with plain SQL and sends nothing.)
+    """
+    counters.add(instance.business_user_id, instance.status, -1)
+
+
+@receiver(post_save, sender=Order)
+def log_order_change_on_save(sender, instance, created, **kwargs):
+    """
+    Append a created / updated entry to the order change feed.
+    """
+    changes.record(instance, 'created' if created else 'updated')
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=ArchivedOrder)
+def log_order_change_on_delete(sender, instance, **kwargs):
+    """
+    Append a deleted entry to the order change feed.
+    """
+    changes.record(instance, 'deleted')
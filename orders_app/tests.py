@@ -1,3 +1,622 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import IdempotencyKey
+from offers_app.models import Offer, OfferDetail
+from orders_app import changes, counters
+from orders_app.archive import archive_orders
+from orders_app.api.serializers import OrderStatusUpdateSerializer
+from orders_app.models import ArchivedOrder, Order, OrderChange, OrderStatusCounter
+from userprofile_app.models import UserProfile
+
+
+class OrderTestCase(TestCase):
+    """
+    A business user with one offer (one detail per type), a customer, and
+    an authenticated API client for each.
+    """
+
+    def setUp(self):
+        self.business = UserProfile.objects.create_user('business', 'business@example.com', 'pw', type='business')
+        self.customer = UserProfile.objects.create_user('customer', 'customer@example.com', 'pw', type='customer')
+        self.business_client = self.client_for(self.business)
+        self.customer_client = self.client_for(self.customer)
+        offer = Offer.objects.create(user=self.business, title='Logo design')
+        self.details = [
+            OfferDetail.objects.create(
+                offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=100,
+                features=['Logo'], offer_type=offer_type,
+            )
+            for offer_type, _ in OfferDetail.OFFER_TYPE
+        ]
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def create_order(self, client=None):
+        response = (client or self.customer_client).post(
+            '/api/orders/', {'offer_detail_id': self.details[0].id}, format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def counts(self, business=None):
+        return dict(
+            OrderStatusCounter.objects.filter(business_user=business or self.business).values_list('status', 'count')
+        )
+
+    def table_counts(self, business=None):
+        counts = {}
+        for order_status in Order.objects.filter(business_user=business or self.business).values_list(
+            'status', flat=True,
+        ):
+            counts[order_status] = counts.get(order_status, 0) + 1
+        return counts
+
+    def assertCountersMatchTable(self, business=None):
+        counters = {key: value for key, value in self.counts(business).items() if value}
+        self.assertEqual(counters, self.table_counts(business))
+
+
+class OrderStatusCounterTests(OrderTestCase):
+
+    def test_status_change_moves_counter(self):
+        order_id = self.create_order()
+        response = self.business_client.patch(f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'completed')
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 1})
+
+    def test_double_submit_from_same_loaded_status_counts_once(self):
+        for _ in range(5):
+            self.create_order()
+        order_id = Order.objects.order_by('id').values_list('id', flat=True).first()
+        first, second = Order.objects.get(pk=order_id), Order.objects.get(pk=order_id)
+        for order in (first, second):
+            serializer = OrderStatusUpdateSerializer(order, data={'status': 'completed'}, partial=True)
+            self.assertTrue(serializer.is_valid())
+            serializer.save()
+        self.assertEqual(self.counts(), {'in_progress': 4, 'completed': 1})
+        self.assertCountersMatchTable()
+
+    def test_stale_instance_moves_from_current_status(self):
+        order_id = self.create_order()
+        stale = Order.objects.get(pk=order_id)
+        self.business_client.patch(f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+        serializer = OrderStatusUpdateSerializer(stale, data={'status': 'cancelled'}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(Order.objects.get(pk=order_id).status, 'cancelled')
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 0, 'cancelled': 1})
+
+
+class OrderBulkStatusTests(OrderTestCase):
+
+    def bulk(self, ids, new_status, client=None):
+        return (client or self.business_client).patch(
+            '/api/orders/bulk-status/', {'ids': ids, 'status': new_status}, format='json',
+        )
+
+    def test_reports_each_id(self):
+        mine = [self.create_order() for _ in range(3)]
+        self.business_client.patch(f'/api/orders/{mine[2]}/', {'status': 'completed'}, format='json')
+        other_business = UserProfile.objects.create_user('other', 'other@example.com', 'pw', type='business')
+        response = self.bulk(mine + [10 ** 9], 'completed', self.client_for(other_business))
+        self.assertEqual({row['result'] for row in response.json()['results'][:3]}, {'forbidden'})
+
+        response = self.bulk(mine + [mine[0], 10 ** 9], 'completed')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], 2)
+        self.assertEqual(
+            [(row['id'], row['result']) for row in response.json()['results']],
+            [(mine[0], 'updated'), (mine[1], 'updated'), (mine[2], 'unchanged'), (10 ** 9, 'not_found')],
+        )
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 3})
+        self.assertCountersMatchTable()
+
+    def test_only_rows_written_are_reported_and_logged(self):
+        moved_away, moved = self.create_order(), self.create_order()
+        real_now = timezone.now
+
+        def now_after_concurrent_change():
+            # Runs between the read and the UPDATE.
+            Order.objects.filter(pk=moved_away).update(status='cancelled')
+            return real_now()
+
+        with mock.patch('orders_app.api.views.timezone.now', now_after_concurrent_change):
+            response = self.bulk([moved_away, moved], 'completed')
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(
+            [row['result'] for row in response.json()['results']], ['unchanged', 'updated'],
+        )
+        self.assertEqual(
+            list(OrderChange.objects.filter(action='updated').values_list('order_id', flat=True)), [moved],
+        )
+
+    def test_rejects_out_of_range_ids(self):
+        for ids in ([2 ** 70], [0], [-1]):
+            self.assertEqual(self.bulk(ids, 'completed').status_code, 400, ids)
+
+    def test_requires_business_user(self):
+        self.assertEqual(self.bulk([1], 'completed', self.customer_client).status_code, 403)
+
+
+class OrderCountsTests(OrderTestCase):
+
+    def test_counts_per_id(self):
+        self.create_order()
+        response = self.customer_client.get(
+            f'/api/order-counts/?business_user_ids={self.business.id},{self.customer.id},{10 ** 9}',
+        )
+        self.assertEqual(response.json()['results'], [
+            {'business_user': self.business.id, 'order_count': 1, 'completed_order_count': 0},
+            {'business_user': self.customer.id, 'detail': 'User is not a business user'},
+            {'business_user': 10 ** 9, 'detail': 'Not found.'},
+        ])
+
+    def test_rejects_malformed_and_out_of_range_ids(self):
+        for raw in ('', 'x', '0', '-1', '99999999999999999999999', ','.join(map(str, range(1, 102)))):
+            response = self.customer_client.get(f'/api/order-counts/?business_user_ids={raw}')
+            self.assertEqual(response.status_code, 400, raw)
+
+
+class OrderArchiveTests(OrderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.order_ids = [self.create_order() for _ in range(4)]
+        self.business_client.patch(
+            '/api/orders/bulk-status/', {'ids': self.order_ids[:3], 'status': 'completed'}, format='json',
+        )
+        Order.objects.filter(pk__in=self.order_ids[:2] + self.order_ids[3:]).update(
+            updated_at=timezone.now() - timedelta(days=200),
+        )
+
+    def archive(self):
+        return sum(archive_orders(older_than_days=90, batch_size=1))
+
+    def test_moves_only_old_finished_orders(self):
+        self.assertEqual(self.archive(), 2)
+        self.assertEqual(sorted(ArchivedOrder.objects.values_list('id', flat=True)), self.order_ids[:2])
+        self.assertEqual(sorted(Order.objects.values_list('id', flat=True)), self.order_ids[2:])
+        self.assertEqual(self.archive(), 0)
+
+    def test_counters_keep_archived_orders(self):
+        before = self.counts()
+        self.archive()
+        self.assertEqual(self.counts(), before)
+        counters.rebuild()
+        self.assertEqual(self.counts(), before)
+        ArchivedOrder.objects.get(pk=self.order_ids[0]).delete()
+        self.assertEqual(self.counts()['completed'], before['completed'] - 1)
+
+    def test_cascading_user_delete_leaves_no_counters(self):
+        self.archive()
+        self.business.delete()
+        self.assertFalse(OrderStatusCounter.objects.exists())
+        self.assertFalse(ArchivedOrder.objects.exists())
+
+    def test_list_and_export_include_archive_on_request(self):
+        self.archive()
+        response = self.customer_client.get('/api/orders/')
+        self.assertEqual({row['id'] for row in response.json()['results']}, set(self.order_ids[2:]))
+        response = self.customer_client.get('/api/orders/?history=true')
+        self.assertEqual([row['id'] for row in response.json()['results']], self.order_ids[::-1])
+
+        def exported(query):
+            response = self.customer_client.get('/api/orders/export/' + query)
+            lines = b''.join(response.streaming_content).decode().splitlines()
+            return [json.loads(line)['id'] for line in lines]
+
+        self.assertEqual(exported(''), self.order_ids[:1:-1])
+        self.assertEqual(exported('?history=true'), self.order_ids[::-1])
+        response = self.customer_client.get('/api/orders/export/?history=true&file_format=csv')
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 5)
+
+
+class OrderListPaginationTests(OrderTestCase):
+    """
+    Cursor round-trips over the UNION ALL of the customer and business
+    branches (and the archive branches with `?history=true`), with
+    repeated created_at values so ties are broken by id.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # The business user also buys from another business.
+        seller = UserProfile.objects.create_user('seller', 'seller@example.com', 'pw', type='business')
+        offer = Offer.objects.create(user=seller, title='Web Shop')
+        detail = OfferDetail.objects.create(
+            offer=offer, title='basic', revisions=1, delivery_time_in_days=3, price=50, features=[],
+            offer_type='basic',
+        )
+        base = timezone.now() - timedelta(days=300)
+        for number in range(23):
+            customer, business, offer_detail = (
+                (self.business, seller, detail) if number % 3 == 0 else (self.customer, self.business, self.details[0])
+            )
+            order = Order.objects.create(
+                customer_user=customer, business_user=business, offer_detail=offer_detail,
+                status='completed' if number % 2 else 'in_progress',
+            )
+            Order.objects.filter(pk=order.pk).update(
+                created_at=base + timedelta(hours=number // 2), updated_at=base + timedelta(hours=number // 2),
+            )
+        sum(archive_orders(older_than_days=90))
+        self.assertTrue(ArchivedOrder.objects.exists())
+
+    def expected(self, descending, history=False, role=None):
+        rows = []
+        for model in (Order, ArchivedOrder) if history else (Order,):
+            queryset = model.objects.all()
+            if role != 'business':
+                rows += queryset.filter(customer_user=self.business).values_list('created_at', 'id')
+            if role != 'customer':
+                rows += queryset.filter(business_user=self.business).exclude(
+                    customer_user=self.business,
+                ).values_list('created_at', 'id')
+        return [order_id for _, order_id in sorted(rows, reverse=descending)]
+
+    def walk(self, url, link):
+        ids, pages = [], 0
+        while url:
+            response = self.business_client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            page = [row['id'] for row in response.json()['results']]
+            ids = ids + page if link == 'next' else page + ids
+            url = response.json()[link]
+            pages += 1
+            self.assertLess(pages, 30)
+        return ids, response.json()
+
+    def assertRoundTrip(self, query, expected):
+        forward, last_page = self.walk(f'/api/orders/?page_size=4&{query}', 'next')
+        self.assertEqual(forward, expected, query)
+        if last_page['previous'] is None:
+            self.assertLessEqual(len(expected), 4, query)
+            return
+        backward, _ = self.walk(last_page['previous'], 'previous')
+        self.assertEqual(backward + [row['id'] for row in last_page['results']], expected, query)
+
+    def assertAllRoundTrips(self):
+        for ordering, descending in (('-created_at', True), ('created_at', False)):
+            for history in (False, True):
+                for role in (None, 'customer', 'business'):
+                    query = f'ordering={ordering}&history={str(history).lower()}'
+                    if role:
+                        query += f'&role={role}'
+                    self.assertRoundTrip(query, self.expected(descending, history, role))
+
+    def test_round_trips(self):
+        self.assertAllRoundTrips()
+
+    @override_settings(FAST_READ_SERIALIZERS=True)
+    def test_round_trips_on_fast_read_path(self):
+        self.assertAllRoundTrips()
+
+    @override_settings(FAST_READ_SERIALIZERS=True)
+    def test_sparse_fields_with_history(self):
+        response = self.business_client.get('/api/orders/?history=true&fields=id,status&page_size=100')
+        self.assertEqual(len(response.json()['results']), len(self.expected(True, history=True)))
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'status'})
+
+
+class OrderFilterTests(OrderTestCase):
+    """
+    OrderFilterSet against the same filters written out in Python, alone
+    and combined with `role`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        seller = UserProfile.objects.create_user('seller', 'seller@example.com', 'pw', type='business')
+        offer = Offer.objects.create(user=seller, title='Web Shop')
+        seller_detail = OfferDetail.objects.create(
+            offer=offer, title='premium', revisions=1, delivery_time_in_days=3, price=50, features=[],
+            offer_type='premium',
+        )
+        self.base = timezone.now().replace(microsecond=0) - timedelta(days=30)
+        statuses = ['in_progress', 'completed', 'cancelled']
+        for number in range(18):
+            customer, business, detail = (
+                (self.business, seller, seller_detail) if number % 4 == 0
+                else (self.customer, self.business, self.details[number % 3])
+            )
+            order = Order.objects.create(
+                customer_user=customer, business_user=business, offer_detail=detail, title=detail.title,
+                offer_type=detail.offer_type, status=statuses[number % 3],
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=self.base + timedelta(days=number))
+
+    def listed(self, params):
+        response = self.business_client.get('/api/orders/', {**params, 'page_size': 100})
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(row['id'] for row in response.json()['results'])
+
+    def expected(self, params):
+        orders = []
+        for order in Order.objects.all():
+            if params.get('role') != 'business' and order.customer_user_id == self.business.pk:
+                orders.append(order)
+            elif params.get('role') != 'customer' and order.business_user_id == self.business.pk:
+                orders.append(order)
+        if 'status' in params:
+            orders = [order for order in orders if order.status == params['status']]
+        if 'offer_type' in params:
+            orders = [order for order in orders if order.offer_type == params['offer_type']]
+        if 'created_after' in params:
+            orders = [order for order in orders if order.created_at >= params['created_after']]
+        if 'created_before' in params:
+            orders = [order for order in orders if order.created_at <= params['created_before']]
+        return sorted(order.pk for order in orders)
+
+    def test_filters_alone_and_combined_with_role(self):
+        filter_sets = [
+            {}, {'status': 'completed'}, {'offer_type': 'premium'},
+            {'created_after': self.base + timedelta(days=5)}, {'created_before': self.base + timedelta(days=11)},
+            {'status': 'in_progress', 'offer_type': 'basic', 'created_after': self.base + timedelta(days=2)},
+        ]
+        for filters in filter_sets:
+            for role in (None, 'customer', 'business'):
+                params = dict(filters, role=role) if role else dict(filters)
+                query = {
+                    key: value.isoformat() if hasattr(value, 'isoformat') else value for key, value in params.items()
+                }
+                self.assertEqual(self.listed(query), self.expected(params), params)
+        self.assertTrue(self.expected({'role': 'customer'}))
+        self.assertTrue(self.expected({'role': 'business', 'status': 'cancelled'}))
+
+    def exported(self, params):
+        response = self.business_client.get('/api/orders/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(json.loads(line)['id'] for line in b''.join(response.streaming_content).decode().splitlines())
+
+    def test_export_is_scoped_by_role_and_filters(self):
+        filter_sets = [{}, {'status': 'cancelled'}, {'offer_type': 'premium', 'created_before': '2100-01-01'}]
+        for filters in filter_sets:
+            for role in (None, 'customer', 'business'):
+                params = dict(filters, role=role) if role else dict(filters)
+                self.assertEqual(self.exported(params), self.listed(params), params)
+        self.assertEqual(self.exported({'role': 'customer'}), self.expected({'role': 'customer'}))
+        self.assertNotEqual(self.exported({'role': 'customer'}), self.exported({'role': 'business'}))
+
+    def test_export_with_history_applies_the_filters_to_the_archive(self):
+        Order.objects.filter(status__in=['completed', 'cancelled']).update(
+            updated_at=timezone.now() - timedelta(days=200),
+        )
+        sum(archive_orders(older_than_days=90))
+        self.assertTrue(ArchivedOrder.objects.filter(customer_user=self.business).exists())
+        for params in ({'role': 'customer'}, {'role': 'business', 'status': 'completed'}, {'offer_type': 'basic'}):
+            params = dict(params, history='true')
+            self.assertEqual(self.exported(params), self.listed(params), params)
+            self.assertTrue(self.exported(params), params)
+
+    def test_date_only_bounds_start_at_midnight(self):
+        day = (self.base + timedelta(days=4)).date()
+        midnight = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        self.assertEqual(self.listed({'created_after': day.isoformat()}), self.expected({'created_after': midnight}))
+
+    def test_invalid_values_are_rejected(self):
+        for params in (
+            {'status': 'done'}, {'offer_type': 'gold'}, {'role': 'admin'}, {'created_after': 'yesterday'},
+            {'created_before': '2024-13-01'},
+        ):
+            for url in ('/api/orders/', '/api/orders/export/'):
+                response = self.business_client.get(url, params)
+                self.assertEqual(response.status_code, 400, (url, params))
+                self.assertEqual(list(response.json()), list(params))
+
+
+class OrderExportTests(OrderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.order_ids = [self.create_order() for _ in range(3)]
+        self.outsider = UserProfile.objects.create_user('outsider', 'outsider@example.com', 'pw', type='customer')
+
+    def exported(self, client, query=''):
+        response = client.get('/api/orders/export/' + query)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        if 'file_format=csv' in query:
+            return list(csv.DictReader(io.StringIO(content)))
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_customer_and_business_see_their_orders(self):
+        newest_first = self.order_ids[::-1]
+        for client in (self.customer_client, self.business_client):
+            self.assertEqual([row['id'] for row in self.exported(client)], newest_first)
+        self.assertEqual(self.exported(self.client_for(self.outsider)), [])
+
+    def test_csv_columns_match_the_list(self):
+        rows = self.exported(self.customer_client, '?file_format=csv')
+        listed = self.customer_client.get('/api/orders/').json()['results']
+        self.assertEqual(list(rows[0]), list(listed[0]))
+        self.assertEqual([int(row['id']) for row in rows], [row['id'] for row in listed])
+        self.assertEqual(rows[0]['features'], '["Logo"]')
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/orders/export/').status_code, 401)
+
+
+class OrderFastReadTests(OrderTestCase):
+
+    def test_list_is_byte_identical(self):
+        for _ in range(3):
+            self.create_order()
+        for query in ('', '?ordering=created_at', '?page_size=2', '?fields=id,features,status', '?role=business'):
+            for client in (self.customer_client, self.business_client):
+                with self.settings(FAST_READ_SERIALIZERS=False):
+                    expected = client.get(f'/api/orders/{query}')
+                with self.settings(FAST_READ_SERIALIZERS=True):
+                    fast = client.get(f'/api/orders/{query}')
+                self.assertEqual(expected.status_code, 200)
+                self.assertEqual(fast.content, expected.content, query)
+
+
+class OrderCounterLifecycleTests(OrderTestCase):
+
+    def test_create_counts_order(self):
+        self.create_order()
+        self.create_order()
+        self.assertEqual(self.counts(), {'in_progress': 2})
+        response = self.customer_client.get(f'/api/order-status-counts/{self.business.id}/')
+        self.assertEqual(response.json(), {
+            'business_user': self.business.id, 'in_progress': 2, 'completed': 0, 'cancelled': 0,
+        })
+
+    def test_delete_uncounts_order(self):
+        order_id = self.create_order()
+        self.create_order()
+        admin = UserProfile.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.assertEqual(self.client_for(admin).delete(f'/api/orders/{order_id}/').status_code, 204)
+        self.assertEqual(self.counts(), {'in_progress': 1})
+
+    def test_cascading_customer_delete_uncounts_orders(self):
+        self.create_order()
+        other = UserProfile.objects.create_user('other', 'other@example.com', 'pw', type='customer')
+        self.create_order(self.client_for(other))
+        self.customer.delete()
+        self.assertEqual(self.counts(), {'in_progress': 1})
+        self.assertCountersMatchTable()
+
+    def test_rebuild_matches_signals(self):
+        order_ids = [self.create_order() for _ in range(3)]
+        self.business_client.patch(f'/api/orders/{order_ids[0]}/', {'status': 'cancelled'}, format='json')
+        before = self.counts()
+        counters.rebuild()
+        self.assertEqual({key: value for key, value in before.items() if value}, self.counts())
+
+
+class OrderIdempotencyTests(OrderTestCase):
+
+    def post(self, key, detail=None):
+        return self.customer_client.post(
+            '/api/orders/', {'offer_detail_id': (detail or self.details[0]).id}, format='json',
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.post('retry-1')
+        second = self.post('retry-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertNotIn('Idempotent-Replayed', first)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(self.counts(), {'in_progress': 1})
+
+    def test_key_reused_with_another_body_is_rejected(self):
+        self.post('retry-2')
+        response = self.post('retry-2', self.details[1])
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        other = UserProfile.objects.create_user('other', 'other@example.com', 'pw', type='customer')
+        self.post('shared')
+        response = self.client_for(other).post(
+            '/api/orders/', {'offer_detail_id': self.details[0].id}, format='json', HTTP_IDEMPOTENCY_KEY='shared',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_expired_keys_are_pruned(self):
+        self.post('old')
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        call_command('prune_idempotency_keys', stdout=io.StringIO())
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post('old').status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class OrderChangeFeedTests(OrderTestCase):
+
+    def feed(self, since=None, client=None, **params):
+        query = '&'.join(f'{name}={value}' for name, value in params.items())
+        if since is not None:
+            query = f'since={since}&{query}'
+        return (client or self.customer_client).get(f'/api/orders/changes/?{query}')
+
+    def test_without_since_returns_current_cursor(self):
+        self.assertEqual(self.feed().json(), {'cursor': '0', 'has_more': False, 'results': []})
+        self.create_order()
+        cursor = self.feed().json()['cursor']
+        self.assertEqual(self.feed(cursor).json(), {'cursor': cursor, 'has_more': False, 'results': []})
+
+    def test_changes_since_cursor(self):
+        first = self.create_order()
+        cursor = self.feed().json()['cursor']
+        second = self.create_order()
+        self.business_client.patch(f'/api/orders/{first}/', {'status': 'completed'}, format='json')
+        self.business_client.patch(
+            '/api/orders/bulk-status/', {'ids': [first, second], 'status': 'cancelled'}, format='json',
+        )
+        body = self.feed(cursor).json()
+        # One entry per order, the latest change, in sequence order.
+        self.assertEqual(
+            [(row['id'], row['action']) for row in body['results']], [(first, 'updated'), (second, 'updated')],
+        )
+        self.assertEqual([row['order']['status'] for row in body['results']], ['cancelled', 'cancelled'])
+        self.assertEqual(body['cursor'], str(body['results'][-1]['seq']))
+        self.assertEqual(self.feed(body['cursor']).json()['results'], [])
+
+    def test_deleted_and_archived_orders(self):
+        deleted, archived = self.create_order(), self.create_order()
+        cursor = self.feed().json()['cursor']
+        admin = UserProfile.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client_for(admin).delete(f'/api/orders/{deleted}/')
+        self.business_client.patch(f'/api/orders/{archived}/', {'status': 'completed'}, format='json')
+        Order.objects.filter(pk=archived).update(updated_at=timezone.now() - timedelta(days=200))
+        sum(archive_orders(older_than_days=90))
+        results = self.feed(cursor).json()['results']
+        self.assertEqual([(row['id'], row['action'], row['order']) for row in results], [
+            (deleted, 'deleted', None), (archived, 'archived', None),
+        ])
+
+    def test_limit_and_has_more(self):
+        order_ids = [self.create_order() for _ in range(5)]
+        seen, cursor = [], 0
+        while True:
+            body = self.feed(cursor, limit=2).json()
+            self.assertLessEqual(len(body['results']), 2)
+            seen += [row['id'] for row in body['results']]
+            cursor = body['cursor']
+            if not body['has_more']:
+                break
+        self.assertEqual(seen, order_ids)
+
+    def test_only_own_orders(self):
+        self.create_order()
+        other = UserProfile.objects.create_user('other', 'other@example.com', 'pw', type='customer')
+        self.assertEqual(self.feed(0, self.client_for(other)).json()['results'], [])
+        self.assertEqual(len(self.feed(0, self.business_client).json()['results']), 1)
+
+    def test_invalid_parameters(self):
+        for params in ({'since': 'x'}, {'since': -1}, {'since': 0, 'limit': 0}, {'since': 0, 'limit': 501}):
+            self.assertEqual(self.feed(**params).status_code, 400, params)
+
+    def test_pruned_cursor_is_gone(self):
+        for _ in range(3):
+            self.create_order()
+        OrderChange.objects.update(created_at=timezone.now() - timedelta(days=30))
+        call_command('prune_order_changes', stdout=io.StringIO())
+        self.assertEqual(OrderChange.objects.count(), 1)
+        response = self.feed(0)
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json()['cursor'], str(OrderChange.objects.get().id))
+        self.assertEqual(self.feed(response.json()['cursor']).status_code, 200)
+        self.assertEqual(changes.prune(), 0)
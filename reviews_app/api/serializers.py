@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from core.fast_serializers import FastReadSerializer
+from core.serializers import SparseFieldsetMixin
 from reviews_app.models import Review
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Read/write serializer for the Review model.
 
@@ -22,8 +24,9 @@ class ReviewSerializer(serializers.ModelSerializer):
     Returned/accepted fields:
         All model fields are included via Meta.fields = "__all__".
         The actual field list depends on the Review model definition.
+        Responses support `?fields=` / `?omit=` (see SparseFieldsetMixin).
     """
-    reviewer = serializers.ReadOnlyField(source='reviewer.id')
+    reviewer = serializers.ReadOnlyField(source='reviewer_id')
     class Meta:
         model = Review
         fields = '__all__'
@@ -54,6 +57,13 @@ class ReviewSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class ReviewFastSerializer(FastReadSerializer):
+    """
+    Fast read path for ReviewSerializer (see core.fast_serializers).
+    """
+    serializer_class = ReviewSerializer
+
+
 class ReviewUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating an existing review.
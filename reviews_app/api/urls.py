@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import ReviewsList, ReviewDetail, BaseInformationView
+from .views import ReviewsList, ReviewDetail, ReviewExportView, BaseInformationView
 
 
 urlpatterns = [
     path('reviews/', ReviewsList.as_view(), name='reviews'),
+    path('reviews/export/', ReviewExportView.as_view(), name='reviews-export'),
     path('reviews/<int:id>/', ReviewDetail.as_view(), name='reviews-detail'),
     path('base-info/', BaseInformationView.as_view(), name='base-info'),
 ]
@@ -1,4 +1,4 @@
-from .serializers import ReviewSerializer, ReviewUpdateSerializer
+from .serializers import ReviewFastSerializer, ReviewSerializer, ReviewUpdateSerializer
 from reviews_app.models import Review
 from rest_framework import filters, generics
 from rest_framework.response import Response
@@ -8,11 +8,30 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Avg
 from userprofile_app.models import UserProfile
 from offers_app.models import Offer
+from core.exports import EXPORT_CHUNK_SIZE, get_export_format, stream_export
+from core.fast_serializers import FastReadListMixin
 
 
+def filter_reviews(queryset, query_params):
+    """
+    Optionally filter the reviews by:
+      - business_user_id (query param)
+      - reviewer_id (query param)
+    """
+    business_user_id = query_params.get('business_user_id')
+    if business_user_id:
+        queryset = queryset.filter(business_user_id=business_user_id)
+
+    reviewer_id = query_params.get('reviewer_id')
+    if reviewer_id:
+        queryset = queryset.filter(reviewer_id=reviewer_id)
+
+    return queryset
+
 
 
-class ReviewsList(generics.ListCreateAPIView):
+
+class ReviewsList(FastReadListMixin, generics.ListCreateAPIView):
     """
     List and create reviews.
 
@@ -22,6 +41,7 @@ class ReviewsList(generics.ListCreateAPIView):
 
             - business_user_id: only reviews for this business user
             - reviewer_id: only reviews written by this reviewer
+            - fields / omit: sparse fieldsets (only the needed columns are loaded)
 
         Response: 200 OK
             [
@@ -43,21 +63,16 @@ class ReviewsList(generics.ListCreateAPIView):
     serializer_class = ReviewSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     ordering_fields = ['created_at', 'rating', 'updated_at']
+    fast_read_serializer_class = ReviewFastSerializer
     def get_queryset(self):
         """
-        Optionally filter the reviews by:
-          - business_user_id (query param)
-          - reviewer_id (query param)
+        Reviews filtered by business_user_id / reviewer_id (see filter_reviews).
         """
-        queryset = Review.objects.all()
-
-        business_user_id = self.request.query_params.get('business_user_id')
-        if business_user_id:
-            queryset = queryset.filter(business_user_id=business_user_id)
+        queryset = filter_reviews(Review.objects.all(), self.request.query_params)
 
-        reviewer_id = self.request.query_params.get('reviewer_id')
-        if reviewer_id:
-            queryset = queryset.filter(reviewer_id=reviewer_id)
+        columns = ReviewSerializer.get_requested_columns(self.request)
+        if columns is not None:
+            queryset = queryset.only(*columns)
 
         return queryset
 
@@ -92,6 +107,34 @@ class ReviewsList(generics.ListCreateAPIView):
 
 
 
+class ReviewExportView(generics.GenericAPIView):
+    """
+    Stream reviews as NDJSON or CSV.
+
+    GET /api/reviews/export/:
+        Query parameters:
+            file_format: "ndjson" (default) or "csv".
+            business_user_id / reviewer_id: same filters as GET /api/reviews/.
+
+        Behavior:
+            - Same access rule as the review list (authenticated users).
+            - Rows are read with `.values().iterator(chunk_size=...)` in id
+              order and written as they are read, so memory use stays flat
+              whatever the number of reviews.
+
+        Responses:
+            200 OK: streamed file (Content-Disposition: attachment)
+            400 Bad Request: unsupported file_format
+    """
+    permission_classes = [IsAuthenticated]
+    columns = ['id', 'business_user', 'reviewer', 'description', 'rating', 'created_at', 'updated_at']
+
+    def get(self, request, *args, **kwargs):
+        export_format = get_export_format(request)
+        rows = filter_reviews(Review.objects.all(), request.query_params).order_by('id').values(*self.columns)
+        return stream_export(rows.iterator(chunk_size=EXPORT_CHUNK_SIZE), self.columns, export_format, 'reviews')
+
+
 class ReviewDetail(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a single review.
@@ -1,3 +1,100 @@
+import csv
+import io
+import json
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from reviews_app.models import Review
+from userprofile_app.models import UserProfile
+
+
+class ReviewTestCase(TestCase):
+    """
+    Two business users, two customers and one review per pair, plus an
+    authenticated client.
+    """
+
+    def setUp(self):
+        self.businesses = [
+            UserProfile.objects.create_user(f'business{number}', f'b{number}@example.com', 'pw', type='business')
+            for number in range(2)
+        ]
+        self.customers = [
+            UserProfile.objects.create_user(f'customer{number}', f'c{number}@example.com', 'pw', type='customer')
+            for number in range(2)
+        ]
+        self.reviews = [
+            Review.objects.create(
+                business_user=business, reviewer=customer, rating=rating, description=f'Review {rating}',
+            )
+            for rating, (business, customer) in enumerate(
+                ((business, customer) for business in self.businesses for customer in self.customers), start=1,
+            )
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.customers[0])
+
+    def get(self, url, status_code=200):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+
+class ReviewSparseFieldsetTests(ReviewTestCase):
+
+    def test_fields_and_omit(self):
+        for fast in (False, True):
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                rows = self.get('/api/reviews/?fields=id,rating&ordering=rating')
+                self.assertEqual(rows, [{'id': review.pk, 'rating': review.rating} for review in self.reviews])
+                rows = self.get(
+                    f'/api/reviews/?omit=description,created_at,updated_at&reviewer_id={self.customers[1].pk}',
+                )
+                self.assertEqual({tuple(sorted(row)) for row in rows}, {('business_user', 'id', 'rating', 'reviewer')})
+                self.assertEqual(len(rows), 2)
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.get('/api/reviews/?fields=id,secret', 400), {'fields': 'Unknown field(s): secret.'})
+
+
+class ReviewExportTests(ReviewTestCase):
+
+    def export(self, query=''):
+        response = self.client.get(f'/api/reviews/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_and_csv_rows(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [review.pk for review in self.reviews])
+        self.assertEqual(rows[0]['reviewer'], self.customers[0].pk)
+        self.assertEqual(rows[0]['description'], 'Review 1')
+        rows = list(csv.DictReader(io.StringIO(self.export('?file_format=csv'))))
+        self.assertEqual([row['rating'] for row in rows], ['1', '2', '3', '4'])
+
+    def test_scoped_by_business_user_and_reviewer(self):
+        business, customer = self.businesses[1], self.customers[0]
+        rows = [json.loads(line) for line in self.export(f'?business_user_id={business.pk}').splitlines()]
+        self.assertEqual({row['business_user'] for row in rows}, {business.pk})
+        self.assertEqual(len(rows), 2)
+        query = f'?business_user_id={business.pk}&reviewer_id={customer.pk}&file_format=csv'
+        rows = list(csv.DictReader(io.StringIO(self.export(query))))
+        self.assertEqual([row['id'] for row in rows], [str(self.reviews[2].pk)])
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/reviews/export/').status_code, 401)
+        self.assertEqual(self.client.get('/api/reviews/export/?file_format=pdf').status_code, 400)
+
+
+class ReviewFastReadTests(ReviewTestCase):
 
-# Create your tests here.
+    def test_list_is_byte_identical(self):
+        for query in ('', '?ordering=-rating', f'?business_user_id={self.businesses[0].pk}', '?fields=id,reviewer'):
+            with self.settings(FAST_READ_SERIALIZERS=False):
+                expected = self.client.get(f'/api/reviews/{query}')
+            with self.settings(FAST_READ_SERIALIZERS=True):
+                fast = self.client.get(f'/api/reviews/{query}')
+            self.assertEqual(expected.status_code, 200)
+            self.assertEqual(fast.content, expected.content, query)
@@ -1,7 +1,9 @@
 from rest_framework import serializers
+from core.fast_serializers import FastReadSerializer
+from core.serializers import SparseFieldsetMixin
 from ..models import UserProfile
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Full read serializer for a user profile with write-only inputs.
 
@@ -24,6 +26,7 @@ class ProfileSerializer(serializers.ModelSerializer):
           by replacing None with "" for client convenience.
         - With `read_only_fields = fields` every field is read-only. If you
           require writes, adjust `read_only_fields` accordingly.
+        - Supports `?fields=` / `?omit=` (see SparseFieldsetMixin).
     """
     user = serializers.IntegerField(source='id', read_only=True)
     username = serializers.CharField(read_only=True)
@@ -58,7 +61,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         """
         data = super().to_representation(instance)
         for space in ["first_name", "last_name", "location", "tel", "description", "working_hours"]:
-            if data.get(space) is None:
+            if space in data and data[space] is None:
                 data[space] = ""
         return data
 
@@ -108,7 +111,7 @@ class ProfilePatchSerializer(serializers.ModelSerializer):
         return instance
     
 
-class ProfileDetailsSerializer(serializers.ModelSerializer):
+class ProfileDetailsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Read-only details serializer for user profiles.
 
@@ -117,7 +120,8 @@ class ProfileDetailsSerializer(serializers.ModelSerializer):
 
     Exposed fields:
         Same field list as ProfileSerializer for consistency, but typically
-        used in GET endpoints only.
+        used in GET endpoints only. Supports `?fields=` / `?omit=` (see
+        SparseFieldsetMixin).
     """
     user = serializers.IntegerField(source='id', read_only=True)
     type = serializers.ChoiceField(choices=UserProfile.TYPE_CHOICES)
@@ -130,6 +134,8 @@ class ProfileDetailsSerializer(serializers.ModelSerializer):
             'email', 'created_at',
         ]
 
+    blank_none_fields = ["first_name", "last_name", "location", "tel", "description", "working_hours", "email"]
+
     def to_representation(self, instance):
         """
         Normalize None values to empty strings for selected optional fields.
@@ -137,7 +143,21 @@ class ProfileDetailsSerializer(serializers.ModelSerializer):
         This helps clients avoid extra null checks when rendering.
         """
         data = super().to_representation(instance)
-        for space in ["first_name", "last_name", "location", "tel", "description", "working_hours", "email"]:
-            if data.get(space) is None:
+        for space in self.blank_none_fields:
+            if space in data and data[space] is None:
+                data[space] = ""
+        return data
+
+
+class ProfileDetailsFastSerializer(FastReadSerializer):
+    """
+    Fast read path for ProfileDetailsSerializer (see core.fast_serializers),
+    including its None-to-"" normalization.
+    """
+    serializer_class = ProfileDetailsSerializer
+
+    def finalize(self, data):
+        for space in self.serializer_class.blank_none_fields:
+            if space in data and data[space] is None:
                 data[space] = ""
         return data
\ No newline at end of file
@@ -5,14 +5,39 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from userprofile_app.models import UserProfile
 
-from .serializers import ProfileSerializer, ProfilePatchSerializer, ProfileDetailsSerializer
+from core import fast_serializers
+from .serializers import ProfileSerializer, ProfilePatchSerializer, ProfileDetailsSerializer, ProfileDetailsFastSerializer
+
+
+def get_profile_queryset(request, serializer_class):
+    """
+    Profiles limited to the columns needed for `?fields=` / `?omit=`
+    (all columns when the request does not restrict the fields).
+    """
+    queryset = UserProfile.objects.all()
+    columns = serializer_class.get_requested_columns(request)
+    if columns is not None:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+def render_profile_list(request, queryset):
+    """
+    Serialize a profile list with ProfileDetailsSerializer, or with its
+    `.values()`-based fast path when FAST_READ_SERIALIZERS is on.
+    """
+    if fast_serializers.is_enabled():
+        fast = ProfileDetailsFastSerializer(request, fields=ProfileDetailsSerializer.get_requested_fields(request))
+        return fast.render(queryset.values(*fast.columns))
+    return ProfileDetailsSerializer(queryset, many=True, context={'request': request}).data
 
 class ProfileDetailView(APIView):
     """
     Retrieve or update a single user profile.
 
     GET /api/profiles/<pk>/:
-        Returns the profile data for the given primary key.
+        Returns the profile data for the given primary key. `?fields=` /
+        `?omit=` restrict the returned fields.
 
         Response: 200 OK
             {
@@ -47,7 +72,7 @@ class ProfileDetailView(APIView):
         Retrieve and return the profile identified by pk.
         """
         user = request.user
-        profile = get_object_or_404(UserProfile, pk=pk)
+        profile = get_object_or_404(get_profile_queryset(request, ProfileSerializer), pk=pk)
 
 
         return Response(ProfileSerializer(profile, context={'request': request}).data)
@@ -86,6 +111,7 @@ class BusinessView(APIView):
     GET /api/profiles/business/:
         Returns an array of business profiles. The endpoint requires
         authentication (IsAuthenticated).
+        `?fields=` / `?omit=` restrict the returned fields.
 
         Response: 200 OK
             [
@@ -95,9 +121,8 @@ class BusinessView(APIView):
     """
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        business = UserProfile.objects.filter(type='business').distinct()
-        serializer = ProfileDetailsSerializer(business, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        business = get_profile_queryset(request, ProfileDetailsSerializer).filter(type='business').distinct()
+        return Response(render_profile_list(request, business), status=status.HTTP_200_OK)
     
     def patch(self, request, pk):
         """
@@ -132,6 +157,7 @@ class CustomerView(APIView):
     GET /api/profiles/customers/:
         Returns an array of customer profiles. The endpoint requires
         authentication (IsAuthenticated).
+        `?fields=` / `?omit=` restrict the returned fields.
 
         Response: 200 OK
             [
@@ -141,9 +167,8 @@ class CustomerView(APIView):
     """
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        customer = UserProfile.objects.filter(type='customer').distinct()
-        serializer = ProfileDetailsSerializer(customer, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        customer = get_profile_queryset(request, ProfileDetailsSerializer).filter(type='customer').distinct()
+        return Response(render_profile_list(request, customer), status=status.HTTP_200_OK)
     
 
 
@@ -1,3 +1,68 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from userprofile_app.models import UserProfile
+
+
+class ProfileTestCase(TestCase):
+    """
+    Business and customer profiles, some with optional columns left NULL,
+    and an authenticated client.
+    """
+
+    def setUp(self):
+        self.business = UserProfile.objects.create_user(
+            'business', 'b@example.com', 'pw', type='business', first_name='Ann', location='Berlin',
+        )
+        UserProfile.objects.create_user('shop', 'shop@example.com', 'pw', type='business', tel=None)
+        self.customer = UserProfile.objects.create_user('customer', 'c@example.com', 'pw', type='customer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def get(self, url, status_code=200):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+
+class ProfileSparseFieldsetTests(ProfileTestCase):
+
+    def test_detail_fields(self):
+        profile = self.get(f'/api/profile/{self.business.pk}/?fields=user,username,location')
+        self.assertEqual(profile, {'user': self.business.pk, 'username': 'business', 'location': 'Berlin'})
+        profile = self.get(f'/api/profile/{self.business.pk}/?omit=file,description,working_hours,tel')
+        self.assertNotIn('file', profile)
+        self.assertEqual(profile['first_name'], 'Ann')
+
+    def test_list_fields(self):
+        for fast in (False, True):
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                rows = self.get('/api/profiles/business/?fields=username,first_name,tel')
+                self.assertEqual(sorted(rows, key=lambda row: row['username']), [
+                    {'username': 'business', 'first_name': 'Ann', 'tel': ''},
+                    {'username': 'shop', 'first_name': '', 'tel': ''},
+                ])
+                rows = self.get('/api/profiles/customer/?omit=file,created_at')
+                self.assertEqual([row['user'] for row in rows], [self.customer.pk])
+                self.assertNotIn('created_at', rows[0])
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(
+            self.get('/api/profiles/business/?fields=password', 400), {'fields': 'Unknown field(s): password.'},
+        )
+        self.assertEqual(
+            self.get(f'/api/profile/{self.business.pk}/?omit=password', 400), {'omit': 'Unknown field(s): password.'},
+        )
+
+
+class ProfileFastReadTests(ProfileTestCase):
+
+    def test_lists_are_byte_identical(self):
+        UserProfile.objects.filter(username='shop').update(file='uploads/avatar.png', description=None)
+        for url in ('/api/profiles/business/', '/api/profiles/customer/', '/api/profiles/business/?fields=user,tel'):
+            with self.settings(FAST_READ_SERIALIZERS=False):
+                expected = self.client.get(url)
+            with self.settings(FAST_READ_SERIALIZERS=True):
+                fast = self.client.get(url)
+            self.assertEqual(expected.status_code, 200)
+            self.assertEqual(fast.content, expected.content, url)